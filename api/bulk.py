@@ -0,0 +1,20 @@
+"""
+Utilitários compartilhados pelos endpoints de criação em lote (/bulk).
+"""
+from fastapi import HTTPException, status
+
+from config import settings
+
+
+def check_batch_size(items: list) -> None:
+    """Rejeita lotes vazios ou acima de ``settings.bulk_max_items``."""
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O lote deve conter pelo menos um item.",
+        )
+    if len(items) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote excede o limite de {settings.bulk_max_items} itens.",
+        )
@@ -0,0 +1,81 @@
+"""
+ETags e requisições condicionais para as rotas de entidades.
+
+O ETag é forte e derivado da versão das linhas (``id`` + ``updated_at``), sem
+serializar o corpo: uma entidade tem o ETag da sua linha e uma listagem, o da
+sequência de linhas da página. Assim:
+
+- ``If-None-Match`` que casa com o ETag atual responde 304 sem corpo, sem
+  passar pela validação/serialização do ``response_model``;
+- ``If-Match`` em PUT garante controle de concorrência otimista: se o recurso
+  mudou desde a leitura do cliente a resposta é 412 e nada é gravado.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def _version(obj) -> str:
+    updated_at = getattr(obj, "updated_at", None)
+    return f"{type(obj).__name__}:{obj.id}:{updated_at.isoformat() if updated_at else ''}"
+
+
+def compute_etag(payload) -> str:
+    """ETag forte de uma entidade ou de uma lista de entidades."""
+    if isinstance(payload, list):
+        raw = "|".join(map(_version, payload))
+    else:
+        raw = _version(payload)
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest() + '"'
+
+
+def _matches(header: str, etag: str, weak: bool) -> bool:
+    for candidate in (tag.strip() for tag in header.split(",")):
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            # Comparação forte (If-Match) nunca aceita ETags fracos
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True se o ``If-None-Match`` da requisição casa com o ETag (comparação fraca)."""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and _matches(if_none_match, etag, weak=True)
+
+
+def conditional_response(request: Request, response: Response, payload):
+    """
+    Publica o ETag do payload e, se ``If-None-Match`` casar, devolve um 304
+    (com os mesmos cabeçalhos) no lugar do payload.
+    """
+    etag = compute_etag(payload)
+    response.headers["ETag"] = etag
+    if not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return payload
+
+
+def if_match(request: Request) -> Optional[str]:
+    """Valor do cabeçalho ``If-Match`` (None se ausente)."""
+    return request.headers.get("if-match")
+
+
+def check_if_match(request: Request, current) -> None:
+    """Levanta 412 se o ``If-Match`` da requisição não casar com a versão atual."""
+    header = if_match(request)
+    if header is not None and not _matches(header, compute_etag(current), weak=False):
+        raise precondition_failed()
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="O recurso foi alterado por outra requisição (ETag não confere).",
+    )
@@ -0,0 +1,114 @@
+"""
+Serialização JSON rápida para as listagens.
+
+Com ``response_model=List[...]`` o FastAPI valida cada objeto ORM pelo schema
+Pydantic (``from_attributes``) e só então o serializa, o que domina o custo de
+CPU de uma página de 100 linhas. As listagens usam outro caminho:
+
+- o CRUD faz um SELECT só de colunas (``get_*_rows``) e devolve linhas, sem
+  montar objetos ORM;
+- ``RowSerializer`` escreve as colunas do schema direto em JSON (orjson, se
+  instalado). Campos de tipo primitivo (``int``, ``str``, datas...) passam
+  direto, porque o banco já garante o tipo; os demais (ex: ``EmailStr``)
+  e um NULL em campo obrigatório passam pela validação do campo, para a
+  saída ser a mesma do ``response_model`` e das rotas de detalhe.
+
+O ``response_model`` continua declarado nas rotas e documenta o formato no
+OpenAPI. ``DefaultResponse`` (``ORJSONResponse`` com orjson) é a classe de
+resposta padrão da aplicação para as demais rotas.
+"""
+import datetime
+import json
+import types
+import typing
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from api import etag
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: cai para o json da biblioteca padrão
+    orjson = None
+
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def dumps(obj) -> bytes:
+    """Serializa para JSON (bytes) com orjson ou, sem ele, com o json padrão."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+_PRIMITIVES = (int, str, float, bool, datetime.datetime, datetime.date)
+
+
+def _primitive(annotation) -> typing.Tuple[bool, bool]:
+    """(tipo primitivo, aceita None) de uma anotação como ``str`` ou ``Optional[int]``."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        nullable = len(args) < len(typing.get_args(annotation))
+        return len(args) == 1 and args[0] in _PRIMITIVES, nullable
+    return annotation in _PRIMITIVES, False
+
+
+class RowSerializer:
+    """Serializa linhas de um SELECT de colunas com os campos de um schema."""
+
+    def __init__(self, schema):
+        self.fields = tuple(schema.model_fields)
+        # Campos validados pelo TypeAdapter do próprio campo: os não primitivos
+        # sempre; os obrigatórios só quando vêm NULL (levanta o mesmo erro)
+        self.converted = []
+        self.required = []
+        for name, field in schema.model_fields.items():
+            primitive, nullable = _primitive(field.annotation)
+            adapter = TypeAdapter(field.annotation)
+            if not primitive:
+                self.converted.append((name, adapter))
+            elif not nullable:
+                self.required.append((name, adapter))
+
+    def __call__(self, rows) -> bytes:
+        fields, converted, required = self.fields, self.converted, self.required
+        items = []
+        for row in rows:
+            mapping = row._mapping
+            item = {field: mapping[field] for field in fields}
+            for field, adapter in converted:
+                item[field] = adapter.dump_python(adapter.validate_python(item[field]), mode="json")
+            for field, adapter in required:
+                if item[field] is None:
+                    adapter.validate_python(None)
+            items.append(item)
+        return dumps(items)
+
+
+class ModelSerializer:
+    """Valida objetos ORM pelo schema (como o ``response_model``) e serializa."""
+
+    def __init__(self, annotation):
+        self.adapter = TypeAdapter(annotation)
+
+    def __call__(self, payload) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(payload, from_attributes=True))
+
+
+def json_response(request: Request, response: Response, payload, serializer, versioned=None) -> Response:
+    """
+    Resposta JSON já serializada, com ETag (e 304 se ``If-None-Match`` casar,
+    sem serializar). Mantém os cabeçalhos definidos em ``response``.
+    """
+    headers = {**response.headers, "etag": etag.compute_etag(payload if versioned is None else versioned)}
+    if etag.not_modified(request, headers["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=serializer(payload), media_type="application/json", headers=headers)
@@ -0,0 +1,40 @@
+"""
+Paginação por chave (keyset/cursor) para as rotas de listagem.
+
+O cursor é opaco para o cliente: codifica o último ``id`` da página. A próxima
+página é buscada com ``WHERE id > :ultimo_id ORDER BY id LIMIT :limit``, cujo
+custo não cresce com a profundidade, ao contrário de ``OFFSET``.
+"""
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Codifica o último id de uma página em um cursor opaco."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decodifica o cursor recebido na query string (None se ausente)."""
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return int(json.loads(raw)["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido.",
+        )
+
+
+def set_next_cursor(response: Response, items: list, limit: int) -> None:
+    """Publica o cursor da próxima página no cabeçalho, se a página veio cheia."""
+    if limit > 0 and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
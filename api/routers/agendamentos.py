@@ -0,0 +1,68 @@
+import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from api import pagination
+from database import get_db, get_read_db, run_db
+from schemas import agendamento as agendamento_schema
+from crud import agendamento as agendamento_crud
+from services import auth as auth_service, agendamento_service
+
+router = APIRouter(
+    prefix="/agendamentos",
+    tags=["Agendamentos"],
+    responses={404: {"description": "Agendamento não encontrado"}},
+    # Adiciona a dependência de autenticação a TODAS as rotas deste roteador
+    dependencies=[Depends(auth_service.get_current_active_user)]
+)
+
+@router.post("/", response_model=agendamento_schema.Agendamento, status_code=status.HTTP_201_CREATED)
+async def create_agendamento(agendamento: agendamento_schema.AgendamentoCreate, db: Session = Depends(get_db)):
+    """
+    Reserva um horário na agenda de um veterinário.
+    Responde 409 se o horário se sobrepuser a outro agendamento dele.
+    """
+    return await run_db(db, agendamento_service.create_new_agendamento, agendamento=agendamento)
+
+@router.get("/", response_model=List[agendamento_schema.Agendamento])
+async def read_agendamentos(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    veterinario_id: Optional[int] = None,
+    pet_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Lista os agendamentos, com filtros opcionais por veterinário, pet e
+    início no período (``data_inicio`` inclusivo, ``data_fim`` exclusivo).
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    """
+    agendamentos = await run_db(
+        db, agendamento_crud.get_agendamentos_rows,
+        skip=skip, limit=limit, after_id=pagination.decode_cursor(cursor),
+        veterinario_id=veterinario_id, pet_id=pet_id, data_inicio=data_inicio, data_fim=data_fim,
+    )
+    pagination.set_next_cursor(response, agendamentos, limit)
+    return agendamentos
+
+@router.get("/{agendamento_id}", response_model=agendamento_schema.Agendamento)
+async def read_agendamento(agendamento_id: int, db: Session = Depends(get_read_db)):
+    """Busca um agendamento pelo ID."""
+    db_agendamento = await run_db(db, agendamento_crud.get_agendamento, agendamento_id=agendamento_id)
+    if db_agendamento is None:
+        raise HTTPException(status_code=404, detail="Agendamento não encontrado")
+    return db_agendamento
+
+@router.delete("/{agendamento_id}", response_model=agendamento_schema.Agendamento)
+async def delete_agendamento(agendamento_id: int, db: Session = Depends(get_db)):
+    """Cancela um agendamento, liberando o horário."""
+    db_agendamento = await run_db(db, agendamento_crud.delete_agendamento, agendamento_id=agendamento_id)
+    if db_agendamento is None:
+        raise HTTPException(status_code=404, detail="Agendamento não encontrado")
+    return db_agendamento
@@ -0,0 +1,74 @@
+import datetime
+from fastapi import APIRouter, Depends, Query
+from typing import List, Literal, Optional
+
+from config import settings
+from schemas import analytics as analytics_schema
+from crud import atendimento as atendimento_crud
+from services import analytics, atendimento_archive, auth as auth_service
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    dependencies=[Depends(auth_service.get_current_active_user)]
+)
+
+def _archived(stmt, data_inicio, data_fim, clinica_id, veterinario_id):
+    """Blocos do arquivo frio com as colunas e os filtros do ``analytics_statement``."""
+    return atendimento_archive.iter_rows(
+        [column.key for column in stmt.selected_columns],
+        data_inicio=data_inicio, data_fim=data_fim, batch_size=settings.analytics_batch_size,
+        clinica_id=clinica_id, veterinario_id=veterinario_id,
+    )
+
+@router.get(
+    "/atendimentos",
+    response_model=List[analytics_schema.SerieAtendimentos],
+    responses={200: {"content": {media_type: {} for media_type in analytics.MEDIA_TYPES.values()}}},
+)
+async def read_atendimentos_series(
+    group_by: Optional[Literal["especie", "clinica_id", "veterinario_id", "pet_id"]] = None,
+    bucket: Optional[Literal["dia", "semana", "mes"]] = None,
+    format: str = Query("json", pattern="^(json|arrow|parquet)$"),
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+):
+    """
+    Contagem de atendimentos por grupo (``group_by``) e/ou período
+    (``bucket``), calculada no servidor sobre todo o histórico (tabela e
+    arquivo frio). Espécie e clínica são as do momento do atendimento.
+    ``format=arrow`` (IPC stream) ou ``parquet`` devolvem o resultado como tabela.
+    """
+    analytics.require_pyarrow(format)
+    stmt = atendimento_crud.analytics_statement(
+        data_inicio=data_inicio, data_fim=data_fim, clinica_id=clinica_id, veterinario_id=veterinario_id
+    )
+    rows = await analytics.aggregate(
+        stmt, group_by=group_by, bucket=bucket, archived=_archived(stmt, data_inicio, data_fim, clinica_id, veterinario_id)
+    )
+    if format != "json":
+        return analytics.table_response(rows, format, "atendimentos_series")
+    return rows
+
+@router.get("/atendimentos/export")
+async def export_atendimentos_columns(
+    format: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+):
+    """
+    Exporta em streaming os atendimentos com a espécie do pet e a clínica do
+    veterinário em Arrow IPC ou Parquet (um RecordBatch/row group por bloco),
+    os arquivados antes dos da tabela.
+    """
+    analytics.require_pyarrow(format)
+    stmt = atendimento_crud.analytics_statement(
+        data_inicio=data_inicio, data_fim=data_fim, clinica_id=clinica_id, veterinario_id=veterinario_id
+    )
+    return analytics.stream_batches(
+        stmt.order_by("id"), format, "atendimentos", archived=_archived(stmt, data_inicio, data_fim, clinica_id, veterinario_id)
+    )
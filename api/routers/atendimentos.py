@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from database import get_db
-from schemas import atendimento as atendimento_schema
+from api import bulk, etag, fast_json, pagination
+from config import settings
+from database import get_db, get_read_db, run_db
+from schemas import bulk as bulk_schema, atendimento as atendimento_schema
 from crud import atendimento as atendimento_crud
-from services import auth as auth_service, atendimento_service
+from services import auth as auth_service, atendimento_archive, atendimento_service, export_service
+from services.response_cache import response_cache
 
 router = APIRouter(
     prefix="/atendimentos",
@@ -15,37 +19,124 @@ router = APIRouter(
     dependencies=[Depends(auth_service.get_current_active_user)]
 )
 
+# A listagem usa linhas de um SELECT de colunas serializadas direto em JSON
+ATENDIMENTOS_SERIALIZER = fast_json.RowSerializer(atendimento_schema.Atendimento)
+
+# As escritas invalidam o /full de tutores (em cache), que inclui os atendimentos
+INVALIDATES = ("tutores",)
+
 @router.post("/", response_model=atendimento_schema.Atendimento, status_code=status.HTTP_201_CREATED)
-def create_atendimento(atendimento: atendimento_schema.AtendimentoCreate, db: Session = Depends(get_db)):
+async def create_atendimento(atendimento: atendimento_schema.AtendimentoCreate, db: Session = Depends(get_db)):
     """Cria um novo registro de atendimento."""
-    return atendimento_service.create_new_atendimento(db=db, atendimento=atendimento)
+    db_atendimento = await run_db(db, atendimento_service.create_new_atendimento, atendimento=atendimento)
+    await response_cache.invalidate(*INVALIDATES)
+    return db_atendimento
+
+@router.post("/bulk", response_model=bulk_schema.BulkCreateResult[atendimento_schema.Atendimento])
+async def create_atendimentos_bulk(atendimentos: List[atendimento_schema.AtendimentoCreate], db: Session = Depends(get_db)):
+    """
+    Cria vários atendimentos de uma vez. Pets e veterinários inexistentes
+    são reportados por item.
+    """
+    bulk.check_batch_size(atendimentos)
+    result = await run_db(db, atendimento_crud.create_atendimentos_bulk, atendimentos=atendimentos)
+    await response_cache.invalidate(*INVALIDATES)
+    return result
 
 @router.get("/", response_model=List[atendimento_schema.Atendimento])
-def read_atendimentos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os atendimentos."""
-    atendimentos = atendimento_crud.get_atendimentos(db, skip=skip, limit=limit)
-    return atendimentos
+async def read_atendimentos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    pet_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Lista os atendimentos, com filtros opcionais por pet, veterinário e
+    período (``data_inicio`` inclusivo, ``data_fim`` exclusivo).
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    O histórico de um pet (``pet_id``) inclui os atendimentos arquivados.
+    """
+    filters = dict(veterinario_id=veterinario_id, data_inicio=data_inicio, data_fim=data_fim)
+    after_id = pagination.decode_cursor(cursor)
+    if pet_id is not None:
+        atendimentos = await atendimento_archive.list_pet_history(
+            db, pet_id, skip=skip, limit=limit, after_id=after_id, **filters
+        )
+    else:
+        atendimentos = await run_db(
+            db, atendimento_crud.get_atendimentos_rows, skip=skip, limit=limit, after_id=after_id, **filters
+        )
+    pagination.set_next_cursor(response, atendimentos, limit)
+    return fast_json.json_response(request, response, atendimentos, ATENDIMENTOS_SERIALIZER)
+
+@router.get("/export")
+async def export_atendimentos(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    pet_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+):
+    """
+    Exporta os atendimentos em streaming (NDJSON ou CSV), com os mesmos
+    filtros da listagem e memória constante no servidor. Inclui os
+    atendimentos arquivados, que saem antes dos da tabela.
+    """
+    stmt = atendimento_crud.export_statement(
+        pet_id=pet_id,
+        veterinario_id=veterinario_id,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    )
+    archived = atendimento_archive.iter_rows(
+        [column.key for column in stmt.selected_columns],
+        data_inicio=data_inicio, data_fim=data_fim, batch_size=settings.export_batch_size,
+        pet_id=pet_id, veterinario_id=veterinario_id,
+    )
+    return export_service.stream_export(stmt, format, "atendimentos", archived=archived)
 
 @router.get("/{atendimento_id}", response_model=atendimento_schema.Atendimento)
-def read_atendimento(atendimento_id: int, db: Session = Depends(get_db)):
-    """Busca os detalhes de um atendimento específico."""
-    db_atendimento = atendimento_crud.get_atendimento(db, atendimento_id=atendimento_id)
+async def read_atendimento(atendimento_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """Busca os detalhes de um atendimento específico (inclusive arquivado)."""
+    db_atendimento = await atendimento_archive.get_atendimento(db, atendimento_id)
     if db_atendimento is None:
         raise HTTPException(status_code=404, detail="Atendimento não encontrado")
-    return db_atendimento
+    return etag.conditional_response(request, response, db_atendimento)
 
 @router.put("/{atendimento_id}", response_model=atendimento_schema.Atendimento)
-def update_atendimento(atendimento_id: int, atendimento: atendimento_schema.AtendimentoUpdate, db: Session = Depends(get_db)):
-    """Atualiza a descrição de um atendimento."""
-    db_atendimento = atendimento_crud.update_atendimento(db, atendimento_id=atendimento_id, atendimento=atendimento)
+async def update_atendimento(atendimento_id: int, atendimento: atendimento_schema.AtendimentoUpdate, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Atualiza a descrição de um atendimento.
+    Com ``If-Match``, só grava se o ETag ainda for o atual (senão, 412).
+    """
+    expected_updated_at = None
+    if etag.if_match(request) is not None:
+        current = await run_db(db, atendimento_crud.get_atendimento, atendimento_id=atendimento_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Atendimento não encontrado")
+        etag.check_if_match(request, current)
+        expected_updated_at = current.updated_at
+    db_atendimento = await run_db(db, atendimento_crud.update_atendimento, atendimento_id=atendimento_id, atendimento=atendimento, expected_updated_at=expected_updated_at)
     if db_atendimento is None:
+        if expected_updated_at is not None:
+            raise etag.precondition_failed()
         raise HTTPException(status_code=404, detail="Atendimento não encontrado")
+    await response_cache.invalidate(*INVALIDATES)
+    response.headers["ETag"] = etag.compute_etag(db_atendimento)
     return db_atendimento
 
 @router.delete("/{atendimento_id}", response_model=atendimento_schema.Atendimento)
-def delete_atendimento(atendimento_id: int, db: Session = Depends(get_db)):
+async def delete_atendimento(atendimento_id: int, db: Session = Depends(get_db)):
     """Remove um registro de atendimento do sistema."""
-    db_atendimento = atendimento_crud.delete_atendimento(db, atendimento_id=atendimento_id)
+    db_atendimento = await run_db(db, atendimento_crud.delete_atendimento, atendimento_id=atendimento_id)
     if db_atendimento is None:
         raise HTTPException(status_code=404, detail="Atendimento não encontrado")
+    await response_cache.invalidate(*INVALIDATES)
     return db_atendimento
\ No newline at end of file
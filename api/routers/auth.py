@@ -3,8 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from database import get_db
-from services import auth as auth_service
+from database import get_db, run_db
+from services import auth as auth_service, password_hashing
 from crud import usuario as usuario_crud
 from schemas import token as token_schema
 from config import settings
@@ -15,12 +15,13 @@ router = APIRouter(
 )
 
 @router.post("/token", response_model=token_schema.Token)
-def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Autentica um usuário e retorna um token de acesso.
     """
-    user = usuario_crud.get_user_by_username(db, username=form_data.username)
-    if not user or not auth_service.verify_password(form_data.password, user.hashed_password):
+    user = await run_db(db, usuario_crud.get_user_by_username, username=form_data.username)
+    # bcrypt é CPU-bound: roda no pool de hashing, fora do event loop
+    if not user or not await password_hashing.verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nome de usuário ou senha incorretos",
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from database import get_db
+from api import etag, fast_json, pagination
+from database import get_db, run_db
 from schemas import clinica as clinica_schema
 from crud import clinica as clinica_crud
 from services.auth import get_current_active_user
+from services.response_cache import response_cache
 from schemas import usuario as usuario_schema
 
 router = APIRouter(
@@ -16,37 +18,88 @@ router = APIRouter(
     dependencies=[Depends(get_current_active_user)]
 )
 
+# Leituras servidas pelo cache de respostas; toda escrita invalida o namespace.
+# Um miss lê do primário (get_db), nunca de uma réplica atrasada: o que ele
+# grava no cache é servido a todos os clientes. A listagem serializa linhas de
+# um SELECT de colunas, sem Pydantic
+CACHE_NAMESPACE = "clinicas"
+CLINICAS_SERIALIZER = fast_json.RowSerializer(clinica_schema.Clinica)
+CLINICA_SERIALIZER = fast_json.ModelSerializer(clinica_schema.Clinica)
+CLINICA_COMPLETA_SERIALIZER = fast_json.ModelSerializer(clinica_schema.ClinicaCompleta)
+
 @router.post("/", response_model=clinica_schema.Clinica, status_code=status.HTTP_201_CREATED)
-def create_clinica(clinica: clinica_schema.ClinicaCreate, db: Session = Depends(get_db)):
+async def create_clinica(clinica: clinica_schema.ClinicaCreate, db: Session = Depends(get_db)):
     """Cria uma nova clínica."""
-    return clinica_crud.create_clinica(db=db, clinica=clinica)
+    db_clinica = await run_db(db, clinica_crud.create_clinica, clinica=clinica)
+    await response_cache.invalidate(CACHE_NAMESPACE)
+    return db_clinica
 
 @router.get("/", response_model=List[clinica_schema.Clinica])
-def read_clinicas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todas as clínicas."""
-    clinicas = clinica_crud.get_clinicas(db, skip=skip, limit=limit)
-    return clinicas
+async def read_clinicas(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    """
+    Lista todas as clínicas.
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    """
+    cached = await response_cache.lookup(CACHE_NAMESPACE, request)
+    if cached is not None:
+        return cached
+    clinicas = await run_db(db, clinica_crud.get_clinicas_rows, skip=skip, limit=limit, after_id=pagination.decode_cursor(cursor))
+    pagination.set_next_cursor(response, clinicas, limit)
+    return await response_cache.respond(CACHE_NAMESPACE, request, response, clinicas, CLINICAS_SERIALIZER)
 
 @router.get("/{clinica_id}", response_model=clinica_schema.Clinica)
-def read_clinica(clinica_id: int, db: Session = Depends(get_db)):
+async def read_clinica(clinica_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Busca os detalhes de uma clínica específica."""
-    db_clinica = clinica_crud.get_clinica(db, clinica_id=clinica_id)
+    cached = await response_cache.lookup(CACHE_NAMESPACE, request)
+    if cached is not None:
+        return cached
+    db_clinica = await run_db(db, clinica_crud.get_clinica, clinica_id=clinica_id)
     if db_clinica is None:
         raise HTTPException(status_code=404, detail="Clínica não encontrada")
-    return db_clinica
+    return await response_cache.respond(CACHE_NAMESPACE, request, response, db_clinica, CLINICA_SERIALIZER)
+
+@router.get("/{clinica_id}/full", response_model=clinica_schema.ClinicaCompleta)
+async def read_clinica_full(clinica_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Busca uma clínica com todo o seu corpo clínico em uma única requisição."""
+    cached = await response_cache.lookup(CACHE_NAMESPACE, request)
+    if cached is not None:
+        return cached
+    db_clinica = await run_db(db, clinica_crud.get_clinica_full, clinica_id=clinica_id)
+    if db_clinica is None:
+        raise HTTPException(status_code=404, detail="Clínica não encontrada")
+    return await response_cache.respond(
+        CACHE_NAMESPACE, request, response, db_clinica, CLINICA_COMPLETA_SERIALIZER,
+        versioned=[db_clinica, *db_clinica.veterinarios],
+    )
 
 @router.put("/{clinica_id}", response_model=clinica_schema.Clinica)
-def update_clinica(clinica_id: int, clinica: clinica_schema.ClinicaUpdate, db: Session = Depends(get_db)):
-    """Atualiza os dados de uma clínica."""
-    db_clinica = clinica_crud.update_clinica(db, clinica_id=clinica_id, clinica=clinica)
+async def update_clinica(clinica_id: int, clinica: clinica_schema.ClinicaUpdate, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Atualiza os dados de uma clínica.
+    Com ``If-Match``, só grava se o ETag ainda for o atual (senão, 412).
+    """
+    expected_updated_at = None
+    if etag.if_match(request) is not None:
+        current = await run_db(db, clinica_crud.get_clinica, clinica_id=clinica_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Clínica não encontrada")
+        etag.check_if_match(request, current)
+        expected_updated_at = current.updated_at
+    db_clinica = await run_db(db, clinica_crud.update_clinica, clinica_id=clinica_id, clinica=clinica, expected_updated_at=expected_updated_at)
     if db_clinica is None:
+        if expected_updated_at is not None:
+            raise etag.precondition_failed()
         raise HTTPException(status_code=404, detail="Clínica não encontrada")
+    await response_cache.invalidate(CACHE_NAMESPACE)
+    response.headers["ETag"] = etag.compute_etag(db_clinica)
     return db_clinica
 
 @router.delete("/{clinica_id}", response_model=clinica_schema.Clinica)
-def delete_clinica(clinica_id: int, db: Session = Depends(get_db)):
+async def delete_clinica(clinica_id: int, db: Session = Depends(get_db)):
     """Remove uma clínica do sistema."""
-    db_clinica = clinica_crud.delete_clinica(db, clinica_id=clinica_id)
+    db_clinica = await run_db(db, clinica_crud.delete_clinica, clinica_id=clinica_id)
     if db_clinica is None:
         raise HTTPException(status_code=404, detail="Clínica não encontrada")
+    await response_cache.invalidate(CACHE_NAMESPACE)
     return db_clinica
\ No newline at end of file
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from database import get_db
-from schemas import pet as pet_schema
-from crud import pet as pet_crud, tutor as tutor_crud
+from api import bulk, etag, fast_json, pagination
+from database import get_db, get_read_db, run_db
+from schemas import bulk as bulk_schema, pet as pet_schema
+from crud import pet as pet_crud
+from services import export_service, pet_service
 from services.auth import get_current_active_user
+from services.response_cache import response_cache
 
 router = APIRouter(
     prefix="/pets",
@@ -14,44 +17,103 @@ router = APIRouter(
     dependencies=[Depends(get_current_active_user)]
 )
 
+# A listagem usa linhas de um SELECT de colunas serializadas direto em JSON
+PETS_SERIALIZER = fast_json.RowSerializer(pet_schema.Pet)
+
+# As escritas invalidam o /full de tutores (em cache), que inclui os pets
+INVALIDATES = ("tutores",)
+
 @router.post("/", response_model=pet_schema.Pet, status_code=status.HTTP_201_CREATED)
-def create_pet(pet: pet_schema.PetCreate, db: Session = Depends(get_db)):
+async def create_pet(pet: pet_schema.PetCreate, db: Session = Depends(get_db)):
     """Cria um novo pet para um tutor."""
-    # Validação de negócio: verificar se o tutor existe
-    db_tutor = tutor_crud.get_tutor(db, tutor_id=pet.tutor_id)
-    if not db_tutor:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tutor com id {pet.tutor_id} não encontrado."
-        )
-    return pet_crud.create_pet(db=db, pet=pet)
+    # Validação de negócio (tutor existente) feita no mesmo statement do INSERT
+    db_pet = await run_db(db, pet_service.create_new_pet, pet=pet)
+    await response_cache.invalidate(*INVALIDATES)
+    return db_pet
+
+@router.post("/bulk", response_model=bulk_schema.BulkCreateResult[pet_schema.Pet])
+async def create_pets_bulk(pets: List[pet_schema.PetCreate], db: Session = Depends(get_db)):
+    """
+    Cria vários pets de uma vez. Tutores inexistentes são reportados por item.
+    """
+    bulk.check_batch_size(pets)
+    result = await run_db(db, pet_crud.create_pets_bulk, pets=pets)
+    await response_cache.invalidate(*INVALIDATES)
+    return result
 
 @router.get("/", response_model=List[pet_schema.Pet])
-def read_pets(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os pets."""
-    pets = pet_crud.get_pets(db, skip=skip, limit=limit)
-    return pets
+async def read_pets(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    tutor_id: Optional[int] = None,
+    especie: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Lista os pets, com filtros opcionais por tutor e espécie.
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    """
+    pets = await run_db(
+        db,
+        pet_crud.get_pets_rows,
+        skip=skip,
+        limit=limit,
+        after_id=pagination.decode_cursor(cursor),
+        tutor_id=tutor_id,
+        especie=especie,
+    )
+    pagination.set_next_cursor(response, pets, limit)
+    return fast_json.json_response(request, response, pets, PETS_SERIALIZER)
+
+@router.get("/export")
+async def export_pets(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    tutor_id: Optional[int] = None,
+    especie: Optional[str] = None,
+):
+    """Exporta os pets em streaming (NDJSON ou CSV)."""
+    stmt = pet_crud.export_statement(tutor_id=tutor_id, especie=especie)
+    return export_service.stream_export(stmt, format, "pets")
 
 @router.get("/{pet_id}", response_model=pet_schema.Pet)
-def read_pet(pet_id: int, db: Session = Depends(get_db)):
+async def read_pet(pet_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Busca os detalhes de um pet específico."""
-    db_pet = pet_crud.get_pet(db, pet_id=pet_id)
+    db_pet = await run_db(db, pet_crud.get_pet, pet_id=pet_id)
     if db_pet is None:
         raise HTTPException(status_code=404, detail="Pet não encontrado")
-    return db_pet
+    return etag.conditional_response(request, response, db_pet)
 
 @router.put("/{pet_id}", response_model=pet_schema.Pet)
-def update_pet(pet_id: int, pet: pet_schema.PetUpdate, db: Session = Depends(get_db)):
-    """Atualiza os dados de um pet."""
-    db_pet = pet_crud.update_pet(db, pet_id=pet_id, pet=pet)
+async def update_pet(pet_id: int, pet: pet_schema.PetUpdate, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Atualiza os dados de um pet.
+    Com ``If-Match``, só grava se o ETag ainda for o atual (senão, 412).
+    """
+    expected_updated_at = None
+    if etag.if_match(request) is not None:
+        current = await run_db(db, pet_crud.get_pet, pet_id=pet_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Pet não encontrado")
+        etag.check_if_match(request, current)
+        expected_updated_at = current.updated_at
+    db_pet = await run_db(db, pet_crud.update_pet, pet_id=pet_id, pet=pet, expected_updated_at=expected_updated_at)
     if db_pet is None:
+        if expected_updated_at is not None:
+            raise etag.precondition_failed()
         raise HTTPException(status_code=404, detail="Pet não encontrado")
+    await response_cache.invalidate(*INVALIDATES)
+    response.headers["ETag"] = etag.compute_etag(db_pet)
     return db_pet
 
 @router.delete("/{pet_id}", response_model=pet_schema.Pet)
-def delete_pet(pet_id: int, db: Session = Depends(get_db)):
+async def delete_pet(pet_id: int, db: Session = Depends(get_db)):
     """Remove um pet do sistema."""
-    db_pet = pet_crud.delete_pet(db, pet_id=pet_id)
+    db_pet = await run_db(db, pet_crud.delete_pet, pet_id=pet_id)
     if db_pet is None:
         raise HTTPException(status_code=404, detail="Pet não encontrado")
+    await response_cache.invalidate(*INVALIDATES)
     return db_pet
\ No newline at end of file
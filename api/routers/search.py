@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+
+from database import get_read_db, run_db
+from schemas import search as search_schema
+from crud import search as search_crud
+from services import auth as auth_service
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Busca"],
+    dependencies=[Depends(auth_service.get_current_active_user)]
+)
+
+@router.get("/", response_model=List[search_schema.SearchResult])
+async def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    tipo: Optional[Literal["tutor", "pet", "veterinario"]] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Busca por prefixo (e por aproximação no PostgreSQL) em nome, telefone e
+    email de tutores, nome de pets e nome/CRMV de veterinários.
+    Retorna os ``limit`` resultados mais relevantes, opcionalmente só de um ``tipo``.
+    """
+    return await run_db(db, search_crud.search, q=q, limit=limit, tipo=tipo)
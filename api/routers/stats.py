@@ -0,0 +1,57 @@
+import datetime
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+
+from database import get_read_db, run_db
+from schemas import estatisticas as estatisticas_schema
+from crud import estatisticas as estatisticas_crud
+from services import auth as auth_service
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["Estatísticas"],
+    dependencies=[Depends(auth_service.get_current_active_user)]
+)
+
+@router.get("/veterinarios", response_model=List[estatisticas_schema.VisitasVeterinario])
+async def read_visitas_por_veterinario(
+    periodo: Literal["dia", "semana"] = "dia",
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Atendimentos por veterinário e dia ou semana (``data_inicio`` inclusivo,
+    ``data_fim`` exclusivo), opcionalmente de uma clínica ou veterinário.
+    """
+    return await run_db(
+        db, estatisticas_crud.visitas_por_veterinario,
+        periodo=periodo, data_inicio=data_inicio, data_fim=data_fim,
+        clinica_id=clinica_id, veterinario_id=veterinario_id,
+    )
+
+@router.get("/clinicas", response_model=List[estatisticas_schema.VisitasClinica])
+async def read_visitas_por_clinica(
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Atendimentos por clínica no período."""
+    return await run_db(db, estatisticas_crud.visitas_por_clinica, data_inicio=data_inicio, data_fim=data_fim)
+
+@router.get("/especies", response_model=List[estatisticas_schema.MixEspecies])
+async def read_mix_especies(
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Distribuição dos atendimentos por espécie do pet."""
+    return await run_db(
+        db, estatisticas_crud.mix_especies,
+        data_inicio=data_inicio, data_fim=data_fim, clinica_id=clinica_id, veterinario_id=veterinario_id,
+    )
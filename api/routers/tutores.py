@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from database import get_db
-from schemas import tutor as tutor_schema
+from api import bulk, etag, fast_json, pagination
+from database import get_db, get_read_db, run_db
+from schemas import bulk as bulk_schema, tutor as tutor_schema
 from crud import tutor as tutor_crud
+from services import export_service
 from services.auth import get_current_active_user
+from services.response_cache import response_cache
 
 router = APIRouter(
     prefix="/tutores",
@@ -14,37 +17,95 @@ router = APIRouter(
     dependencies=[Depends(get_current_active_user)]
 )
 
+# A listagem usa linhas de um SELECT de colunas serializadas direto em JSON
+TUTORES_SERIALIZER = fast_json.RowSerializer(tutor_schema.Tutor)
+
+# O /full é servido pelo cache de respostas, como o /full de clínicas (um miss
+# lê do primário). As escritas de tutores, pets e atendimentos invalidam o namespace
+CACHE_NAMESPACE = "tutores"
+TUTOR_COMPLETO_SERIALIZER = fast_json.ModelSerializer(tutor_schema.TutorCompleto)
+
 @router.post("/", response_model=tutor_schema.Tutor, status_code=status.HTTP_201_CREATED)
-def create_tutor(tutor: tutor_schema.TutorCreate, db: Session = Depends(get_db)):
+async def create_tutor(tutor: tutor_schema.TutorCreate, db: Session = Depends(get_db)):
     """Cria um novo tutor."""
-    return tutor_crud.create_tutor(db=db, tutor=tutor)
+    return await run_db(db, tutor_crud.create_tutor, tutor=tutor)
+
+@router.post("/bulk", response_model=bulk_schema.BulkCreateResult[tutor_schema.Tutor])
+async def create_tutores_bulk(tutores: List[tutor_schema.TutorCreate], db: Session = Depends(get_db)):
+    """
+    Cria vários tutores de uma vez. Emails duplicados são reportados por item.
+    """
+    bulk.check_batch_size(tutores)
+    return await run_db(db, tutor_crud.create_tutores_bulk, tutores=tutores)
 
 @router.get("/", response_model=List[tutor_schema.Tutor])
-def read_tutores(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os tutores."""
-    tutores = tutor_crud.get_tutores(db, skip=skip, limit=limit)
-    return tutores
+async def read_tutores(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """
+    Lista todos os tutores.
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    """
+    tutores = await run_db(db, tutor_crud.get_tutores_rows, skip=skip, limit=limit, after_id=pagination.decode_cursor(cursor))
+    pagination.set_next_cursor(response, tutores, limit)
+    return fast_json.json_response(request, response, tutores, TUTORES_SERIALIZER)
+
+@router.get("/export")
+async def export_tutores(format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """Exporta os tutores em streaming (NDJSON ou CSV)."""
+    return export_service.stream_export(tutor_crud.export_statement(), format, "tutores")
 
 @router.get("/{tutor_id}", response_model=tutor_schema.Tutor)
-def read_tutor(tutor_id: int, db: Session = Depends(get_db)):
+async def read_tutor(tutor_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Busca os detalhes de um tutor específico."""
-    db_tutor = tutor_crud.get_tutor(db, tutor_id=tutor_id)
+    db_tutor = await run_db(db, tutor_crud.get_tutor, tutor_id=tutor_id)
     if db_tutor is None:
         raise HTTPException(status_code=404, detail="Tutor não encontrado")
-    return db_tutor
+    return etag.conditional_response(request, response, db_tutor)
+
+@router.get("/{tutor_id}/full", response_model=tutor_schema.TutorCompleto)
+async def read_tutor_full(tutor_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Busca o registro completo de um tutor: seus pets e os atendimentos de cada
+    pet, em uma única requisição. O ETag cobre o tutor, os pets e os atendimentos.
+    """
+    cached = await response_cache.lookup(CACHE_NAMESPACE, request)
+    if cached is not None:
+        return cached
+    db_tutor = await run_db(db, tutor_crud.get_tutor_full, tutor_id=tutor_id)
+    if db_tutor is None:
+        raise HTTPException(status_code=404, detail="Tutor não encontrado")
+    return await response_cache.respond(
+        CACHE_NAMESPACE, request, response, db_tutor, TUTOR_COMPLETO_SERIALIZER,
+        versioned=[db_tutor, *db_tutor.pets, *(atendimento for pet in db_tutor.pets for atendimento in pet.atendimentos)],
+    )
 
 @router.put("/{tutor_id}", response_model=tutor_schema.Tutor)
-def update_tutor(tutor_id: int, tutor: tutor_schema.TutorUpdate, db: Session = Depends(get_db)):
-    """Atualiza os dados de um tutor."""
-    db_tutor = tutor_crud.update_tutor(db, tutor_id=tutor_id, tutor=tutor)
+async def update_tutor(tutor_id: int, tutor: tutor_schema.TutorUpdate, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Atualiza os dados de um tutor.
+    Com ``If-Match``, só grava se o ETag ainda for o atual (senão, 412).
+    """
+    expected_updated_at = None
+    if etag.if_match(request) is not None:
+        current = await run_db(db, tutor_crud.get_tutor, tutor_id=tutor_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Tutor não encontrado")
+        etag.check_if_match(request, current)
+        expected_updated_at = current.updated_at
+    db_tutor = await run_db(db, tutor_crud.update_tutor, tutor_id=tutor_id, tutor=tutor, expected_updated_at=expected_updated_at)
     if db_tutor is None:
+        if expected_updated_at is not None:
+            raise etag.precondition_failed()
         raise HTTPException(status_code=404, detail="Tutor não encontrado")
+    await response_cache.invalidate(CACHE_NAMESPACE)
+    response.headers["ETag"] = etag.compute_etag(db_tutor)
     return db_tutor
 
 @router.delete("/{tutor_id}", response_model=tutor_schema.Tutor)
-def delete_tutor(tutor_id: int, db: Session = Depends(get_db)):
+async def delete_tutor(tutor_id: int, db: Session = Depends(get_db)):
     """Remove um tutor do sistema."""
-    db_tutor = tutor_crud.delete_tutor(db, tutor_id=tutor_id)
+    db_tutor = await run_db(db, tutor_crud.delete_tutor, tutor_id=tutor_id)
     if db_tutor is None:
         raise HTTPException(status_code=404, detail="Tutor não encontrado")
+    await response_cache.invalidate(CACHE_NAMESPACE)
     return db_tutor
\ No newline at end of file
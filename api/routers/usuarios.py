@@ -1,13 +1,15 @@
 """
 Rotas para gerenciamento de usuários.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from database import get_db
+from api import pagination
+from database import get_db, get_read_db, run_db
 from schemas import usuario as usuario_schema
 from crud import usuario as usuario_crud
+from services import password_hashing
 from services.auth import get_current_active_user
 
 router = APIRouter(
@@ -19,47 +21,56 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=usuario_schema.Usuario, status_code=status.HTTP_201_CREATED)
-def create_usuario(usuario: usuario_schema.UsuarioCreate, db: Session = Depends(get_db)):
+async def create_usuario(usuario: usuario_schema.UsuarioCreate, db: Session = Depends(get_db)):
     """Cria um novo usuário."""
     # Verifica se o usuário já existe
-    if usuario_crud.get_user_by_username(db, usuario.username):
+    if await run_db(db, usuario_crud.get_user_by_username, usuario.username):
         raise HTTPException(
             status_code=400,
             detail="Nome de usuário já cadastrado"
         )
-    if usuario_crud.get_user_by_email(db, usuario.email):
+    if await run_db(db, usuario_crud.get_user_by_email, usuario.email):
         raise HTTPException(
             status_code=400,
             detail="Email já cadastrado"
         )
-    return usuario_crud.create_user(db=db, user=usuario)
+    hashed_password = await password_hashing.hash_password(usuario.password)
+    return await run_db(db, usuario_crud.create_user, user=usuario, hashed_password=hashed_password)
 
 @router.get("/", response_model=List[usuario_schema.Usuario])
-def read_usuarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os usuários."""
-    usuarios = usuario_crud.get_users(db, skip=skip, limit=limit)
+async def read_usuarios(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """
+    Lista todos os usuários.
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    """
+    usuarios = await run_db(db, usuario_crud.get_users, skip=skip, limit=limit, after_id=pagination.decode_cursor(cursor))
+    pagination.set_next_cursor(response, usuarios, limit)
     return usuarios
 
 @router.get("/{user_id}", response_model=usuario_schema.Usuario)
-def read_usuario(user_id: int, db: Session = Depends(get_db)):
+async def read_usuario(user_id: int, db: Session = Depends(get_read_db)):
     """Busca um usuário pelo ID."""
-    db_usuario = usuario_crud.get_user(db, user_id=user_id)
+    db_usuario = await run_db(db, usuario_crud.get_user, user_id=user_id)
     if db_usuario is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return db_usuario
 
 @router.put("/{user_id}", response_model=usuario_schema.Usuario)
-def update_usuario(user_id: int, usuario: usuario_schema.UsuarioUpdate, db: Session = Depends(get_db)):
+async def update_usuario(user_id: int, usuario: usuario_schema.UsuarioUpdate, db: Session = Depends(get_db)):
     """Atualiza um usuário existente."""
-    db_usuario = usuario_crud.update_user(db, user_id=user_id, user=usuario)
+    hashed_password = None
+    if usuario.password is not None:
+        hashed_password = await password_hashing.hash_password(usuario.password)
+    db_usuario = await run_db(db, usuario_crud.update_user, user_id=user_id, user=usuario, hashed_password=hashed_password)
     if db_usuario is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return db_usuario
 
 @router.delete("/{user_id}", response_model=usuario_schema.Usuario)
-def delete_usuario(user_id: int, db: Session = Depends(get_db)):
+async def delete_usuario(user_id: int, db: Session = Depends(get_db)):
     """Deleta um usuário."""
-    db_usuario = usuario_crud.delete_user(db, user_id=user_id)
+    db_usuario = await run_db(db, usuario_crud.delete_user, user_id=user_id)
     if db_usuario is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return db_usuario
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from database import get_db
-from schemas import veterinario as veterinario_schema
+from api import etag, fast_json, pagination
+from database import get_db, run_db
+from schemas import agendamento as agendamento_schema, veterinario as veterinario_schema
 from crud import veterinario as veterinario_crud
+from config import settings
+from services import agendamento_service
 from services.auth import get_current_active_user
+from services.response_cache import response_cache
 from schemas import usuario as usuario_schema
 
 router = APIRouter(
@@ -16,37 +21,109 @@ router = APIRouter(
     dependencies=[Depends(get_current_active_user)]
 )
 
+# Leituras servidas pelo cache de respostas (um miss lê do primário, como em
+# clínicas). As escritas invalidam também o namespace de clínicas, cujo /full
+# inclui o corpo clínico
+CACHE_NAMESPACE = "veterinarios"
+INVALIDATES = (CACHE_NAMESPACE, "clinicas")
+VETERINARIOS_SERIALIZER = fast_json.RowSerializer(veterinario_schema.Veterinario)
+VETERINARIO_SERIALIZER = fast_json.ModelSerializer(veterinario_schema.Veterinario)
+
 @router.post("/", response_model=veterinario_schema.Veterinario, status_code=status.HTTP_201_CREATED)
-def create_veterinario(veterinario: veterinario_schema.VeterinarioCreate, db: Session = Depends(get_db)):
+async def create_veterinario(veterinario: veterinario_schema.VeterinarioCreate, db: Session = Depends(get_db)):
     """Cria um novo veterinário."""
-    return veterinario_crud.create_veterinario(db=db, veterinario=veterinario)
+    db_veterinario = await run_db(db, veterinario_crud.create_veterinario, veterinario=veterinario)
+    await response_cache.invalidate(*INVALIDATES)
+    return db_veterinario
 
 @router.get("/", response_model=List[veterinario_schema.Veterinario])
-def read_veterinarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os veterinários."""
-    veterinarios = veterinario_crud.get_veterinarios(db, skip=skip, limit=limit)
-    return veterinarios
+async def read_veterinarios(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    clinica_id: Optional[int] = None,
+    especialidade: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Lista os veterinários, com filtros opcionais por clínica e especialidade.
+    Para paginação por chave, passe em ``cursor`` o valor do cabeçalho
+    ``X-Next-Cursor`` da página anterior (``skip`` é ignorado).
+    """
+    cached = await response_cache.lookup(CACHE_NAMESPACE, request)
+    if cached is not None:
+        return cached
+    veterinarios = await run_db(
+        db,
+        veterinario_crud.get_veterinarios_rows,
+        skip=skip,
+        limit=limit,
+        after_id=pagination.decode_cursor(cursor),
+        clinica_id=clinica_id,
+        especialidade=especialidade,
+    )
+    pagination.set_next_cursor(response, veterinarios, limit)
+    return await response_cache.respond(CACHE_NAMESPACE, request, response, veterinarios, VETERINARIOS_SERIALIZER)
 
 @router.get("/{veterinario_id}", response_model=veterinario_schema.Veterinario)
-def read_veterinario(veterinario_id: int, db: Session = Depends(get_db)):
+async def read_veterinario(veterinario_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Busca um veterinário pelo ID."""
-    db_veterinario = veterinario_crud.get_veterinario(db, veterinario_id=veterinario_id)
+    cached = await response_cache.lookup(CACHE_NAMESPACE, request)
+    if cached is not None:
+        return cached
+    db_veterinario = await run_db(db, veterinario_crud.get_veterinario, veterinario_id=veterinario_id)
     if db_veterinario is None:
         raise HTTPException(status_code=404, detail="Veterinário não encontrado")
-    return db_veterinario
+    return await response_cache.respond(CACHE_NAMESPACE, request, response, db_veterinario, VETERINARIO_SERIALIZER)
+
+@router.get("/{veterinario_id}/availability", response_model=List[agendamento_schema.HorarioLivre])
+async def read_veterinario_availability(
+    veterinario_id: int,
+    data_inicio: datetime.date,
+    data_fim: datetime.date,
+    duracao_minutos: int = Query(settings.agenda_intervalo_minutos, ge=5),
+    db: Session = Depends(get_db),
+):
+    """
+    Horários livres de ``duracao_minutos`` na agenda do veterinário, de
+    ``data_inicio`` (inclusivo) a ``data_fim`` (exclusivo), dentro do
+    expediente e a partir do horário atual (sem horários passados).
+    Lê do banco primário: um horário recém-reservado já sai da lista.
+    """
+    return await run_db(
+        db, agendamento_service.get_disponibilidade,
+        veterinario_id=veterinario_id, data_inicio=data_inicio, data_fim=data_fim, duracao_minutos=duracao_minutos,
+    )
 
 @router.put("/{veterinario_id}", response_model=veterinario_schema.Veterinario)
-def update_veterinario(veterinario_id: int, veterinario: veterinario_schema.VeterinarioCreate, db: Session = Depends(get_db)):
-    """Atualiza um veterinário existente."""
-    db_veterinario = veterinario_crud.update_veterinario(db, veterinario_id=veterinario_id, veterinario=veterinario)
+async def update_veterinario(veterinario_id: int, veterinario: veterinario_schema.VeterinarioCreate, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Atualiza um veterinário existente.
+    Com ``If-Match``, só grava se o ETag ainda for o atual (senão, 412).
+    """
+    expected_updated_at = None
+    if etag.if_match(request) is not None:
+        current = await run_db(db, veterinario_crud.get_veterinario, veterinario_id=veterinario_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Veterinário não encontrado")
+        etag.check_if_match(request, current)
+        expected_updated_at = current.updated_at
+    db_veterinario = await run_db(db, veterinario_crud.update_veterinario, veterinario_id=veterinario_id, veterinario=veterinario, expected_updated_at=expected_updated_at)
     if db_veterinario is None:
+        if expected_updated_at is not None:
+            raise etag.precondition_failed()
         raise HTTPException(status_code=404, detail="Veterinário não encontrado")
+    await response_cache.invalidate(*INVALIDATES)
+    response.headers["ETag"] = etag.compute_etag(db_veterinario)
     return db_veterinario
 
 @router.delete("/{veterinario_id}", response_model=veterinario_schema.Veterinario)
-def delete_veterinario(veterinario_id: int, db: Session = Depends(get_db)):
+async def delete_veterinario(veterinario_id: int, db: Session = Depends(get_db)):
     """Deleta um veterinário."""
-    db_veterinario = veterinario_crud.delete_veterinario(db, veterinario_id=veterinario_id)
+    db_veterinario = await run_db(db, veterinario_crud.delete_veterinario, veterinario_id=veterinario_id)
     if db_veterinario is None:
         raise HTTPException(status_code=404, detail="Veterinário não encontrado")
+    await response_cache.invalidate(*INVALIDATES)
     return db_veterinario
\ No newline at end of file
@@ -1,14 +1,23 @@
 from fastapi import APIRouter
 from .routers import (
+    agendamentos,
+    analytics,
     atendimentos,
     auth,
     clinicas,
     pets,
+    search,
+    stats,
     tutores,
     usuarios,
     veterinarios,
 )
+import database
 from config import settings
+from services import atendimento_archive, password_hashing
+from services.agenda_index import agenda_index
+from services.principal_cache import principal_cache
+from services.response_cache import response_cache
 
 # Roteador principal da API
 router = APIRouter()
@@ -21,6 +30,10 @@ router.include_router(veterinarios.router)
 router.include_router(tutores.router)
 router.include_router(pets.router)
 router.include_router(atendimentos.router)
+router.include_router(agendamentos.router)
+router.include_router(search.router)
+router.include_router(stats.router)
+router.include_router(analytics.router)
 
 # O health check foi movido de main.py para cá para centralizar as rotas da API.
 @router.get("/health", tags=["Health"])
@@ -30,5 +43,11 @@ def health_check():
         "status": "healthy",
         "environment": settings.environment,
         "version": settings.app_version,
+        "auth_cache": principal_cache.stats(),
+        "password_hashing": password_hashing.stats(),
+        "database_pool": database.pool_status(),
+        "response_cache": response_cache.stats(),
+        "atendimentos_archive": atendimento_archive.stats(),
+        "agenda_index": agenda_index.stats(),
     }
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Move os atendimentos antigos para o arquivo frio (ver services/atendimento_archive.py).
+
+Uso:
+    python archive_atendimentos.py [--months 18] [--dry-run]
+
+Arquiva, mês a mês, os atendimentos anteriores ao início do mês de N meses
+atrás (padrão: ARCHIVE_AFTER_MONTHS). Cada mês é gravado em ARCHIVE_DIR antes
+de suas linhas serem apagadas da tabela; rodar de novo só arquiva o que
+restou. Com a tabela particionada, as partições esvaziadas podem ser
+removidas com ``python manage_partitions.py detach --before AAAA-MM --drop``.
+"""
+import argparse
+import sys
+
+from sqlalchemy import func, select
+
+from config import settings
+from database import engine
+from models import models
+from services import atendimento_archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months", type=int, default=settings.archive_after_months)
+    parser.add_argument("--dry-run", action="store_true", help="só mostra quantas linhas seriam arquivadas")
+    args = parser.parse_args()
+
+    before = atendimento_archive.cutoff(args.months)
+    print(f"📦 Arquivando atendimentos anteriores a {before:%Y-%m-%d} em {settings.archive_dir}")
+    if args.dry_run:
+        with engine.connect() as conn:
+            total = conn.scalar(select(func.count()).where(models.Atendimento.data < before))
+        print(f"   {total} atendimentos seriam arquivados")
+        return 0
+
+    entries = atendimento_archive.archive_before(engine, before)
+    for entry in entries:
+        print(f"   ✓ {entry['month']}: {entry['count']} atendimentos → {entry['file']}")
+    print(f"✅ {sum(entry['count'] for entry in entries)} atendimentos arquivados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
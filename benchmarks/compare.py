@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compara dois resultados do ``benchmarks.load_test`` e aponta regressões.
+
+Um cenário regrediu quando o percentil escolhido piorou mais que o limite
+relativo (``--threshold``). O código de saída é 1 se houver regressão, o que
+permite usar o comando em CI.
+
+Uso:
+    python -m benchmarks.compare base.json novo.json --metric p95_ms --threshold 0.15
+"""
+import argparse
+import json
+import sys
+
+
+def compare(base: dict, current: dict, metric: str, threshold: float) -> list:
+    """Retorna as linhas (cenário, antes, depois, variação, regrediu?)."""
+    rows = []
+    for name, result in current["results"].items():
+        before = base["results"].get(name)
+        if before is None or not before[metric]:
+            continue
+        change = (result[metric] - before[metric]) / before[metric]
+        rows.append((name, before[metric], result[metric], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="p95_ms", choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+    parser.add_argument("--threshold", type=float, default=0.15, help="piora relativa tolerada (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    print(f"📊 {args.metric}: {base['meta']['revision']} → {current['meta']['revision']}")
+    rows = compare(base, current, args.metric, args.threshold)
+    for name, before, after, change, regressed in rows:
+        flag = "❌ REGRESSÃO" if regressed else "✅"
+        print(f"{name:<26} {before:>9.2f} → {after:>9.2f} ms ({change:+.1%}) {flag}")
+
+    if any(row[4] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Gerador de massa de dados determinística para os benchmarks.
+
+Parte do ``populate_db.py`` (tabelas, usuários admin/demo e dados de exemplo)
+e acrescenta clínicas, veterinários, tutores, pets e atendimentos gerados a
+partir de uma semente fixa, de modo que duas execuções com os mesmos
+parâmetros produzam exatamente o mesmo banco. Deve ser executado em um banco
+vazio (CRMVs e emails gerados são únicos por semente).
+
+Uso:
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.dataset --tutores 5000
+"""
+import argparse
+import datetime
+import random
+
+from sqlalchemy import insert
+
+import populate_db
+from database import SessionLocal, engine
+from models import models
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Heitor", "Iara", "João"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Costa", "Pereira", "Alves"]
+CIDADES = ["São Paulo", "Rio de Janeiro", "Natal", "Recife", "Curitiba", "Belo Horizonte"]
+ESPECIALIDADES = ["Clínica Geral", "Cirurgia", "Dermatologia", "Cardiologia", "Ortopedia"]
+ESPECIES = {"Cão": ["Labrador", "Poodle", "Vira-lata"], "Gato": ["Siamês", "Persa"], "Ave": ["Calopsita"]}
+DESCRICOES = ["Consulta de rotina", "Vacinação", "Retorno", "Exame de sangue", "Cirurgia", "Emergência"]
+
+BATCH_SIZE = 5000
+
+
+def _insert_batches(db, model, rows) -> list:
+    """Insere as linhas em lotes e retorna os ids gerados, na ordem das linhas."""
+    ids = []
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    for start in range(0, len(rows), BATCH_SIZE):
+        ids.extend(db.scalars(stmt, rows[start:start + BATCH_SIZE]))
+    return ids
+
+
+def seed_dataset(
+    seed: int = 42,
+    clinicas: int = 10,
+    veterinarios_por_clinica: int = 5,
+    tutores: int = 1000,
+    pets_por_tutor: int = 2,
+    atendimentos_por_pet: int = 5,
+    dias: int = 730,
+) -> dict:
+    """Cria a massa de dados e retorna a contagem de linhas geradas por tabela."""
+    populate_db.init_db()
+    populate_db.populate_db()
+
+    rng = random.Random(seed)
+    agora = datetime.datetime(2025, 1, 1)
+    db = SessionLocal()
+    try:
+        clinica_rows = [
+            {
+                "nome": f"Clínica {rng.choice(SOBRENOMES)} {i}",
+                "cidade": rng.choice(CIDADES),
+                "endereco": f"Rua {i}, {rng.randint(1, 999)}",
+            }
+            for i in range(clinicas)
+        ]
+        clinica_ids = _insert_batches(db, models.Clinica, clinica_rows)
+
+        veterinario_rows = []
+        for clinica_id in clinica_ids:
+            for _ in range(veterinarios_por_clinica):
+                n = len(veterinario_rows)
+                veterinario_rows.append({
+                    "nome": f"Dr(a). {rng.choice(NOMES)} {rng.choice(SOBRENOMES)}",
+                    "crmv": f"BENCH-{seed}-{n}",
+                    "email": f"vet{n}.{seed}@veterinaria-bench.com",
+                    "especialidade": rng.choice(ESPECIALIDADES),
+                    "clinica_id": clinica_id,
+                })
+        veterinario_ids = _insert_batches(db, models.Veterinario, veterinario_rows)
+
+        tutor_rows = [
+            {
+                "nome": f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}",
+                "telefone": f"(84) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                "email": f"tutor{i}.{seed}@veterinaria-bench.com",
+                "endereco": f"Av. {rng.choice(SOBRENOMES)}, {rng.randint(1, 999)}",
+            }
+            for i in range(tutores)
+        ]
+        tutor_ids = _insert_batches(db, models.Tutor, tutor_rows)
+
+        pet_rows = []
+        for tutor_id in tutor_ids:
+            for _ in range(pets_por_tutor):
+                especie = rng.choice(list(ESPECIES))
+                pet_rows.append({
+                    "nome": rng.choice(["Rex", "Mimi", "Thor", "Luna", "Bob", "Nina"]),
+                    "especie": especie,
+                    "raca": rng.choice(ESPECIES[especie]),
+                    "idade": rng.randint(0, 15),
+                    "tutor_id": tutor_id,
+                })
+        pet_ids = _insert_batches(db, models.Pet, pet_rows)
+
+        atendimento_rows = [
+            {
+                "data": agora - datetime.timedelta(minutes=rng.randint(0, dias * 24 * 60)),
+                "descricao": rng.choice(DESCRICOES),
+                "pet_id": pet_id,
+                "veterinario_id": rng.choice(veterinario_ids),
+            }
+            for pet_id in pet_ids
+            for _ in range(atendimentos_por_pet)
+        ]
+        _insert_batches(db, models.Atendimento, atendimento_rows)
+
+        db.commit()
+    finally:
+        db.close()
+
+    return {
+        "clinicas": len(clinica_rows),
+        "veterinarios": len(veterinario_rows),
+        "tutores": len(tutor_rows),
+        "pets": len(pet_rows),
+        "atendimentos": len(atendimento_rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clinicas", type=int, default=10)
+    parser.add_argument("--veterinarios-por-clinica", type=int, default=5)
+    parser.add_argument("--tutores", type=int, default=1000)
+    parser.add_argument("--pets-por-tutor", type=int, default=2)
+    parser.add_argument("--atendimentos-por-pet", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"🗄️  Banco: {engine.url.render_as_string(hide_password=True)}")
+    counts = seed_dataset(
+        seed=args.seed,
+        clinicas=args.clinicas,
+        veterinarios_por_clinica=args.veterinarios_por_clinica,
+        tutores=args.tutores,
+        pets_por_tutor=args.pets_por_tutor,
+        atendimentos_por_pet=args.atendimentos_por_pet,
+    )
+    for table, count in counts.items():
+        print(f"   - {count} {table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Teste de carga reprodutível da API.
+
+Para cada cenário (um por roteador, leituras e escritas) dispara um número
+fixo de requisições com a concorrência configurada e mede latência
+p50/p95/p99 e vazão. O resultado é gravado em JSON para comparação entre
+commits com ``python -m benchmarks.compare``.
+
+Por padrão a aplicação roda no próprio processo (``httpx.ASGITransport``),
+usando o banco de ``DATABASE_URL``; com ``--url`` o alvo é um servidor já em
+execução (ex: uvicorn com vários workers apontando para um PostgreSQL local).
+
+Uso:
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.dataset
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.load_test \\
+        --concurrency 20 --requests 500 --output bench_results.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import statistics
+import subprocess
+import time
+
+import httpx
+
+USERNAME = "admin"
+PASSWORD = "admin123"
+
+
+def scenarios(ids: dict) -> list:
+    """Cenários do benchmark: (nome, método, função que gera path e corpo)."""
+    def pick(rng, entity):
+        return rng.choice(ids[entity])
+
+    return [
+        ("clinicas.list", "GET", lambda rng: ("/api/clinicas/?limit=100", None)),
+        ("clinicas.detail", "GET", lambda rng: (f"/api/clinicas/{pick(rng, 'clinicas')}", None)),
+        ("veterinarios.list", "GET", lambda rng: ("/api/veterinarios/?limit=100", None)),
+        ("veterinarios.by_clinica", "GET", lambda rng: (f"/api/veterinarios/?clinica_id={pick(rng, 'clinicas')}", None)),
+        ("tutores.list", "GET", lambda rng: ("/api/tutores/?limit=100", None)),
+        ("tutores.detail", "GET", lambda rng: (f"/api/tutores/{pick(rng, 'tutores')}", None)),
+        ("pets.list", "GET", lambda rng: ("/api/pets/?limit=100", None)),
+        ("pets.by_tutor", "GET", lambda rng: (f"/api/pets/?tutor_id={pick(rng, 'tutores')}", None)),
+        ("atendimentos.list", "GET", lambda rng: ("/api/atendimentos/?limit=100", None)),
+        ("atendimentos.by_pet", "GET", lambda rng: (f"/api/atendimentos/?pet_id={pick(rng, 'pets')}", None)),
+        ("atendimentos.detail", "GET", lambda rng: (f"/api/atendimentos/{pick(rng, 'atendimentos')}", None)),
+        ("usuarios.list", "GET", lambda rng: ("/api/usuarios/", None)),
+        ("pets.create", "POST", lambda rng: ("/api/pets/", {
+            "nome": "Bench", "especie": "Cão", "tutor_id": pick(rng, "tutores"),
+        })),
+        ("atendimentos.create", "POST", lambda rng: ("/api/atendimentos/", {
+            "descricao": "Benchmark", "pet_id": pick(rng, "pets"), "veterinario_id": pick(rng, "veterinarios"),
+        })),
+    ]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    """Percentis em milissegundos e vazão em requisições por segundo."""
+    ms = sorted(latency * 1000 for latency in latencies)
+    cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(cuts[49], 3) if ms else 0.0,
+        "p95_ms": round(cuts[94], 3) if ms else 0.0,
+        "p99_ms": round(cuts[98], 3) if ms else 0.0,
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+        "throughput_rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+async def run_scenario(client, headers, method, make_request, total, concurrency, rng) -> dict:
+    requests = iter([make_request(rng) for _ in range(total)])
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        for path, body in requests:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def collect_ids(client, headers) -> dict:
+    """Busca os ids (até 1000 por entidade) usados para sortear os paths."""
+    ids = {}
+    for entity in ("clinicas", "veterinarios", "tutores", "pets", "atendimentos"):
+        response = await client.get(f"/api/{entity}/?limit=1000", headers=headers)
+        response.raise_for_status()
+        ids[entity] = [item["id"] for item in response.json()]
+        if not ids[entity]:
+            raise SystemExit(f"❌ Nenhum registro em {entity}. Rode antes: python -m benchmarks.dataset")
+    return ids
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+async def run(args) -> dict:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        target = args.url
+    else:
+        import main
+        from database import engine
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench", timeout=60)
+        target = f"in-process ({engine.url.render_as_string(hide_password=True)})"
+
+    async with client:
+        response = await client.post("/api/auth/token", data={"username": USERNAME, "password": PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        ids = await collect_ids(client, headers)
+
+        results = {}
+        for name, method, make_request in scenarios(ids):
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            rng = random.Random(f"{args.seed}:{name}")
+            # Aquecimento: estabiliza pools de conexão e caches antes da medição
+            await run_scenario(client, headers, method, make_request, args.warmup, args.concurrency, rng)
+            results[name] = await run_scenario(
+                client, headers, method, make_request, args.requests, args.concurrency, rng
+            )
+            r = results[name]
+            print(f"{name:<26} p50={r['p50_ms']:>8.2f}ms p95={r['p95_ms']:>8.2f}ms "
+                  f"p99={r['p99_ms']:>8.2f}ms {r['throughput_rps']:>9.1f} req/s erros={r['errors']}")
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "target": target,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL de um servidor em execução (padrão: app no próprio processo)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="requisições medidas por cenário")
+    parser.add_argument("--warmup", type=int, default=20, help="requisições de aquecimento por cenário")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="prefixos de cenários a executar (ex: pets atendimentos.list)")
+    parser.add_argument("--output", help="arquivo JSON de saída")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados salvos em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
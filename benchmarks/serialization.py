@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de CPU por página das listagens: consulta + serialização.
+
+Compara, para cada entidade, o caminho padrão do FastAPI (objetos ORM
+validados pelo ``response_model`` com ``from_attributes`` e serializados com
+``json``) com o caminho rápido de ``api.fast_json`` (SELECT de colunas +
+``RowSerializer``). Mede ``time.process_time`` (CPU, não tempo de parede).
+
+Uso:
+    python -m benchmarks.serialization [--rows 100] [--iterations 200]
+
+Usa um SQLite em memória próprio, independente do DATABASE_URL configurado.
+"""
+import argparse
+import datetime
+import json
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api import fast_json
+from crud import atendimento as atendimento_crud, pet as pet_crud, tutor as tutor_crud
+from database import Base
+from models import models
+from schemas import atendimento as atendimento_schema, pet as pet_schema, tutor as tutor_schema
+
+
+def seed(db, rows: int) -> None:
+    tutor_ids = db.scalars(
+        insert(models.Tutor).returning(models.Tutor.id, sort_by_parameter_order=True),
+        [{"nome": f"Tutor {i}", "telefone": "84999990000", "email": f"tutor{i}@veterinaria-bench.com"} for i in range(rows)],
+    ).all()
+    pet_ids = db.scalars(
+        insert(models.Pet).returning(models.Pet.id, sort_by_parameter_order=True),
+        [{"nome": f"Pet {i}", "especie": "Cão", "raca": "SRD", "idade": i % 15, "tutor_id": tutor_id}
+         for i, tutor_id in enumerate(tutor_ids)],
+    ).all()
+    clinica_id = db.scalar(insert(models.Clinica).values(nome="Clínica", cidade="Natal").returning(models.Clinica.id))
+    veterinario_id = db.scalar(
+        insert(models.Veterinario).values(nome="Vet", crmv="CRMV-1", clinica_id=clinica_id).returning(models.Veterinario.id)
+    )
+    agora = datetime.datetime(2025, 1, 1)
+    db.execute(insert(models.Atendimento), [
+        {"descricao": "Consulta", "data": agora, "pet_id": pet_id, "veterinario_id": veterinario_id}
+        for pet_id in pet_ids
+    ])
+    db.commit()
+
+
+def response_model_path(adapter, objects) -> bytes:
+    """O que o FastAPI faz com ``response_model=List[...]`` e JSONResponse."""
+    validated = adapter.validate_python(objects, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode()
+
+
+def cpu_per_page(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="linhas por página")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    with Session() as db:
+        seed(db, args.rows)
+
+    cases = [
+        ("tutores", tutor_crud.get_tutores, tutor_crud.get_tutores_rows, tutor_schema.Tutor),
+        ("pets", pet_crud.get_pets, pet_crud.get_pets_rows, pet_schema.Pet),
+        ("atendimentos", atendimento_crud.get_atendimentos, atendimento_crud.get_atendimentos_rows,
+         atendimento_schema.Atendimento),
+    ]
+    print(f"JSON: {'orjson' if fast_json.orjson is not None else 'json (orjson ausente)'}")
+    print(f"{'listagem':<14} {'response_model':>16} {'fast_json':>12} {'ganho':>8}   (ms de CPU por página de {args.rows})")
+    for name, get_objects, get_rows, schema in cases:
+        adapter = TypeAdapter(List[schema])
+        serializer = fast_json.RowSerializer(schema)
+
+        def legacy():
+            with Session() as db:
+                return response_model_path(adapter, get_objects(db, limit=args.rows))
+
+        def fast():
+            with Session() as db:
+                return serializer(get_rows(db, limit=args.rows))
+
+        # Mesmo conteúdo nos dois caminhos
+        assert json.loads(legacy()) == json.loads(fast()), name
+        legacy_ms = cpu_per_page(legacy, args.iterations)
+        fast_ms = cpu_per_page(fast, args.iterations)
+        print(f"{name:<14} {legacy_ms:>14.3f}ms {fast_ms:>10.3f}ms {legacy_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do caminho de escrita: conta os statements SQL emitidos por
+create/update de cada entidade, comparando o padrão antigo
+(SELECT + UPDATE + refresh) com o CRUD atual (INSERT/UPDATE ... RETURNING).
+
+Uso:
+    python -m benchmarks.write_path [--iterations 200]
+
+Usa um SQLite em memória próprio, independente do DATABASE_URL configurado.
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models import models
+from crud import clinica as clinica_crud, pet as pet_crud, tutor as tutor_crud
+from schemas import clinica as clinica_schema, pet as pet_schema, tutor as tutor_schema
+
+
+def legacy_create(db, model, data):
+    """Padrão anterior: add + commit + refresh (SELECT extra)."""
+    obj = model(**data)
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def legacy_update(db, model, obj_id, data):
+    """Padrão anterior: SELECT + UPDATE + refresh (SELECT extra)."""
+    obj = db.query(model).filter(model.id == obj_id).first()
+    for key, value in data.items():
+        setattr(obj, key, value)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    # Mesma configuração de sessão de database.SessionLocal em cada cenário
+    legacy_session = sessionmaker(autoflush=False, bind=engine)
+    current_session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    clinica = clinica_schema.ClinicaCreate(nome="Clínica", cidade="Natal", endereco="Rua A")
+    tutor = tutor_schema.TutorCreate(nome="Tutor", telefone="84999990000")
+
+    with current_session() as db:
+        tutor_id = tutor_crud.create_tutor(db, tutor).id
+
+    pet = pet_schema.PetCreate(nome="Rex", especie="Cachorro", tutor_id=tutor_id)
+
+    # Os updates mudam o nome a cada iteração para que o UPDATE seja sempre emitido
+    def pet_update(i):
+        return pet_schema.PetUpdate(nome=f"Rex {i}", especie="Cachorro")
+
+    def clinica_update(i):
+        return clinica_schema.ClinicaUpdate(nome=f"Clínica {i}", cidade="Natal", endereco="Rua B")
+
+    scenarios = [
+        ("create clinica", "antes", legacy_session,
+         lambda db, i: legacy_create(db, models.Clinica, clinica.model_dump())),
+        ("create clinica", "agora", current_session,
+         lambda db, i: clinica_crud.create_clinica(db, clinica)),
+        ("update clinica", "antes", legacy_session,
+         lambda db, i: legacy_update(db, models.Clinica, 1, clinica_update(i).model_dump())),
+        ("update clinica", "agora", current_session,
+         lambda db, i: clinica_crud.update_clinica(db, 1, clinica_update(-i))),
+        ("create pet", "antes", legacy_session,
+         lambda db, i: legacy_create(db, models.Pet, pet.model_dump())),
+        ("create pet", "agora", current_session,
+         lambda db, i: pet_crud.create_pet(db, pet)),
+        ("update pet", "antes", legacy_session,
+         lambda db, i: legacy_update(db, models.Pet, 1, pet_update(i).model_dump())),
+        ("update pet", "agora", current_session,
+         lambda db, i: pet_crud.update_pet(db, 1, pet_update(-i))),
+    ]
+
+    print(f"{'operação':<16} {'versão':<7} {'queries/escrita':>16} {'µs/escrita':>12}")
+    for name, label, session_factory, operation in scenarios:
+        statements.clear()
+        start = time.perf_counter()
+        for i in range(1, args.iterations + 1):
+            with session_factory() as db:
+                result = operation(db, i)
+                # Serialização da resposta: acessa os atributos como o FastAPI faria
+                _ = {column.key: getattr(result, column.key) for column in result.__table__.c}
+        elapsed = time.perf_counter() - start
+        queries = len(statements) / args.iterations
+        print(f"{name:<16} {label:<7} {queries:>16.1f} {elapsed / args.iterations * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings
 
+def to_async_url(url: str) -> str:
+    """Troca o driver da URL pelo driver assíncrono correspondente."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
 class Settings(BaseSettings):
     # Configurações do banco de dados
     # Para desenvolvimento local: SQLite
@@ -14,17 +23,100 @@ class Settings(BaseSettings):
     postgres_port: str = "5432"
     postgres_db: str = "veterinaria_db"
     
+    # Stack assíncrona (AsyncEngine + endpoints sem threadpool)
+    # Requer aiosqlite (SQLite) ou asyncpg (PostgreSQL) instalados
+    async_database: bool = False
+    
+    # Réplicas de leitura (URLs separadas por vírgula; vazio = tudo no primário)
+    # Os handlers read_* usam as réplicas em round-robin; as escritas ficam no primário
+    read_replica_urls: str = ""
+    # Após uma escrita, o mesmo token lê do primário por N segundos (0 desabilita)
+    read_your_writes_seconds: float = 5
+    
+    # Pool de conexões (por processo: com N workers o banco vê até
+    # N * (pool_size + max_overflow) conexões)
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30  # segundos esperando uma conexão livre
+    pool_recycle: int = 300  # PostgreSQL: recicla conexões com mais de N segundos
+    pool_use_lifo: bool = False  # LIFO deixa as conexões excedentes ociosas expirarem
+    # Pre-ping: "always" (a cada checkout), "idle" (só conexões ociosas há mais
+    # de pool_pre_ping_idle_seconds) ou "never"
+    pool_pre_ping: Literal["always", "idle", "never"] = "always"
+    pool_pre_ping_idle_seconds: int = 30
+    
     # Configurações da aplicação
     app_name: str = "API de Gerenciamento de Clínicas Veterinárias"
     app_version: str = "2.0.0"
     debug: bool = True
     environment: str = "development"  # development, production
     
+    # Servidor de produção (ENVIRONMENT=production): gunicorn com workers
+    # uvicorn, ver gunicorn.conf.py e entrypoint.sh
+    server_bind: str = "0.0.0.0:8000"
+    web_concurrency: int = 0  # número de workers (0 = um por CPU)
+    worker_timeout_seconds: int = 60  # worker sem responder por N segundos é reiniciado
+    graceful_timeout_seconds: int = 30  # prazo para terminar as requisições no shutdown
+    worker_max_requests: int = 0  # recicla o worker após N requisições (0 = nunca)
+    # Diretório das métricas Prometheus compartilhadas entre os workers
+    prometheus_multiproc_dir: str = "/tmp/prometheus-multiproc"
+    
+    # Métricas Prometheus em /metrics
+    metrics_enabled: bool = True
+    
+    # Detector de N+1 e queries lentas por requisição (opt-in; útil em dev/testes)
+    query_inspection_enabled: bool = False
+    query_repeat_threshold: int = 5  # mesmo statement N vezes na requisição = possível N+1
+    slow_query_ms: float = 200
+    query_budget: int = 0  # máximo de queries por requisição (0 = sem limite)
+    query_budget_strict: bool = False  # estoura QueryBudgetExceeded em vez de só registrar
+    
     # Configurações de autenticação JWT
     secret_key: str = "your-secret-key-here-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     
+    # Limite de itens por requisição nos endpoints /bulk
+    bulk_max_items: int = 1000
+    
+    # Particionamento mensal de atendimentos por data (somente PostgreSQL,
+    # ver manage_partitions.py): partições criadas com N meses de antecedência
+    atendimentos_partitioning: bool = False
+    atendimentos_partition_months_ahead: int = 3
+    
+    # Arquivo frio de atendimentos (archive_atendimentos.py): meses mais antigos
+    # que N viram NDJSON comprimido em archive_dir, lido de forma transparente
+    archive_dir: str = "archive"
+    archive_after_months: int = 18
+    archive_block_rows: int = 1000  # linhas por bloco comprimido (unidade de leitura)
+    
+    # Linhas por bloco nas exportações em streaming (/export)
+    export_batch_size: int = 1000
+    # Linhas por bloco (RecordBatch) lidas pelo analytics (/api/analytics)
+    analytics_batch_size: int = 50000
+    
+    # Agenda dos veterinários (/api/veterinarios/{id}/availability): expediente
+    # em horas UTC, grade de início dos horários e período máximo por consulta
+    agenda_hora_inicio: int = 8
+    agenda_hora_fim: int = 18
+    agenda_intervalo_minutos: int = 30
+    agenda_max_dias: int = 31
+    
+    # Cache de usuários autenticados (0 desabilita)
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_size: int = 1024
+    
+    # Cache de respostas de clínicas/veterinários: memory, redis ou none
+    response_cache_backend: Literal["memory", "redis", "none"] = "memory"
+    response_cache_ttl_seconds: int = 300
+    response_cache_max_entries: int = 1024
+    redis_url: str = "redis://localhost:6379/0"
+    
+    # Pool de hashing de senhas (bcrypt); 0 workers usa o threadpool
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 64
+    password_hash_retry_after_seconds: int = 1
+    
     @property
     def postgres_url(self) -> str:
         """Constrói a URL do PostgreSQL a partir das configurações."""
@@ -37,6 +129,16 @@ class Settings(BaseSettings):
             return self.postgres_url
         return self.database_url
     
+    @property
+    def async_database_url(self) -> str:
+        """Retorna a URL efetiva com o driver assíncrono correspondente."""
+        return to_async_url(self.effective_database_url)
+    
+    @property
+    def read_replica_url_list(self) -> list:
+        """URLs das réplicas de leitura (separadas por vírgula em READ_REPLICA_URLS)."""
+        return [url.strip() for url in self.read_replica_urls.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,218 @@
+"""
+CRUD da agenda dos veterinários (agendamentos) e cálculo de disponibilidade.
+
+Dois agendamentos do mesmo veterinário não podem se sobrepor:
+
+- PostgreSQL: exclusion constraint
+  ``EXCLUDE USING gist (veterinario_id WITH =, tsrange(inicio, fim) WITH &&)``
+  (extensão btree_gist), criada por ``ensure_agenda_constraints`` (init_db).
+  O INSERT que sobrepõe falha com exclusion_violation (23P01), sem corrida
+  entre transações concorrentes. O mesmo índice GiST atende a busca dos
+  horários ocupados de um período (``tsrange(...) && tsrange(...)``).
+- Outros bancos (SQLite): índice de intervalos em memória por veterinário
+  (services/agenda_index.py). A checagem roda depois do INSERT, que no
+  SQLite já segura o lock de escrita do banco, e antes do commit.
+"""
+import datetime
+from typing import Optional
+
+from sqlalchemy import exists, func, select, text, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from crud.atendimento import _utc_naive
+from models import models
+from schemas import agendamento as agendamento_schema
+from services.agenda_index import agenda_index
+
+EXCLUSION_CONSTRAINT = "agendamentos_sem_sobreposicao"
+EXCLUSION_VIOLATION = "23P01"
+
+
+class AgendaConflict(Exception):
+    """O horário se sobrepõe a outro agendamento do veterinário."""
+
+
+def ensure_agenda_constraints(conn) -> None:
+    """Cria a exclusion constraint da agenda no PostgreSQL (idempotente)."""
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    exists_ = conn.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": EXCLUSION_CONSTRAINT}
+    ).first()
+    if not exists_:
+        conn.execute(text(
+            f"ALTER TABLE agendamentos ADD CONSTRAINT {EXCLUSION_CONSTRAINT} "
+            "EXCLUDE USING gist (veterinario_id WITH =, tsrange(inicio, fim) WITH &&)"
+        ))
+
+
+def _uses_constraint(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _index(db: Session, veterinario_id: int):
+    def load():
+        table = models.Agendamento.__table__
+        rows = db.execute(
+            select(table.c.inicio, table.c.fim, table.c.id).where(table.c.veterinario_id == veterinario_id)
+        )
+        return [tuple(row) for row in rows]
+    return agenda_index.get(veterinario_id, load)
+
+
+def get_agendamento(db: Session, agendamento_id: int):
+    """Busca um único agendamento pelo ID."""
+    return db.get(models.Agendamento, agendamento_id)
+
+
+def get_agendamentos_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    pet_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+):
+    """
+    Lista os agendamentos (SELECT de colunas) com filtros opcionais; o
+    período filtra pelo ``inicio`` (índice (veterinario_id, inicio)).
+    """
+    data_inicio, data_fim = _utc_naive(data_inicio), _utc_naive(data_fim)
+    table = models.Agendamento.__table__
+    stmt = select(*table.c)
+    if veterinario_id is not None:
+        stmt = stmt.where(table.c.veterinario_id == veterinario_id)
+    if pet_id is not None:
+        stmt = stmt.where(table.c.pet_id == pet_id)
+    if data_inicio is not None:
+        stmt = stmt.where(table.c.inicio >= data_inicio)
+    if data_fim is not None:
+        stmt = stmt.where(table.c.inicio < data_fim)
+    stmt = stmt.order_by(table.c.id)
+    if after_id is not None:
+        stmt = stmt.where(table.c.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return db.execute(stmt.limit(limit)).all()
+
+
+def references_exist(db: Session, veterinario_id: int, pet_id: Optional[int] = None):
+    """Verifica, em uma única consulta, se o veterinário e o pet (se informado) existem."""
+    pet_exists = exists().where(models.Pet.id == pet_id) if pet_id is not None else true()
+    return tuple(db.execute(select(
+        exists().where(models.Veterinario.id == veterinario_id),
+        pet_exists,
+    )).one())
+
+
+def create_agendamento(db: Session, agendamento: agendamento_schema.AgendamentoCreate):
+    """
+    Cria um agendamento. Levanta ``AgendaConflict`` (sem gravar nada) se o
+    horário se sobrepuser a outro agendamento do veterinário.
+    """
+    values = agendamento.model_dump()
+    values["inicio"], values["fim"] = _utc_naive(values["inicio"]), _utc_naive(values["fim"])
+    db_agendamento = models.Agendamento(**values)
+    if _uses_constraint(db):
+        db.add(db_agendamento)
+        try:
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            if getattr(exc.orig, "pgcode", None) == EXCLUSION_VIOLATION:
+                raise AgendaConflict() from exc
+            raise
+        return db_agendamento
+
+    index = _index(db, agendamento.veterinario_id)
+    try:
+        db.add(db_agendamento)
+        db.flush()
+        if not index.add_if_free(db_agendamento.inicio, db_agendamento.fim, db_agendamento.id):
+            db.rollback()
+            raise AgendaConflict()
+        db.commit()
+    except AgendaConflict:
+        raise
+    except Exception:
+        agenda_index.invalidate(agendamento.veterinario_id)
+        raise
+    return db_agendamento
+
+
+def delete_agendamento(db: Session, agendamento_id: int):
+    """Remove um agendamento, liberando o horário."""
+    db_agendamento = get_agendamento(db, agendamento_id)
+    if db_agendamento:
+        db.delete(db_agendamento)
+        db.commit()
+        if not _uses_constraint(db):
+            _index(db, db_agendamento.veterinario_id).remove(db_agendamento.id)
+    return db_agendamento
+
+
+def ocupados(db: Session, veterinario_id: int, inicio: datetime.datetime, fim: datetime.datetime) -> list:
+    """Intervalos ``(inicio, fim)`` ocupados do veterinário que tocam ``[inicio, fim)``, pelo início."""
+    if not _uses_constraint(db):
+        return [item[:2] for item in _index(db, veterinario_id).overlapping(inicio, fim)]
+    table = models.Agendamento.__table__
+    # Mesma expressão da exclusion constraint: a busca usa o índice GiST
+    stmt = (
+        select(table.c.inicio, table.c.fim)
+        .where(
+            table.c.veterinario_id == veterinario_id,
+            func.tsrange(table.c.inicio, table.c.fim).op("&&")(func.tsrange(inicio, fim)),
+        )
+        .order_by(table.c.inicio)
+    )
+    return [tuple(row) for row in db.execute(stmt)]
+
+
+def disponibilidade(
+    db: Session,
+    veterinario_id: int,
+    data_inicio: datetime.date,
+    data_fim: datetime.date,
+    duracao_minutos: int,
+    agora: Optional[datetime.datetime] = None,
+) -> list:
+    """
+    Horários livres de ``duracao_minutos`` do veterinário de ``data_inicio``
+    (inclusivo) a ``data_fim`` (exclusivo), dentro do expediente e na grade
+    de ``settings.agenda_intervalo_minutos``, a partir de ``agora`` (padrão:
+    o horário atual em UTC; horários que já começaram não são oferecidos).
+    Uma consulta para os horários ocupados do período e uma única passada
+    sobre eles.
+    """
+    step = datetime.timedelta(minutes=settings.agenda_intervalo_minutos)
+    duracao = datetime.timedelta(minutes=duracao_minutos)
+    agora = agora or datetime.datetime.utcnow()
+    periodo_inicio = datetime.datetime.combine(data_inicio, datetime.time())
+    periodo_fim = datetime.datetime.combine(data_fim, datetime.time())
+    busy = ocupados(db, veterinario_id, max(periodo_inicio, agora), periodo_fim) if agora < periodo_fim else []
+
+    livres, position = [], 0
+    dia = periodo_inicio
+    while dia < periodo_fim:
+        grade = dia + datetime.timedelta(hours=settings.agenda_hora_inicio)
+        expediente_fim = dia + datetime.timedelta(hours=settings.agenda_hora_fim)
+        slot = grade
+        if slot < agora:
+            # Primeiro horário da grade a partir de agora
+            slot = grade - ((grade - agora) // step) * step
+        while slot + duracao <= expediente_fim:
+            while position < len(busy) and busy[position][1] <= slot:
+                position += 1
+            if position < len(busy) and busy[position][0] < slot + duracao:
+                # Pula para o primeiro horário da grade depois do fim do ocupado
+                slot = grade - ((grade - busy[position][1]) // step) * step
+                continue
+            livres.append({"inicio": slot, "fim": slot + duracao})
+            slot += step
+        dia += datetime.timedelta(days=1)
+    return livres
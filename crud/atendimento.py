@@ -1,32 +1,233 @@
+import datetime
+from typing import List, Optional
+from sqlalchemy import exists, insert, literal, select, true, update
 from sqlalchemy.orm import Session
+from crud import estatisticas as estatisticas_crud
 from models import models
 from schemas import atendimento as atendimento_schema
 
+def _utc_naive(value: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """
+    ``data`` é gravada em UTC sem fuso. Um filtro com fuso (ex: ``...-03:00``)
+    vira um ``timestamptz`` no PostgreSQL, e a coluna seria convertida na
+    comparação: o período fica errado e o planejador não consegue podar as
+    partições mensais (ver manage_partitions.py). Converte para UTC sem fuso.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
 def get_atendimento(db: Session, atendimento_id: int):
     """Busca um único atendimento pelo ID."""
     return db.query(models.Atendimento).filter(models.Atendimento.id == atendimento_id).first()
 
-def get_atendimentos(db: Session, skip: int = 0, limit: int = 100):
-    """Busca todos os atendimentos com paginação."""
-    return db.query(models.Atendimento).offset(skip).limit(limit).all()
+def get_atendimentos(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    pet_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+):
+    """
+    Busca todos os atendimentos com paginação e filtros opcionais.
+    Os filtros por pet/veterinário + período usam os índices (pet_id, data)
+    e (veterinario_id, data).
+    Com ``after_id`` usa paginação por chave (id > after_id) em vez de OFFSET.
+    O período é comparado direto na coluna ``data`` (sem funções), o que
+    permite podar as partições com a tabela particionada.
+    """
+    data_inicio, data_fim = _utc_naive(data_inicio), _utc_naive(data_fim)
+    query = db.query(models.Atendimento)
+    if pet_id is not None:
+        query = query.filter(models.Atendimento.pet_id == pet_id)
+    if veterinario_id is not None:
+        query = query.filter(models.Atendimento.veterinario_id == veterinario_id)
+    if data_inicio is not None:
+        query = query.filter(models.Atendimento.data >= data_inicio)
+    if data_fim is not None:
+        query = query.filter(models.Atendimento.data < data_fim)
+    query = query.order_by(models.Atendimento.id)
+    if after_id is not None:
+        return query.filter(models.Atendimento.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
-def create_atendimento(db: Session, atendimento: atendimento_schema.AtendimentoCreate):
-    """Cria um novo atendimento no banco de dados."""
-    db_atendimento = models.Atendimento(**atendimento.model_dump())
-    db.add(db_atendimento)
-    db.commit()
-    db.refresh(db_atendimento)
+def export_statement(
+    pet_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+):
+    """Monta o SELECT de colunas usado na exportação em streaming dos atendimentos."""
+    data_inicio, data_fim = _utc_naive(data_inicio), _utc_naive(data_fim)
+    table = models.Atendimento.__table__
+    stmt = select(*table.c)
+    if pet_id is not None:
+        stmt = stmt.where(table.c.pet_id == pet_id)
+    if veterinario_id is not None:
+        stmt = stmt.where(table.c.veterinario_id == veterinario_id)
+    if data_inicio is not None:
+        stmt = stmt.where(table.c.data >= data_inicio)
+    if data_fim is not None:
+        stmt = stmt.where(table.c.data < data_fim)
+    return stmt.order_by(table.c.id)
+
+def analytics_statement(
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+):
+    """
+    SELECT de colunas usado pelo analytics (``services.analytics``): só ids,
+    data, espécie e clínica. A espécie e a clínica são as gravadas no
+    atendimento (as do momento do atendimento, como nas estatísticas), o que
+    dispensa o join e vale igual para as linhas do arquivo frio.
+    """
+    data_inicio, data_fim = _utc_naive(data_inicio), _utc_naive(data_fim)
+    atendimentos = models.Atendimento.__table__
+    stmt = select(
+        atendimentos.c.id,
+        atendimentos.c.data,
+        atendimentos.c.pet_id,
+        atendimentos.c.veterinario_id,
+        atendimentos.c.especie,
+        atendimentos.c.clinica_id,
+    )
+    if data_inicio is not None:
+        stmt = stmt.where(atendimentos.c.data >= data_inicio)
+    if data_fim is not None:
+        stmt = stmt.where(atendimentos.c.data < data_fim)
+    if clinica_id is not None:
+        stmt = stmt.where(atendimentos.c.clinica_id == clinica_id)
+    if veterinario_id is not None:
+        stmt = stmt.where(atendimentos.c.veterinario_id == veterinario_id)
+    return stmt
+
+def get_atendimentos_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    pet_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+):
+    """
+    Mesma consulta de ``get_atendimentos`` com SELECT só de colunas (linhas em
+    vez de objetos ORM), para a serialização rápida da listagem.
+    """
+    stmt = export_statement(
+        pet_id=pet_id, veterinario_id=veterinario_id, data_inicio=data_inicio, data_fim=data_fim
+    )
+    if after_id is not None:
+        stmt = stmt.where(models.Atendimento.__table__.c.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return db.execute(stmt.limit(limit)).all()
+
+def create_atendimento_if_refs_exist(db: Session, atendimento: atendimento_schema.AtendimentoCreate):
+    """
+    Cria um atendimento em um único INSERT ... SELECT do pet × veterinário,
+    que só insere a linha se os dois existirem (e copia a espécie e a clínica).
+    Retorna None (sem inserir) se alguma das referências não existir.
+    """
+    values = {**atendimento.model_dump(), "data": datetime.datetime.utcnow()}
+    table, pets, veterinarios = models.Atendimento.__table__, models.Pet.__table__, models.Veterinario.__table__
+    source = select(
+        *[literal(value, type_=table.c[key].type).label(key) for key, value in values.items()],
+        pets.c.especie,
+        veterinarios.c.clinica_id,
+    ).select_from(pets.join(veterinarios, true())).where(
+        pets.c.id == atendimento.pet_id,
+        veterinarios.c.id == atendimento.veterinario_id,
+    )
+    stmt = (
+        insert(models.Atendimento)
+        .from_select([*values, "especie", "clinica_id"], source)
+        .returning(models.Atendimento)
+    )
+    db_atendimento = db.scalars(stmt).one_or_none()
+    if db_atendimento is not None:
+        # Rollup das estatísticas na mesma transação do INSERT
+        estatisticas_crud.record_atendimentos(db, [db_atendimento], delta=1)
+        db.commit()
     return db_atendimento
 
-def update_atendimento(db: Session, atendimento_id: int, atendimento: atendimento_schema.AtendimentoUpdate):
-    """Atualiza um atendimento existente."""
-    db_atendimento = get_atendimento(db, atendimento_id)
-    if db_atendimento:
-        update_data = atendimento.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_atendimento, key, value)
+def references_exist(db: Session, pet_id: int, veterinario_id: int):
+    """Verifica, em uma única consulta, se o pet e o veterinário existem."""
+    return tuple(db.execute(select(
+        exists().where(models.Pet.id == pet_id),
+        exists().where(models.Veterinario.id == veterinario_id),
+    )).one())
+
+def create_atendimentos_bulk(db: Session, atendimentos: List[atendimento_schema.AtendimentoCreate]):
+    """
+    Cria vários atendimentos em uma única transação.
+    Pets e veterinários são validados com uma consulta IN (...) por tabela
+    (que traz também a espécie e a clínica) e as linhas válidas são inseridas
+    com um INSERT multi-linha com RETURNING.
+    Retorna os atendimentos criados e os erros por índice do lote.
+    """
+    pet_ids = {atendimento.pet_id for atendimento in atendimentos}
+    veterinario_ids = {atendimento.veterinario_id for atendimento in atendimentos}
+    existing_pets = dict(db.execute(
+        select(models.Pet.id, models.Pet.especie).where(models.Pet.id.in_(pet_ids))
+    ).all())
+    existing_veterinarios = dict(db.execute(
+        select(models.Veterinario.id, models.Veterinario.clinica_id).where(models.Veterinario.id.in_(veterinario_ids))
+    ).all())
+
+    rows, errors = [], []
+    for index, atendimento in enumerate(atendimentos):
+        if atendimento.pet_id not in existing_pets:
+            errors.append({"index": index, "detail": f"Pet com id {atendimento.pet_id} não encontrado."})
+        elif atendimento.veterinario_id not in existing_veterinarios:
+            errors.append({"index": index, "detail": f"Veterinário com id {atendimento.veterinario_id} não encontrado."})
+        else:
+            rows.append({
+                **atendimento.model_dump(),
+                "especie": existing_pets[atendimento.pet_id],
+                "clinica_id": existing_veterinarios[atendimento.veterinario_id],
+            })
+
+    created = []
+    if rows:
+        table = models.Atendimento.__table__
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+        created = db.execute(stmt, rows).all()
+        estatisticas_crud.record_atendimentos(db, created, delta=1)
         db.commit()
-        db.refresh(db_atendimento)
+    return {"created": created, "errors": errors}
+
+def update_atendimento(
+    db: Session,
+    atendimento_id: int,
+    atendimento: atendimento_schema.AtendimentoUpdate,
+    expected_updated_at: Optional[datetime.datetime] = None,
+):
+    """
+    Atualiza um atendimento existente com um único UPDATE ... RETURNING.
+    Retorna None se o registro não existir.
+    Com ``expected_updated_at`` (If-Match), só atualiza se a versão ainda
+    for essa; caso contrário também retorna None.
+    """
+    update_data = atendimento.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_atendimento(db, atendimento_id)
+    stmt = update(models.Atendimento).where(models.Atendimento.id == atendimento_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(models.Atendimento.updated_at == expected_updated_at)
+    stmt = (
+        stmt
+        .values(**update_data)
+        .returning(models.Atendimento)
+    )
+    db_atendimento = db.scalars(stmt).one_or_none()
+    db.commit()
     return db_atendimento
 
 def delete_atendimento(db: Session, atendimento_id: int):
@@ -34,5 +235,6 @@ def delete_atendimento(db: Session, atendimento_id: int):
     db_atendimento = get_atendimento(db, atendimento_id)
     if db_atendimento:
         db.delete(db_atendimento)
+        estatisticas_crud.record_atendimentos(db, [db_atendimento], delta=-1)
         db.commit()
     return db_atendimento
\ No newline at end of file
@@ -1,4 +1,7 @@
-from sqlalchemy.orm import Session
+import datetime
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
 from models import models
 from schemas import clinica as clinica_schema
 
@@ -6,27 +9,73 @@ def get_clinica(db: Session, clinica_id: int):
     """Busca uma única clínica pelo ID."""
     return db.query(models.Clinica).filter(models.Clinica.id == clinica_id).first()
 
-def get_clinicas(db: Session, skip: int = 0, limit: int = 100):
-    """Busca todas as clínicas com paginação."""
-    return db.query(models.Clinica).offset(skip).limit(limit).all()
+def get_clinica_full(db: Session, clinica_id: int):
+    """
+    Busca uma clínica com seus veterinários (2 queries via selectinload).
+    """
+    return (
+        db.query(models.Clinica)
+        .options(selectinload(models.Clinica.veterinarios))
+        .filter(models.Clinica.id == clinica_id)
+        .first()
+    )
+
+def get_clinicas(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Busca todas as clínicas com paginação.
+    Com ``after_id`` usa paginação por chave (id > after_id) em vez de OFFSET.
+    """
+    query = db.query(models.Clinica).order_by(models.Clinica.id)
+    if after_id is not None:
+        return query.filter(models.Clinica.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def get_clinicas_rows(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Mesma consulta de ``get_clinicas`` com SELECT só de colunas (linhas em vez
+    de objetos ORM), para a serialização rápida da listagem.
+    """
+    table = models.Clinica.__table__
+    stmt = select(*table.c).order_by(table.c.id)
+    if after_id is not None:
+        stmt = stmt.where(table.c.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return db.execute(stmt.limit(limit)).all()
 
 def create_clinica(db: Session, clinica: clinica_schema.ClinicaCreate):
     """Cria uma nova clínica no banco de dados."""
     db_clinica = models.Clinica(**clinica.model_dump())
     db.add(db_clinica)
+    # O id vem do próprio INSERT e, com expire_on_commit=False, dispensa o refresh
     db.commit()
-    db.refresh(db_clinica)
     return db_clinica
 
-def update_clinica(db: Session, clinica_id: int, clinica: clinica_schema.ClinicaUpdate):
-    """Atualiza uma clínica existente."""
-    db_clinica = get_clinica(db, clinica_id)
-    if db_clinica:
-        update_data = clinica.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_clinica, key, value)
-        db.commit()
-        db.refresh(db_clinica)
+def update_clinica(
+    db: Session,
+    clinica_id: int,
+    clinica: clinica_schema.ClinicaUpdate,
+    expected_updated_at: Optional[datetime.datetime] = None,
+):
+    """
+    Atualiza uma clínica existente com um único UPDATE ... RETURNING.
+    Retorna None se o registro não existir.
+    Com ``expected_updated_at`` (If-Match), só atualiza se a versão ainda
+    for essa; caso contrário também retorna None.
+    """
+    update_data = clinica.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_clinica(db, clinica_id)
+    stmt = update(models.Clinica).where(models.Clinica.id == clinica_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(models.Clinica.updated_at == expected_updated_at)
+    stmt = (
+        stmt
+        .values(**update_data)
+        .returning(models.Clinica)
+    )
+    db_clinica = db.scalars(stmt).one_or_none()
+    db.commit()
     return db_clinica
 
 def delete_clinica(db: Session, clinica_id: int):
@@ -0,0 +1,178 @@
+"""
+Estatísticas de atendimentos (``/api/stats``) a partir do rollup
+``estatisticas_atendimentos`` (dia × clínica × veterinário × espécie).
+
+O rollup é incrementado/decrementado por ``record_atendimentos`` na mesma
+transação que cria ou remove atendimentos (crud/atendimento.py), com um
+único INSERT ... ON CONFLICT DO UPDATE por statement. A chave vem da espécie
+e da clínica gravadas no próprio atendimento na criação: a remoção
+decrementa exatamente a linha incrementada, mesmo que o pet mude de espécie,
+o veterinário de clínica ou que um deles tenha sido removido. As consultas
+agregam só o rollup, cujo tamanho não depende do número de atendimentos, e
+ignoram totais não positivos.
+``rebuild`` recalcula o rollup a partir da tabela (carga inicial ou
+correção); os dias anteriores ao atendimento mais antigo da tabela (já
+arquivados) são preservados.
+"""
+import collections
+import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import Date, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models import models
+
+KEY = ("dia", "clinica_id", "veterinario_id", "especie")
+_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+_upserts = {}
+
+
+def _upsert_statement(dialect: str):
+    """INSERT ... ON CONFLICT (soma ao total), por dialeto."""
+    if dialect not in _upserts:
+        table = models.EstatisticaAtendimento.__table__
+        stmt = _INSERTS[dialect](table)
+        _upserts[dialect] = stmt.on_conflict_do_update(
+            index_elements=list(KEY), set_={"total": table.c.total + stmt.excluded.total}
+        )
+    return _upserts[dialect]
+
+
+def record_atendimentos(db: Session, atendimentos: Iterable, delta: int) -> None:
+    """
+    Soma ``delta`` (1 na criação, -1 na remoção) ao rollup para cada
+    atendimento (objeto ou linha com ``data``, ``veterinario_id``,
+    ``clinica_id`` e ``especie``). Não faz commit: roda na transação de quem
+    criou/removeu.
+    """
+    counts = collections.Counter(
+        (atendimento.data.date(), atendimento.clinica_id or 0, atendimento.veterinario_id, atendimento.especie or "")
+        for atendimento in atendimentos
+    )
+    if not counts:
+        return
+    params = [dict(zip(KEY, key), total=delta * count) for key, count in counts.items()]
+    db.execute(_upsert_statement(db.get_bind().dialect.name), params)
+
+
+def _filtered(stmt, data_inicio, data_fim, clinica_id=None, veterinario_id=None):
+    table = models.EstatisticaAtendimento.__table__
+    if data_inicio is not None:
+        stmt = stmt.where(table.c.dia >= data_inicio)
+    if data_fim is not None:
+        stmt = stmt.where(table.c.dia < data_fim)
+    if clinica_id is not None:
+        stmt = stmt.where(table.c.clinica_id == clinica_id)
+    if veterinario_id is not None:
+        stmt = stmt.where(table.c.veterinario_id == veterinario_id)
+    return stmt
+
+
+def visitas_por_veterinario(
+    db: Session,
+    periodo: str = "dia",
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+):
+    """Atendimentos por veterinário e dia (ou semana, iniciando na segunda-feira)."""
+    table = models.EstatisticaAtendimento.__table__
+    total = func.sum(table.c.total).label("total")
+    stmt = _filtered(
+        select(table.c.veterinario_id, table.c.dia, total),
+        data_inicio, data_fim, clinica_id, veterinario_id,
+    ).group_by(table.c.veterinario_id, table.c.dia).having(total > 0).order_by(table.c.veterinario_id, table.c.dia)
+    totals = collections.Counter()
+    for row in db.execute(stmt):
+        inicio = row.dia - datetime.timedelta(days=row.dia.weekday()) if periodo == "semana" else row.dia
+        totals[(row.veterinario_id, inicio)] += row.total
+    return [
+        {"veterinario_id": veterinario_id, "periodo": inicio, "total": total}
+        for (veterinario_id, inicio), total in totals.items()
+    ]
+
+
+def visitas_por_clinica(
+    db: Session,
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+):
+    """Atendimentos por clínica no período."""
+    table = models.EstatisticaAtendimento.__table__
+    total = func.sum(table.c.total).label("total")
+    stmt = _filtered(
+        select(table.c.clinica_id, total), data_inicio, data_fim
+    ).group_by(table.c.clinica_id).having(total > 0).order_by(table.c.clinica_id)
+    return [{"clinica_id": row.clinica_id or None, "total": row.total} for row in db.execute(stmt)]
+
+
+def mix_especies(
+    db: Session,
+    data_inicio: Optional[datetime.date] = None,
+    data_fim: Optional[datetime.date] = None,
+    clinica_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+):
+    """Atendimentos por espécie do pet, do mais para o menos frequente."""
+    table = models.EstatisticaAtendimento.__table__
+    total = func.sum(table.c.total).label("total")
+    stmt = _filtered(
+        select(table.c.especie, total), data_inicio, data_fim, clinica_id, veterinario_id
+    ).group_by(table.c.especie).having(total > 0).order_by(total.desc())
+    return [{"especie": row.especie or None, "total": row.total} for row in db.execute(stmt)]
+
+
+def fill_atendimento_keys(db: Session) -> None:
+    """
+    Preenche a espécie e a clínica dos atendimentos gravados antes dessas
+    colunas existirem, com os valores atuais do pet e do veterinário.
+    """
+    atendimentos, pets, veterinarios = (
+        models.Atendimento.__table__, models.Pet.__table__, models.Veterinario.__table__
+    )
+    db.execute(
+        update(atendimentos)
+        .where(atendimentos.c.especie.is_(None), atendimentos.c.clinica_id.is_(None))
+        .values(
+            especie=select(pets.c.especie).where(pets.c.id == atendimentos.c.pet_id).scalar_subquery(),
+            clinica_id=select(veterinarios.c.clinica_id)
+            .where(veterinarios.c.id == atendimentos.c.veterinario_id).scalar_subquery(),
+            # Não é uma alteração do atendimento: mantém a versão (ETag)
+            updated_at=atendimentos.c.updated_at,
+        )
+    )
+
+
+def rebuild(db: Session) -> int:
+    """
+    Recalcula o rollup a partir dos atendimentos da tabela, a partir do dia
+    do mais antigo. Retorna o número de linhas do rollup recalculadas.
+    """
+    atendimentos = models.Atendimento.__table__
+    table = models.EstatisticaAtendimento.__table__
+    oldest = db.scalar(select(func.min(atendimentos.c.data)))
+    if oldest is None:
+        return 0
+    inicio = oldest.date()
+    fill_atendimento_keys(db)
+    # CAST(... AS DATE) no SQLite vira um número: lá a função é date()
+    dia = func.date(atendimentos.c.data) if db.get_bind().dialect.name == "sqlite" else cast(atendimentos.c.data, Date)
+    columns = (
+        dia,
+        func.coalesce(atendimentos.c.clinica_id, 0),
+        atendimentos.c.veterinario_id,
+        func.coalesce(atendimentos.c.especie, ""),
+    )
+    source = (
+        select(*columns, func.count())
+        .where(atendimentos.c.data >= datetime.datetime.combine(inicio, datetime.time()))
+        .group_by(*columns)
+    )
+    db.execute(delete(table).where(table.c.dia >= inicio))
+    rebuilt = db.execute(table.insert().from_select([*KEY, "total"], source)).rowcount
+    db.commit()
+    return rebuilt
@@ -1,3 +1,6 @@
+import datetime
+from typing import List, Optional
+from sqlalchemy import exists, insert, literal, select, update
 from sqlalchemy.orm import Session
 from models import models
 from schemas import pet as pet_schema
@@ -6,27 +9,132 @@ def get_pet(db: Session, pet_id: int):
     """Busca um único pet pelo ID."""
     return db.query(models.Pet).filter(models.Pet.id == pet_id).first()
 
-def get_pets(db: Session, skip: int = 0, limit: int = 100):
-    """Busca todos os pets com paginação."""
-    return db.query(models.Pet).offset(skip).limit(limit).all()
+def get_pets(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    tutor_id: Optional[int] = None,
+    especie: Optional[str] = None,
+):
+    """
+    Busca todos os pets com paginação e filtros opcionais por tutor e espécie.
+    Com ``after_id`` usa paginação por chave (id > after_id) em vez de OFFSET.
+    """
+    query = db.query(models.Pet)
+    if tutor_id is not None:
+        query = query.filter(models.Pet.tutor_id == tutor_id)
+    if especie is not None:
+        query = query.filter(models.Pet.especie == especie)
+    query = query.order_by(models.Pet.id)
+    if after_id is not None:
+        return query.filter(models.Pet.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def export_statement(tutor_id: Optional[int] = None, especie: Optional[str] = None):
+    """Monta o SELECT de colunas usado na exportação em streaming dos pets."""
+    table = models.Pet.__table__
+    stmt = select(*table.c)
+    if tutor_id is not None:
+        stmt = stmt.where(table.c.tutor_id == tutor_id)
+    if especie is not None:
+        stmt = stmt.where(table.c.especie == especie)
+    return stmt.order_by(table.c.id)
+
+def get_pets_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    tutor_id: Optional[int] = None,
+    especie: Optional[str] = None,
+):
+    """
+    Mesma consulta de ``get_pets``, mas com SELECT só de colunas: retorna
+    linhas (Row) em vez de objetos ORM, para a serialização rápida da listagem.
+    """
+    stmt = export_statement(tutor_id=tutor_id, especie=especie)
+    if after_id is not None:
+        stmt = stmt.where(models.Pet.__table__.c.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return db.execute(stmt.limit(limit)).all()
 
 def create_pet(db: Session, pet: pet_schema.PetCreate):
     """Cria um novo pet no banco de dados."""
     db_pet = models.Pet(**pet.model_dump())
     db.add(db_pet)
+    # O id vem do próprio INSERT e, com expire_on_commit=False, dispensa o refresh
     db.commit()
-    db.refresh(db_pet)
     return db_pet
 
-def update_pet(db: Session, pet_id: int, pet: pet_schema.PetUpdate):
-    """Atualiza um pet existente."""
-    db_pet = get_pet(db, pet_id)
-    if db_pet:
-        update_data = pet.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_pet, key, value)
+def create_pet_if_tutor_exists(db: Session, pet: pet_schema.PetCreate):
+    """
+    Cria um pet em um único INSERT ... SELECT ... WHERE EXISTS, que só
+    insere a linha se o tutor existir.
+    Retorna None (sem inserir) se o tutor não existir.
+    """
+    values = pet.model_dump()
+    table = models.Pet.__table__
+    source = select(
+        *[literal(value, type_=table.c[key].type).label(key) for key, value in values.items()]
+    ).where(exists().where(models.Tutor.id == pet.tutor_id))
+    stmt = insert(models.Pet).from_select(list(values), source).returning(models.Pet)
+    db_pet = db.scalars(stmt).one_or_none()
+    if db_pet is not None:
         db.commit()
-        db.refresh(db_pet)
+    return db_pet
+
+def create_pets_bulk(db: Session, pets: List[pet_schema.PetCreate]):
+    """
+    Cria vários pets em uma única transação.
+    Os tutores são validados com uma só consulta IN (...) e as linhas válidas
+    são inseridas com um INSERT multi-linha com RETURNING.
+    Retorna os pets criados e os erros por índice do lote.
+    """
+    tutor_ids = {pet.tutor_id for pet in pets}
+    existing = set(db.scalars(select(models.Tutor.id).where(models.Tutor.id.in_(tutor_ids))))
+
+    rows, errors = [], []
+    for index, pet in enumerate(pets):
+        if pet.tutor_id not in existing:
+            errors.append({"index": index, "detail": f"Tutor com id {pet.tutor_id} não encontrado."})
+        else:
+            rows.append(pet.model_dump())
+
+    created = []
+    if rows:
+        table = models.Pet.__table__
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+        created = db.execute(stmt, rows).all()
+        db.commit()
+    return {"created": created, "errors": errors}
+
+def update_pet(
+    db: Session,
+    pet_id: int,
+    pet: pet_schema.PetUpdate,
+    expected_updated_at: Optional[datetime.datetime] = None,
+):
+    """
+    Atualiza um pet existente com um único UPDATE ... RETURNING.
+    Retorna None se o registro não existir.
+    Com ``expected_updated_at`` (If-Match), só atualiza se a versão ainda
+    for essa; caso contrário também retorna None.
+    """
+    update_data = pet.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_pet(db, pet_id)
+    stmt = update(models.Pet).where(models.Pet.id == pet_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(models.Pet.updated_at == expected_updated_at)
+    stmt = (
+        stmt
+        .values(**update_data)
+        .returning(models.Pet)
+    )
+    db_pet = db.scalars(stmt).one_or_none()
+    db.commit()
     return db_pet
 
 def delete_pet(db: Session, pet_id: int):
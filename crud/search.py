@@ -0,0 +1,214 @@
+"""
+Busca ranqueada por prefixo/aproximação em tutores, pets e veterinários.
+
+Cada entidade tem um "documento" de busca (ex: nome + telefone + telefone só
+com dígitos + email do tutor), indexado conforme o banco:
+
+- PostgreSQL: índices GIN de ``to_tsvector('simple', doc)`` (prefixo por
+  palavra, ``'ana':*``) e de trigramas ``pg_trgm`` (aproximação com
+  ``word_similarity``/``<%``). O score soma ``ts_rank``, a similaridade e um
+  bônus quando o título começa pelo termo buscado.
+- SQLite: tabela FTS5 ``busca_fts`` (unicode61 sem acentos) mantida por
+  triggers, com ranking ``bm25``. O rowid codifica a entidade
+  (``id * 4 + tipo``), então atualizar/remover uma linha não varre o índice.
+  FTS5 não tem busca aproximada: a busca é por prefixo de cada palavra.
+- Outros bancos (ou SQLite sem o índice criado): ``LIKE`` por prefixo.
+
+Os índices e triggers são criados por ``ensure_search_indexes`` (init_db).
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+TIPOS = {"tutor": 1, "pet": 2, "veterinario": 3}
+
+# Por entidade: tabela, título, detalhe e o documento de busca (PostgreSQL / SQLite)
+ENTIDADES = {
+    "tutor": {
+        "tabela": "tutores",
+        "titulo": "nome",
+        "detalhe": "coalesce(telefone, '') || ' ' || coalesce(email, '')",
+        "doc_pg": (
+            "coalesce(nome, '') || ' ' || coalesce(telefone, '') || ' ' || "
+            "regexp_replace(coalesce(telefone, ''), '\\D', '', 'g') || ' ' || coalesce(email, '')"
+        ),
+        "doc_sqlite": (
+            "coalesce({row}.nome, '') || ' ' || coalesce({row}.telefone, '') || ' ' || "
+            "replace(replace(replace(replace(replace(coalesce({row}.telefone, ''), "
+            "'(', ''), ')', ''), '-', ''), ' ', ''), '+', '') || ' ' || coalesce({row}.email, '')"
+        ),
+    },
+    "pet": {
+        "tabela": "pets",
+        "titulo": "nome",
+        "detalhe": "coalesce(especie, '')",
+        "doc_pg": "coalesce(nome, '')",
+        "doc_sqlite": "coalesce({row}.nome, '')",
+    },
+    "veterinario": {
+        "tabela": "veterinarios",
+        "titulo": "nome",
+        "detalhe": "crmv",
+        "doc_pg": "coalesce(nome, '') || ' ' || coalesce(crmv, '')",
+        "doc_sqlite": "coalesce({row}.nome, '') || ' ' || coalesce({row}.crmv, '')",
+    },
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_fts_ready = {}
+
+
+def _tokens(q: str) -> list:
+    return _TOKEN.findall(q.lower())
+
+
+def _like_prefix(q: str) -> str:
+    escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def ensure_search_indexes(conn) -> None:
+    """Cria os índices de busca do banco conectado (idempotente)."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for tipo, entidade in ENTIDADES.items():
+            tabela, doc = entidade["tabela"], entidade["doc_pg"]
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{tabela}_busca_tsv ON {tabela} "
+                f"USING gin (to_tsvector('simple'::regconfig, {doc}))"
+            ))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{tabela}_busca_trgm ON {tabela} "
+                f"USING gin (({doc}) gin_trgm_ops)"
+            ))
+    elif dialect == "sqlite":
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'busca_fts'"
+        )).first()
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS busca_fts "
+            "USING fts5(texto, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        for tipo, entidade in ENTIDADES.items():
+            tabela, code = entidade["tabela"], TIPOS[tipo]
+            doc_new = entidade["doc_sqlite"].format(row="new")
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {tabela}_busca_ai AFTER INSERT ON {tabela} BEGIN "
+                f"INSERT INTO busca_fts(rowid, texto) VALUES (new.id * 4 + {code}, {doc_new}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {tabela}_busca_au AFTER UPDATE ON {tabela} BEGIN "
+                f"DELETE FROM busca_fts WHERE rowid = old.id * 4 + {code}; "
+                f"INSERT INTO busca_fts(rowid, texto) VALUES (new.id * 4 + {code}, {doc_new}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {tabela}_busca_ad AFTER DELETE ON {tabela} BEGIN "
+                f"DELETE FROM busca_fts WHERE rowid = old.id * 4 + {code}; END"
+            ))
+            if not exists:
+                # Índice novo em banco com dados: indexa as linhas existentes
+                doc_row = entidade["doc_sqlite"].format(row=tabela)
+                conn.execute(text(
+                    f"INSERT INTO busca_fts(rowid, texto) SELECT id * 4 + {code}, {doc_row} FROM {tabela}"
+                ))
+
+
+def _search_postgres(db: Session, q: str, tipos: list, limit: int) -> list:
+    tsquery = " & ".join(f"{token}:*" for token in _tokens(q))
+    selects = []
+    for tipo in tipos:
+        entidade = ENTIDADES[tipo]
+        doc, titulo = entidade["doc_pg"], entidade["titulo"]
+        # O WHERE usa as mesmas expressões dos índices GIN (tsvector e trigramas)
+        selects.append(f"""(
+            SELECT '{tipo}' AS tipo, id, {titulo} AS titulo, {entidade['detalhe']} AS detalhe,
+                   ts_rank(to_tsvector('simple'::regconfig, {doc}), to_tsquery('simple'::regconfig, :tsquery))
+                   + word_similarity(:q, {doc})
+                   + CASE WHEN lower({titulo}) LIKE :prefix THEN 1 ELSE 0 END AS score
+            FROM {entidade['tabela']}
+            WHERE to_tsvector('simple'::regconfig, {doc}) @@ to_tsquery('simple'::regconfig, :tsquery)
+               OR :q <% ({doc})
+            ORDER BY score DESC
+            LIMIT :limit
+        )""")
+    stmt = text(" UNION ALL ".join(selects) + " ORDER BY score DESC LIMIT :limit")
+    rows = db.execute(stmt, {"q": q, "tsquery": tsquery, "prefix": _like_prefix(q), "limit": limit})
+    return [dict(row._mapping) for row in rows]
+
+
+def _fts_available(db: Session) -> bool:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if not _fts_ready.get(key):
+        _fts_ready[key] = db.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'busca_fts'"
+        )).first() is not None
+    return _fts_ready[key]
+
+
+def _details(db: Session, tipo: str, ids: list) -> dict:
+    entidade = ENTIDADES[tipo]
+    stmt = text(
+        f"SELECT id, {entidade['titulo']} AS titulo, {entidade['detalhe']} AS detalhe "
+        f"FROM {entidade['tabela']} WHERE id IN ({', '.join(str(int(i)) for i in ids)})"
+    )
+    return {row.id: row for row in db.execute(stmt)}
+
+
+def _search_sqlite_fts(db: Session, q: str, tipos: list, limit: int) -> list:
+    match = " ".join(f'"{token}"*' for token in _tokens(q))
+    codes = ", ".join(str(TIPOS[tipo]) for tipo in tipos)
+    hits = db.execute(
+        text(
+            "SELECT rowid, bm25(busca_fts) AS rank FROM busca_fts "
+            f"WHERE busca_fts MATCH :match AND rowid % 4 IN ({codes}) ORDER BY rank LIMIT :limit"
+        ),
+        {"match": match, "limit": limit},
+    ).all()
+    codigo_tipo = {code: tipo for tipo, code in TIPOS.items()}
+    por_tipo = {}
+    for hit in hits:
+        por_tipo.setdefault(codigo_tipo[hit.rowid % 4], []).append(hit.rowid // 4)
+    detalhes = {tipo: _details(db, tipo, ids) for tipo, ids in por_tipo.items()}
+
+    results = []
+    for hit in hits:
+        tipo, ref_id = codigo_tipo[hit.rowid % 4], hit.rowid // 4
+        row = detalhes[tipo].get(ref_id)
+        if row is not None:
+            # bm25 é negativo (menor = melhor): inverte para "maior = melhor"
+            results.append({"tipo": tipo, "id": ref_id, "titulo": row.titulo, "detalhe": row.detalhe, "score": -hit.rank})
+    return results
+
+
+def _search_like(db: Session, q: str, tipos: list, limit: int) -> list:
+    results = []
+    for tipo in tipos:
+        entidade = ENTIDADES[tipo]
+        stmt = text(
+            f"SELECT id, {entidade['titulo']} AS titulo, {entidade['detalhe']} AS detalhe "
+            f"FROM {entidade['tabela']} WHERE lower({entidade['titulo']}) LIKE :prefix ESCAPE '\\' "
+            f"ORDER BY {entidade['titulo']} LIMIT :limit"
+        )
+        for row in db.execute(stmt, {"prefix": _like_prefix(q), "limit": limit}):
+            results.append({"tipo": tipo, "id": row.id, "titulo": row.titulo, "detalhe": row.detalhe, "score": 1.0})
+    return results[:limit]
+
+
+def search(db: Session, q: str, limit: int = 10, tipo: Optional[str] = None) -> list:
+    """
+    Busca ``q`` nas entidades (ou só em ``tipo``) e retorna os ``limit``
+    resultados mais relevantes, do maior para o menor score.
+    """
+    if not _tokens(q):
+        return []
+    tipos = [tipo] if tipo else list(ENTIDADES)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _search_postgres(db, q, tipos, limit)
+    if dialect == "sqlite" and _fts_available(db):
+        return _search_sqlite_fts(db, q, tipos, limit)
+    return _search_like(db, q, tipos, limit)
@@ -1,4 +1,7 @@
-from sqlalchemy.orm import Session
+import datetime
+from typing import List, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, selectinload
 from models import models
 from schemas import tutor as tutor_schema
 
@@ -6,27 +9,107 @@ def get_tutor(db: Session, tutor_id: int):
     """Busca um único tutor pelo ID."""
     return db.query(models.Tutor).filter(models.Tutor.id == tutor_id).first()
 
-def get_tutores(db: Session, skip: int = 0, limit: int = 100):
-    """Busca todos os tutores com paginação."""
-    return db.query(models.Tutor).offset(skip).limit(limit).all()
+def get_tutor_full(db: Session, tutor_id: int):
+    """
+    Busca um tutor com seus pets e os atendimentos de cada pet.
+    O selectinload carrega cada nível com uma consulta IN (...), então são
+    sempre 3 queries, independentemente de quantos pets/atendimentos existam.
+    """
+    return (
+        db.query(models.Tutor)
+        .options(selectinload(models.Tutor.pets).selectinload(models.Pet.atendimentos))
+        .filter(models.Tutor.id == tutor_id)
+        .first()
+    )
+
+def get_tutores(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Busca todos os tutores com paginação.
+    Com ``after_id`` usa paginação por chave (id > after_id) em vez de OFFSET.
+    """
+    query = db.query(models.Tutor).order_by(models.Tutor.id)
+    if after_id is not None:
+        return query.filter(models.Tutor.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def export_statement():
+    """Monta o SELECT de colunas usado na exportação em streaming dos tutores."""
+    table = models.Tutor.__table__
+    return select(*table.c).order_by(table.c.id)
+
+def get_tutores_rows(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Mesma consulta de ``get_tutores`` com SELECT só de colunas (linhas em vez
+    de objetos ORM), para a serialização rápida da listagem.
+    """
+    stmt = export_statement()
+    if after_id is not None:
+        stmt = stmt.where(models.Tutor.__table__.c.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return db.execute(stmt.limit(limit)).all()
 
 def create_tutor(db: Session, tutor: tutor_schema.TutorCreate):
     """Cria um novo tutor no banco de dados."""
     db_tutor = models.Tutor(**tutor.model_dump())
     db.add(db_tutor)
+    # O id vem do próprio INSERT e, com expire_on_commit=False, dispensa o refresh
     db.commit()
-    db.refresh(db_tutor)
     return db_tutor
 
-def update_tutor(db: Session, tutor_id: int, tutor: tutor_schema.TutorUpdate):
-    """Atualiza um tutor existente."""
-    db_tutor = get_tutor(db, tutor_id)
-    if db_tutor:
-        update_data = tutor.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_tutor, key, value)
+def create_tutores_bulk(db: Session, tutores: List[tutor_schema.TutorCreate]):
+    """
+    Cria vários tutores em uma única transação.
+    Emails já cadastrados (uma só consulta IN (...)) ou repetidos no lote são
+    reportados por item; as linhas válidas são inseridas com um INSERT
+    multi-linha com RETURNING.
+    Retorna os tutores criados e os erros por índice do lote.
+    """
+    emails = {tutor.email for tutor in tutores if tutor.email}
+    taken = set(db.scalars(select(models.Tutor.email).where(models.Tutor.email.in_(emails))))
+
+    rows, errors = [], []
+    for index, tutor in enumerate(tutores):
+        if tutor.email and tutor.email in taken:
+            errors.append({"index": index, "detail": f"O email {tutor.email} já está cadastrado."})
+            continue
+        if tutor.email:
+            taken.add(tutor.email)
+        rows.append(tutor.model_dump())
+
+    created = []
+    if rows:
+        table = models.Tutor.__table__
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+        created = db.execute(stmt, rows).all()
         db.commit()
-        db.refresh(db_tutor)
+    return {"created": created, "errors": errors}
+
+def update_tutor(
+    db: Session,
+    tutor_id: int,
+    tutor: tutor_schema.TutorUpdate,
+    expected_updated_at: Optional[datetime.datetime] = None,
+):
+    """
+    Atualiza um tutor existente com um único UPDATE ... RETURNING.
+    Retorna None se o registro não existir.
+    Com ``expected_updated_at`` (If-Match), só atualiza se a versão ainda
+    for essa; caso contrário também retorna None.
+    """
+    update_data = tutor.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_tutor(db, tutor_id)
+    stmt = update(models.Tutor).where(models.Tutor.id == tutor_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(models.Tutor.updated_at == expected_updated_at)
+    stmt = (
+        stmt
+        .values(**update_data)
+        .returning(models.Tutor)
+    )
+    db_tutor = db.scalars(stmt).one_or_none()
+    db.commit()
     return db_tutor
 
 def delete_tutor(db: Session, tutor_id: int):
@@ -1,6 +1,9 @@
+from typing import Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from models import models
 from schemas import usuario as usuario_schema
+from services.principal_cache import principal_cache
 
 
 def get_user_by_username(db: Session, username: str):
@@ -13,18 +16,22 @@ def get_user_by_email(db: Session, email: str):
     return db.query(models.Usuario).filter(models.Usuario.email == email).first()
 
 
-def create_user(db: Session, user: usuario_schema.UsuarioCreate):
-    """Cria um novo usuário com senha hasheada."""
-    from services.auth import get_password_hash
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: usuario_schema.UsuarioCreate, hashed_password: Optional[str] = None):
+    """
+    Cria um novo usuário com senha hasheada.
+    Se o hash não for informado, é calculado aqui (bloqueando a thread atual).
+    """
+    if hashed_password is None:
+        from services.auth import get_password_hash
+        hashed_password = get_password_hash(user.password)
     db_user = models.Usuario(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password
     )
     db.add(db_user)
+    # O id vem do próprio INSERT e, com expire_on_commit=False, dispensa o refresh
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
@@ -39,9 +46,15 @@ def authenticate_user(db: Session, username: str, password: str):
     return user
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    """Busca todos os usuários com paginação."""
-    return db.query(models.Usuario).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Busca todos os usuários com paginação.
+    Com ``after_id`` usa paginação por chave (id > after_id) em vez de OFFSET.
+    """
+    query = db.query(models.Usuario).order_by(models.Usuario.id)
+    if after_id is not None:
+        return query.filter(models.Usuario.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 
 def get_user(db: Session, user_id: int):
@@ -49,18 +62,29 @@ def get_user(db: Session, user_id: int):
     return db.query(models.Usuario).filter(models.Usuario.id == user_id).first()
 
 
-def update_user(db: Session, user_id: int, user: usuario_schema.UsuarioUpdate):
-    """Atualiza um usuário existente."""
-    from services.auth import get_password_hash
-    db_user = get_user(db, user_id)
-    if db_user:
-        for key, value in user.dict(exclude_unset=True).items():
-            if key == "password":
-                setattr(db_user, "hashed_password", get_password_hash(value))
-            else:
-                setattr(db_user, key, value)
-        db.commit()
-        db.refresh(db_user)
+def update_user(db: Session, user_id: int, user: usuario_schema.UsuarioUpdate, hashed_password: Optional[str] = None):
+    """
+    Atualiza um usuário existente com um único UPDATE ... RETURNING.
+    Se a senha for alterada sem o hash informado, ele é calculado aqui.
+    Retorna None se o usuário não existir.
+    """
+    update_data = user.model_dump(exclude_unset=True)
+    if "password" in update_data:
+        from services.auth import get_password_hash
+        password = update_data.pop("password")
+        update_data["hashed_password"] = hashed_password or get_password_hash(password)
+    if not update_data:
+        return get_user(db, user_id)
+    stmt = (
+        update(models.Usuario)
+        .where(models.Usuario.id == user_id)
+        .values(**update_data)
+        .returning(models.Usuario)
+    )
+    db_user = db.scalars(stmt).one_or_none()
+    db.commit()
+    # Username ou is_active podem ter mudado: o principal em cache deixa de valer
+    principal_cache.invalidate_user(user_id)
     return db_user
 
 
@@ -70,4 +94,5 @@ def delete_user(db: Session, user_id: int):
     if db_user:
         db.delete(db_user)
         db.commit()
+        principal_cache.invalidate(db_user.username)
     return db_user
\ No newline at end of file
@@ -1,6 +1,9 @@
 """
 CRUD operations for Veterinario model.
 """
+import datetime
+from typing import Optional
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from models import models
 from services import schemas
@@ -11,9 +14,54 @@ def get_veterinario(db: Session, veterinario_id: int):
     return db.query(models.Veterinario).filter(models.Veterinario.id == veterinario_id).first()
 
 
-def get_veterinarios(db: Session, skip: int = 0, limit: int = 100):
-    """Busca todos os veterinários com paginação."""
-    return db.query(models.Veterinario).offset(skip).limit(limit).all()
+def get_veterinarios(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    clinica_id: Optional[int] = None,
+    especialidade: Optional[str] = None,
+):
+    """
+    Busca todos os veterinários com paginação e filtros opcionais por
+    clínica e especialidade.
+    Com ``after_id`` usa paginação por chave (id > after_id) em vez de OFFSET.
+    """
+    query = db.query(models.Veterinario)
+    if clinica_id is not None:
+        query = query.filter(models.Veterinario.clinica_id == clinica_id)
+    if especialidade is not None:
+        query = query.filter(models.Veterinario.especialidade == especialidade)
+    query = query.order_by(models.Veterinario.id)
+    if after_id is not None:
+        return query.filter(models.Veterinario.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+
+def get_veterinarios_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    clinica_id: Optional[int] = None,
+    especialidade: Optional[str] = None,
+):
+    """
+    Mesma consulta de ``get_veterinarios`` com SELECT só de colunas (linhas em
+    vez de objetos ORM), para a serialização rápida da listagem.
+    """
+    table = models.Veterinario.__table__
+    stmt = select(*table.c)
+    if clinica_id is not None:
+        stmt = stmt.where(table.c.clinica_id == clinica_id)
+    if especialidade is not None:
+        stmt = stmt.where(table.c.especialidade == especialidade)
+    stmt = stmt.order_by(table.c.id)
+    if after_id is not None:
+        stmt = stmt.where(table.c.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return db.execute(stmt.limit(limit)).all()
 
 
 def get_veterinarios_by_clinica(db: Session, clinica_id: int):
@@ -23,21 +71,35 @@ def get_veterinarios_by_clinica(db: Session, clinica_id: int):
 
 def create_veterinario(db: Session, veterinario: schemas.VeterinarioCreate):
     """Cria um novo veterinário."""
-    db_veterinario = models.Veterinario(**veterinario.dict())
+    db_veterinario = models.Veterinario(**veterinario.model_dump())
     db.add(db_veterinario)
+    # O id vem do próprio INSERT e, com expire_on_commit=False, dispensa o refresh
     db.commit()
-    db.refresh(db_veterinario)
     return db_veterinario
 
 
-def update_veterinario(db: Session, veterinario_id: int, veterinario: schemas.VeterinarioCreate):
-    """Atualiza um veterinário existente."""
-    db_veterinario = get_veterinario(db, veterinario_id)
-    if db_veterinario:
-        for key, value in veterinario.dict().items():
-            setattr(db_veterinario, key, value)
-        db.commit()
-        db.refresh(db_veterinario)
+def update_veterinario(
+    db: Session,
+    veterinario_id: int,
+    veterinario: schemas.VeterinarioCreate,
+    expected_updated_at: Optional[datetime.datetime] = None,
+):
+    """
+    Atualiza um veterinário existente com um único UPDATE ... RETURNING.
+    Retorna None se o veterinário não existir.
+    Com ``expected_updated_at`` (If-Match), só atualiza se a versão ainda
+    for essa; caso contrário também retorna None.
+    """
+    stmt = update(models.Veterinario).where(models.Veterinario.id == veterinario_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(models.Veterinario.updated_at == expected_updated_at)
+    stmt = (
+        stmt
+        .values(**veterinario.model_dump(exclude_unset=True))
+        .returning(models.Veterinario)
+    )
+    db_veterinario = db.scalars(stmt).one_or_none()
+    db.commit()
     return db_veterinario
 
 
@@ -1,34 +1,295 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from config import settings
+import itertools
+import time
+from typing import Optional
+from sqlalchemy import create_engine, event, exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from config import settings, to_async_url
+from services import metrics, query_inspector, replica_routing
+
+
+class _CheckoutTimingMixin:
+    """
+    Mede o tempo de espera (ou de conexão) no checkout de um pool com fila.
+    Os acumulados alimentam ``pool_status()`` (health) e, com métricas
+    habilitadas, o histograma ``db_pool_checkout_wait_seconds``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.checkouts += 1
+            self.checkout_wait_total += elapsed
+            self.checkout_wait_max = max(self.checkout_wait_max, elapsed)
+            if settings.metrics_enabled:
+                metrics.observe_pool_wait(elapsed)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def uses_queue_pool(url: str) -> bool:
+    """SQLite em memória usa pools próprios (sem fila); os demais usam QueuePool."""
+    parsed = make_url(url)
+    return not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"))
+
+
+def _mark_checkin(dbapi_connection, connection_record):
+    connection_record.info["last_checkin"] = time.monotonic()
+
+
+def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+    """
+    Pre-ping "idle": só testa conexões que ficaram paradas no pool por mais de
+    ``pool_pre_ping_idle_seconds``, poupando o round trip nas conexões quentes.
+    Uma falha invalida a conexão e o pool tenta outra (DisconnectionError).
+    """
+    last_checkin = connection_record.info.get("last_checkin")
+    if last_checkin is None or time.monotonic() - last_checkin < settings.pool_pre_ping_idle_seconds:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception as exc:
+        raise sa_exc.DisconnectionError() from exc
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def pool_kwargs(url: str, poolclass) -> dict:
+    """Parâmetros de pool vindos de ``config.Settings`` para ``create_engine``."""
+    kwargs = {"pool_pre_ping": settings.pool_pre_ping == "always"}
+    if uses_queue_pool(url):
+        kwargs.update({
+            "poolclass": poolclass,
+            "pool_size": settings.pool_size,
+            "max_overflow": settings.max_overflow,
+            "pool_timeout": settings.pool_timeout,
+            "pool_use_lifo": settings.pool_use_lifo,
+        })
+    return kwargs
+
+
+def configure_pool_events(sync_engine) -> None:
+    """Registra os eventos de pool da estratégia de pre-ping "idle"."""
+    if settings.pool_pre_ping == "idle":
+        event.listen(sync_engine, "checkin", _mark_checkin)
+        event.listen(sync_engine, "checkout", _ping_if_idle)
+
+
+def instrument_engine(sync_engine) -> None:
+    """Eventos de pool, métricas e detector de queries de uma engine."""
+    configure_pool_events(sync_engine)
+    if settings.metrics_enabled:
+        metrics.instrument_engine(sync_engine)
+    if settings.query_inspection_enabled:
+        query_inspector.instrument_engine(sync_engine)
+
+
+def _replica_engine_kwargs(url: str, poolclass) -> dict:
+    kwargs = {"echo": False, **pool_kwargs(url, poolclass)}
+    if url.startswith("postgresql"):
+        kwargs["pool_recycle"] = settings.pool_recycle
+    return kwargs
+
+
+def _pool_stats(pool) -> dict:
+    stats = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    if isinstance(pool, _CheckoutTimingMixin):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "checkout_timeouts": pool.checkout_timeouts,
+            "wait_avg_ms": round(pool.checkout_wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "wait_max_ms": round(pool.checkout_wait_max * 1000, 3),
+        })
+    return stats
+
+
+def pool_status() -> dict:
+    """Estado dos pools de conexão (exposto em /api/health)."""
+    status = {"pre_ping": settings.pool_pre_ping, "sync": _pool_stats(engine.pool)}
+    if async_engine is not None:
+        status["async"] = _pool_stats(async_engine.sync_engine.pool)
+    if replica_engines:
+        status["replicas"] = [
+            _pool_stats(getattr(replica, "sync_engine", replica).pool) for replica in replica_engines
+        ]
+    return status
+
 
 # Usar a URL de banco de dados das configurações
 DATABASE_URL = settings.effective_database_url
 
 # Criar engine com configurações específicas para PostgreSQL/SQLite
 engine_kwargs = {
-    "pool_pre_ping": True,  # Verifica conexões antes de usar
     "echo": False,          # Desabilitar log SQL temporariamente
+    **pool_kwargs(DATABASE_URL, TimedQueuePool),
 }
 
 # Configurações específicas para PostgreSQL
 if DATABASE_URL.startswith("postgresql"):
     engine_kwargs.update({
-        "pool_recycle": 300,    # Recicla conexões a cada 5 minutos
+        "pool_recycle": settings.pool_recycle,    # Recicla conexões antigas (padrão: 5 minutos)
         "connect_args": {
             "client_encoding": "utf8"  # Forçar encoding UTF-8
         }
     })
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
+instrument_engine(engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: após o commit os objetos continuam carregados, então
+# o CRUD devolve o resultado do INSERT/UPDATE ... RETURNING sem um SELECT extra
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
-# Função para obter uma sessão do banco de dados
-def get_db():
+# Engine assíncrona (opcional, habilitada por settings.async_database)
+# O driver (asyncpg/aiosqlite) só é importado quando a stack assíncrona está ativa.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.async_database:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine_kwargs = {"echo": False, **pool_kwargs(DATABASE_URL, TimedAsyncQueuePool)}
+    if DATABASE_URL.startswith("postgresql"):
+        async_engine_kwargs["pool_recycle"] = settings.pool_recycle
+
+    async_engine = create_async_engine(settings.async_database_url, **async_engine_kwargs)
+    instrument_engine(async_engine.sync_engine)
+    # expire_on_commit=False: os objetos retornados continuam legíveis fora do greenlet
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Réplicas de leitura (opcionais): uma engine por URL, usadas em round-robin
+# pelos handlers de leitura (get_read_db) e pelas exportações
+replica_engines = []
+ReplicaSessionLocals = []
+
+for replica_url in settings.read_replica_url_list:
+    if settings.async_database:
+        replica_engine = create_async_engine(
+            to_async_url(replica_url), **_replica_engine_kwargs(replica_url, TimedAsyncQueuePool)
+        )
+        instrument_engine(replica_engine.sync_engine)
+        factory = async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+    else:
+        replica_engine = create_engine(replica_url, **_replica_engine_kwargs(replica_url, TimedQueuePool))
+        instrument_engine(replica_engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine)
+    replica_engines.append(replica_engine)
+    ReplicaSessionLocals.append(factory)
+
+# itertools.cycle é seguro entre threads no CPython (next() é atômico)
+_replica_cycle = itertools.cycle(ReplicaSessionLocals) if ReplicaSessionLocals else None
+
+
+def _all_engines() -> list:
+    engines = [engine, *replica_engines]
+    if async_engine is not None:
+        engines.append(async_engine)
+    return engines
+
+
+def reset_engines_after_fork() -> None:
+    """
+    Abandona, sem fechar, as conexões herdadas do processo pai (worker do
+    gunicorn criado por fork com ``preload_app``): o socket é compartilhado e
+    fechá-lo derrubaria a conexão do pai. O worker abre conexões novas.
+    """
+    for target in _all_engines():
+        getattr(target, "sync_engine", target).dispose(close=False)
+
+
+async def dispose_engines() -> None:
+    """Fecha as conexões de todas as engines (shutdown da aplicação)."""
+    for target in _all_engines():
+        if hasattr(target, "sync_engine"):
+            await target.dispose()
+        else:
+            target.dispose()
+
+
+def read_session_factory(authorization: Optional[str] = None):
+    """
+    Fábrica de sessões para leituras: a próxima réplica do round-robin, ou o
+    primário se não houver réplicas ou se o token escreveu recentemente.
+    """
+    if _replica_cycle is None or replica_routing.recent_writers.wrote_recently(authorization):
+        return AsyncSessionLocal if settings.async_database else SessionLocal
+    return next(_replica_cycle)
+
+# Função para obter uma sessão síncrona do banco de dados
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Função para obter uma sessão assíncrona do banco de dados
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependência usada pelos roteadores, escolhida pela configuração
+get_db = get_async_db if settings.async_database else get_sync_db
+
+# Sessão de leitura (réplica, se configurada) para os handlers read_*
+def get_sync_read_db(request: Request):
+    db = read_session_factory(request.headers.get("authorization"))()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    async with read_session_factory(request.headers.get("authorization"))() as db:
+        yield db
+
+get_read_db = get_async_read_db if settings.async_database else get_sync_read_db
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    Executa uma função de CRUD (que recebe a sessão como primeiro argumento)
+    sem bloquear o event loop.
+
+    Com AsyncSession a função roda via ``run_sync``: o I/O é aguardado pelo
+    driver assíncrono e nenhuma thread fica presa. Com Session síncrona a
+    função roda no threadpool do Starlette, como nos endpoints ``def``.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
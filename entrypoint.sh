@@ -10,10 +10,23 @@ while ! pg_isready -h db -p 5432 -q -U "$POSTGRES_USER"; do
 done
 echo "✅ PostgreSQL started successfully."
 
+# O modo vem de Settings.environment (ENVIRONMENT ou .env)
+APP_ENVIRONMENT=$(python -c "from config import settings; print(settings.environment)")
+
+if [ "$APP_ENVIRONMENT" = "production" ]; then
+  # Schema e índices uma única vez, antes de subir os workers (sem dados de exemplo)
+  echo "🔨 Creating database schema..."
+  python init_db.py
+
+  # gunicorn com workers uvicorn (ver gunicorn.conf.py); exec para receber o SIGTERM
+  echo "🚀 Starting FastAPI server (production)..."
+  exec gunicorn main:app -c gunicorn.conf.py
+fi
+
 # Executa o script para criar e popular o banco de dados
 echo "🌱 Initializing and populating the database..."
 python populate_db.py
 
 # Inicia o servidor da aplicação FastAPI
 echo "🚀 Starting FastAPI server..."
-uvicorn main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload
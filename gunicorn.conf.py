@@ -0,0 +1,78 @@
+"""
+Configuração do gunicorn para produção (ENVIRONMENT=production).
+
+    gunicorn main:app -c gunicorn.conf.py
+
+- Workers uvicorn (uvloop + httptools), sem reload, em número definido por
+  ``WEB_CONCURRENCY`` (0 = um por CPU).
+- ``preload_app``: a aplicação é importada uma vez no processo mestre e os
+  workers são criados por fork. As conexões que o mestre abriu ao importar
+  (pools do SQLAlchemy) são descartadas em ``post_fork`` sem fechá-las, e cada
+  worker abre as suas.
+- Schema/índices NÃO são criados aqui: o entrypoint roda ``init_db.py`` uma
+  vez antes de subir o servidor.
+- Métricas Prometheus em modo multiprocesso: cada worker grava num diretório
+  compartilhado e ``/metrics`` agrega todos; o diretório é limpo ao subir e
+  os arquivos de workers encerrados são marcados em ``child_exit``.
+- Shutdown gracioso: SIGTERM dá ``GRACEFUL_TIMEOUT_SECONDS`` para os workers
+  terminarem as requisições em andamento e rodarem os eventos de shutdown.
+"""
+import multiprocessing
+import os
+import shutil
+
+from config import settings
+
+bind = settings.server_bind
+workers = settings.web_concurrency or multiprocessing.cpu_count()
+worker_class = "server_worker.ProductionUvicornWorker"
+preload_app = True
+reload = False
+timeout = settings.worker_timeout_seconds
+graceful_timeout = settings.graceful_timeout_seconds
+keepalive = 5
+max_requests = settings.worker_max_requests
+# Evita que todos os workers reciclem ao mesmo tempo
+max_requests_jitter = settings.worker_max_requests // 10
+accesslog = "-"
+errorlog = "-"
+
+# O prometheus_client decide o modo multiprocesso no import, que acontece no
+# preload da aplicação: a variável precisa estar definida antes disso
+if settings.metrics_enabled:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.prometheus_multiproc_dir
+    shutil.rmtree(settings.prometheus_multiproc_dir, ignore_errors=True)
+    os.makedirs(settings.prometheus_multiproc_dir, exist_ok=True)
+
+
+def on_starting(server):
+    server.log.info(f"🚀 {settings.app_name} v{settings.app_version}: {workers} workers em {bind}")
+    if workers > 1 and settings.response_cache_backend == "memory":
+        server.log.warning(
+            "⚠️  RESPONSE_CACHE_BACKEND=memory com vários workers: cada worker tem seu "
+            "cache e as invalidações não se propagam (use redis)"
+        )
+    if workers > 1 and settings.read_replica_url_list and settings.read_your_writes_seconds > 0:
+        server.log.warning(
+            "⚠️  Read-your-writes é controlado por worker: uma leitura logo após a "
+            "escrita pode cair em outro worker e ir para a réplica"
+        )
+    if workers > 1 and not settings.effective_database_url.startswith("postgresql"):
+        server.log.warning(
+            "⚠️  Agenda sem PostgreSQL com vários workers: a checagem de conflito de "
+            "horários usa um índice por worker e dois workers podem aceitar "
+            "agendamentos sobrepostos (use PostgreSQL ou WEB_CONCURRENCY=1)"
+        )
+
+
+def post_fork(server, worker):
+    import database
+
+    database.reset_engines_after_fork()
+
+
+def child_exit(server, worker):
+    if settings.metrics_enabled:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
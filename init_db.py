@@ -5,9 +5,83 @@ Cria todas as tabelas necessárias baseadas nos modelos SQLAlchemy.
 Funciona com SQLite (desenvolvimento) e PostgreSQL (produção).
 """
 
+import sys
+
+from sqlalchemy import DateTime, func, inspect, text
+
 from database import engine, Base, DATABASE_URL
 from models.models import Usuario, Clinica, Veterinario, Tutor, Pet, Atendimento
 from config import settings
+from crud import agendamento, estatisticas, search
+import manage_partitions
+
+def create_tables():
+    """
+    Cria as tabelas que não existem. Com ATENDIMENTOS_PARTITIONING no
+    PostgreSQL, ``atendimentos`` é criada particionada por mês.
+    """
+    with engine.begin() as conn:
+        if not manage_partitions.enabled(conn):
+            Base.metadata.create_all(bind=conn)
+            return
+        tables = [table for table in Base.metadata.sorted_tables if table.name != manage_partitions.TABLE]
+        Base.metadata.create_all(bind=conn, tables=tables)
+        manage_partitions.setup(conn)
+
+def create_missing_indexes():
+    """Cria os índices declarados nos modelos que ainda não existem no banco."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def create_missing_columns():
+    """
+    Adiciona às tabelas já existentes as colunas novas dos modelos
+    (ex: ``updated_at``). Colunas de data são preenchidas com o horário atual.
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    print(f"⚠️  Coluna {table.name}.{column.name} é NOT NULL: crie-a manualmente")
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                ))
+                if isinstance(column.type, DateTime):
+                    conn.execute(table.update().values({column.name: func.current_timestamp()}))
+
+def fill_atendimento_keys():
+    """
+    Preenche a espécie e a clínica dos atendimentos gravados antes dessas
+    colunas (chave das estatísticas e do analytics).
+    """
+    with engine.begin() as conn:
+        estatisticas.fill_atendimento_keys(conn)
+
+def create_search_indexes():
+    """
+    Cria os índices da busca (/api/search): tsvector e trigramas no
+    PostgreSQL, tabela FTS5 com triggers no SQLite.
+    """
+    with engine.begin() as conn:
+        search.ensure_search_indexes(conn)
+
+def create_agenda_constraints():
+    """
+    Cria a exclusion constraint GiST que impede agendamentos sobrepostos de
+    um mesmo veterinário (somente PostgreSQL; no SQLite a checagem é em memória).
+    """
+    with engine.begin() as conn:
+        agendamento.ensure_agenda_constraints(conn)
 
 def init_database():
     """Inicializa o banco de dados criando todas as tabelas."""
@@ -17,7 +91,13 @@ def init_database():
     
     try:
         print("\n🔨 Criando tabelas...")
-        Base.metadata.create_all(bind=engine)
+        create_tables()
+        # create_all ignora tabelas já existentes: garante as colunas e índices novos nelas
+        create_missing_columns()
+        fill_atendimento_keys()
+        create_missing_indexes()
+        create_search_indexes()
+        create_agenda_constraints()
         
         print("✅ Tabelas criadas com sucesso!")
         print("📋 Tabelas criadas:")
@@ -27,6 +107,7 @@ def init_database():
         print("   - tutores (Tutores)")
         print("   - pets (Pets)")
         print("   - atendimentos (Atendimentos)")
+        print("   - agendamentos (Agenda dos veterinários)")
         
         # Verificar se as tabelas foram criadas
         from sqlalchemy import inspect
@@ -55,4 +136,5 @@ def init_database():
         return False
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    # Código de saída diferente de zero interrompe o entrypoint (set -e)
+    sys.exit(0 if init_database() else 1)
\ No newline at end of file
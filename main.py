@@ -1,12 +1,14 @@
 # veterinaria/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import IntegrityError
 
 from api import routes
 from config import settings
-from api import exception_handlers
+import database
+from api import exception_handlers, fast_json
+from services import metrics, password_hashing, query_inspector, replica_routing
 import logging
 
 # Configurar logging
@@ -21,7 +23,9 @@ app = FastAPI(
     # Configura a documentação para usar o prefixo /api
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"  # Removido o prefixo /api para evitar conflitos
+    openapi_url="/openapi.json",  # Removido o prefixo /api para evitar conflitos
+    # ORJSONResponse quando o orjson está instalado (ver api/fast_json.py)
+    default_response_class=fast_json.DefaultResponse,
 )
 
 # Middleware de logging (opcional para debugging)
@@ -33,10 +37,32 @@ if settings.debug:
         logger.info(f"📤 Status: {response.status_code}")
         return response
 
+# Métricas Prometheus: middleware ASGI puro, barato o bastante para produção
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    def read_metrics():
+        """Exposição das métricas no formato Prometheus."""
+        body, content_type = metrics.render_latest()
+        return Response(content=body, media_type=content_type)
+
+# Detector de N+1/queries lentas (opt-in): loga suspeitas e aplica o orçamento de queries
+if settings.query_inspection_enabled:
+    app.add_middleware(query_inspector.QueryInspectorMiddleware)
+
+# Read-your-writes: quem acabou de escrever lê do primário, não da réplica
+if settings.read_replica_url_list and settings.read_your_writes_seconds > 0:
+    app.add_middleware(replica_routing.ReadYourWritesMiddleware)
+
 # Adiciona os handlers de exceção customizados
 app.add_exception_handler(RequestValidationError, exception_handlers.validation_exception_handler)
 app.add_exception_handler(IntegrityError, exception_handlers.integrity_error_handler)
 
+# Encerra o pool de hashing de senhas e as conexões do banco junto com a aplicação
+app.add_event_handler("shutdown", password_hashing.shutdown_pool)
+app.add_event_handler("shutdown", database.dispose_engines)
+
 # Inclui o roteador da API com o prefixo /api
 app.include_router(routes.router, prefix="/api")
 
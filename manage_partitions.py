@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Particionamento mensal da tabela ``atendimentos`` (somente PostgreSQL).
+
+Com ``ATENDIMENTOS_PARTITIONING=true`` a tabela é criada como
+``PARTITION BY RANGE (data)``, com uma partição por mês
+(``atendimentos_pAAAA_MM``) e uma partição ``atendimentos_default`` para
+datas fora dos meses criados. A chave primária passa a ser ``(id, data)``
+(exigência do PostgreSQL); ``id`` continua único, vindo da mesma sequência.
+
+Consultas com filtro em ``data`` (``data >= :inicio AND data < :fim``)
+visitam só as partições do período. Buscas por ``id`` consultam o índice
+de id de cada partição: desanexar meses antigos mantém esse custo baixo.
+
+Uso:
+    python manage_partitions.py setup               # cria a tabela (se não existir) e os meses à frente
+    python manage_partitions.py ensure [--months-ahead 3]
+    python manage_partitions.py convert             # converte uma tabela comum já existente
+    python manage_partitions.py list
+    python manage_partitions.py detach --before 2024-01 [--drop]
+
+``setup``/``ensure`` devem rodar periodicamente (ex: cron mensal) para que
+os próximos meses já existam antes de receberem atendimentos. ``detach``
+remove da tabela os meses anteriores a ``--before``: a partição vira a tabela
+avulsa ``arquivo_atendimentos_pAAAA_MM`` (ou é apagada com ``--drop``).
+"""
+import argparse
+import datetime
+import re
+import sys
+
+from sqlalchemy import text
+
+from config import settings
+from database import engine
+from models import models
+
+TABLE = "atendimentos"
+DEFAULT_PARTITION = f"{TABLE}_default"
+ARCHIVE_PREFIX = "arquivo_"
+_PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: datetime.date) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(value: datetime.date, months: int) -> datetime.date:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str):
+    """Mês de uma partição pelo nome (None para a default e nomes desconhecidos)."""
+    match = _PARTITION_NAME.match(name)
+    return datetime.date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def enabled(conn) -> bool:
+    return settings.atendimentos_partitioning and conn.dialect.name == "postgresql"
+
+
+def table_exists(conn) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": TABLE}).scalar()
+
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"
+    ), {"name": TABLE}).scalar()
+
+
+def partitioned_table_ddl(dialect) -> str:
+    """
+    CREATE TABLE particionado gerado a partir do modelo ``Atendimento``
+    (colunas novas do modelo entram automaticamente).
+    """
+    quote = dialect.identifier_preparer.quote
+    lines = []
+    for column in models.Atendimento.__table__.columns:
+        definition = f"{quote(column.name)} {column.type.compile(dialect=dialect)}"
+        if column.name == "id":
+            definition += f" NOT NULL DEFAULT nextval('{TABLE}_id_seq')"
+        elif column.name == "data":
+            # Chave de partição: não pode ser nula (iria para a default)
+            definition += " NOT NULL DEFAULT (now() AT TIME ZONE 'utc')"
+        elif not column.nullable:
+            definition += " NOT NULL"
+        for foreign_key in column.foreign_keys:
+            target_table, target_column = foreign_key.target_fullname.split(".")
+            definition += f" REFERENCES {quote(target_table)} ({quote(target_column)})"
+        lines.append(definition)
+    lines.append("PRIMARY KEY (id, data)")
+    columns = ",\n    ".join(lines)
+    return f"CREATE TABLE {TABLE} (\n    {columns}\n) PARTITION BY RANGE (data)"
+
+
+def create_partitioned_table(conn) -> None:
+    """Cria a tabela particionada, seus índices e a partição default."""
+    conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {TABLE}_id_seq"))
+    conn.execute(text(partitioned_table_ddl(conn.dialect)))
+    conn.execute(text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+    # Índices no pai são criados em cada partição (atuais e futuras)
+    for index in models.Atendimento.__table__.indexes:
+        index.create(bind=conn)
+    conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+
+
+def list_partitions(conn) -> list:
+    return list(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+    ), {"name": TABLE}).scalars())
+
+
+def create_month(conn, month: datetime.date) -> bool:
+    """
+    Cria a partição do mês, se ainda não existir. Linhas desse mês que já
+    estejam na partição default são movidas para ela.
+    """
+    name = partition_name(month)
+    if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar():
+        return False
+    bounds = {"inicio": month, "fim": add_months(month, 1)}
+    values = f"FOR VALUES FROM ('{bounds['inicio']}') TO ('{bounds['fim']}')"
+    in_default = conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE data >= :inicio AND data < :fim)"
+    ), bounds).scalar()
+    if not in_default:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {TABLE} {values}"))
+        return True
+    # O PostgreSQL recusa criar a partição se a default tiver linhas do período
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE data >= :inicio AND data < :fim RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    conn.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} {values}"))
+    return True
+
+
+def ensure_partitions(conn, months_ahead: int, since: datetime.date = None) -> list:
+    """Garante as partições de ``since`` (padrão: mês atual) até N meses à frente."""
+    current = month_start(datetime.datetime.utcnow().date())
+    month = month_start(since) if since is not None else current
+    created = []
+    while month <= add_months(current, months_ahead):
+        if create_month(conn, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def convert_table(conn, months_ahead: int) -> int:
+    """
+    Converte uma tabela ``atendimentos`` comum em particionada, copiando as
+    linhas. Roda em uma única transação e bloqueia a tabela durante a cópia.
+    """
+    conn.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+    legacy = f"{TABLE}_legacy"
+    # A sequência é reaproveitada (os ids não mudam); índices e PK liberam os nomes
+    conn.execute(text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY NONE"))
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {TABLE}_pkey TO {legacy}_pkey"))
+    for index in models.Atendimento.__table__.indexes:
+        conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    create_partitioned_table(conn)
+
+    oldest = conn.execute(text(f"SELECT min(data) FROM {legacy}")).scalar()
+    ensure_partitions(conn, months_ahead, since=oldest.date() if oldest else None)
+    names = [column.name for column in models.Atendimento.__table__.columns]
+    # Linhas antigas sem data vão para o mês da última atualização
+    source = ["coalesce(data, updated_at, now() AT TIME ZONE 'utc')" if name == "data" else name for name in names]
+    copied = conn.execute(text(
+        f"INSERT INTO {TABLE} ({', '.join(names)}) SELECT {', '.join(source)} FROM {legacy}"
+    )).rowcount
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    conn.execute(text(f"SELECT setval('{TABLE}_id_seq', coalesce((SELECT max(id) FROM {TABLE}), 0) + 1, false)"))
+    return copied
+
+
+def detach_before(conn, before: datetime.date, drop: bool = False) -> list:
+    """
+    Desanexa as partições mensais anteriores a ``before``. Sem ``drop``,
+    cada uma vira a tabela avulsa ``arquivo_atendimentos_pAAAA_MM``.
+    """
+    detached = []
+    for name in list_partitions(conn):
+        month = partition_month(name)
+        if month is None or month >= month_start(before):
+            continue
+        conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            conn.execute(text(f"ALTER TABLE {name} RENAME TO {ARCHIVE_PREFIX}{name}"))
+        detached.append(name)
+    return detached
+
+
+def setup(conn) -> None:
+    """
+    Usado pelo init_db: cria a tabela particionada se ela ainda não existir e
+    garante os meses à frente. Uma tabela comum existente não é convertida
+    automaticamente (a conversão bloqueia a tabela): use ``convert``.
+    """
+    if not table_exists(conn):
+        create_partitioned_table(conn)
+        print("✅ Tabela atendimentos criada com particionamento mensal")
+    elif not is_partitioned(conn):
+        print("⚠️  atendimentos não é particionada: rode 'python manage_partitions.py convert'")
+        return
+    created = ensure_partitions(conn, settings.atendimentos_partition_months_ahead)
+    for name in created:
+        print(f"   ✓ {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("setup")
+    ensure = commands.add_parser("ensure")
+    ensure.add_argument("--months-ahead", type=int, default=settings.atendimentos_partition_months_ahead)
+    commands.add_parser("convert")
+    commands.add_parser("list")
+    detach = commands.add_parser("detach")
+    detach.add_argument("--before", required=True, help="primeiro mês mantido (AAAA-MM)")
+    detach.add_argument("--drop", action="store_true", help="apaga as partições em vez de arquivá-las")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❌ Particionamento disponível apenas no PostgreSQL")
+        return 1
+
+    with engine.begin() as conn:
+        if args.command == "setup":
+            setup(conn)
+        elif args.command == "ensure":
+            for name in ensure_partitions(conn, args.months_ahead):
+                print(f"✅ Partição criada: {name}")
+        elif args.command == "convert":
+            if is_partitioned(conn):
+                print("ℹ️  atendimentos já é particionada")
+            else:
+                copied = convert_table(conn, settings.atendimentos_partition_months_ahead)
+                print(f"✅ atendimentos convertida: {copied} linhas copiadas")
+        elif args.command == "list":
+            for name in list_partitions(conn):
+                print(f"   ✓ {name}")
+        elif args.command == "detach":
+            before = datetime.datetime.strptime(args.before, "%Y-%m").date()
+            for name in detach_before(conn, before, drop=args.drop):
+                print(f"📦 {'Apagada' if args.drop else 'Arquivada'}: {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
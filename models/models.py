@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Index, CheckConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -20,6 +20,9 @@ class Clinica(Base):
     endereco = Column(String)
     cidade = Column(String, nullable=False)
 
+    # Versão da linha: base do ETag (api/etag.py) e do If-Match nos PUTs
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
     # Relacionamento: Uma clínica tem vários veterinários
     veterinarios = relationship("Veterinario", back_populates="clinica")
 
@@ -29,7 +32,10 @@ class Veterinario(Base):
     nome = Column(String, nullable=False)
     crmv = Column(String, unique=True, nullable=False)
     email = Column(String, unique=True, index=True)
-    especialidade = Column(String)
+    especialidade = Column(String, index=True)
+
+    # Versão da linha (ETag)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     # Relacionamento: Um veterinário pertence a uma clínica
     clinica_id = Column(Integer, ForeignKey('clinicas.id'))
@@ -38,6 +44,11 @@ class Veterinario(Base):
     # Relacionamento: Um veterinário realiza vários atendimentos
     atendimentos = relationship("Atendimento", back_populates="veterinario")
 
+    # Índice para listar o corpo clínico de uma clínica (opcionalmente por especialidade)
+    __table_args__ = (
+        Index("ix_veterinarios_clinica_id_especialidade", "clinica_id", "especialidade"),
+    )
+
 class Tutor(Base):
     __tablename__ = 'tutores'
     id = Column(Integer, primary_key=True, index=True)
@@ -46,6 +57,9 @@ class Tutor(Base):
     email = Column(String, unique=True, index=True)
     endereco = Column(String)
 
+    # Versão da linha (ETag)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
     # Relacionamento: Um tutor tem vários pets
     pets = relationship("Pet", back_populates="tutor")
 
@@ -53,10 +67,13 @@ class Pet(Base):
     __tablename__ = 'pets'
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, nullable=False)
-    especie = Column(String)
+    especie = Column(String, index=True)
     raca = Column(String)
     idade = Column(Integer)
 
+    # Versão da linha (ETag)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
     # Relacionamento: Um pet pertence a um tutor
     tutor_id = Column(Integer, ForeignKey('tutores.id'))
     tutor = relationship("Tutor", back_populates="pets")
@@ -64,16 +81,85 @@ class Pet(Base):
     # Relacionamento: Um pet pode ter vários atendimentos
     atendimentos = relationship("Atendimento", back_populates="pet")
 
+    # Índice para listar os pets de um tutor (opcionalmente por espécie)
+    __table_args__ = (
+        Index("ix_pets_tutor_id_especie", "tutor_id", "especie"),
+    )
+
 class Atendimento(Base):
     __tablename__ = 'atendimentos'
     id = Column(Integer, primary_key=True, index=True)
-    data = Column(DateTime, default=datetime.datetime.utcnow)
+    data = Column(DateTime, default=datetime.datetime.utcnow, index=True)
     descricao = Column(String, nullable=False)
 
+    # Versão da linha (ETag)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
     # Relacionamento: Um atendimento é de um pet
     pet_id = Column(Integer, ForeignKey('pets.id'))
     pet = relationship("Pet", back_populates="atendimentos")
 
     # Relacionamento: Um atendimento é realizado por um veterinário
     veterinario_id = Column(Integer, ForeignKey('veterinarios.id'))
-    veterinario = relationship("Veterinario", back_populates="atendimentos")
\ No newline at end of file
+    veterinario = relationship("Veterinario", back_populates="atendimentos")
+
+    # Espécie do pet e clínica do veterinário no momento do atendimento: chave
+    # do rollup de estatísticas, para a remoção decrementar a mesma linha que a
+    # criação incrementou mesmo depois de o pet/veterinário mudar ou sumir
+    especie = Column(String)
+    clinica_id = Column(Integer)
+
+    # Índices para o histórico de um pet e a agenda de um veterinário por período.
+    # No SQLite, AUTOINCREMENT impede que um id arquivado seja reaproveitado
+    __table_args__ = (
+        Index("ix_atendimentos_pet_id_data", "pet_id", "data"),
+        Index("ix_atendimentos_veterinario_id_data", "veterinario_id", "data"),
+        {"sqlite_autoincrement": True},
+    )
+
+class Agendamento(Base):
+    """
+    Horário reservado na agenda de um veterinário, no intervalo semiaberto
+    [inicio, fim) em UTC sem fuso. Dois agendamentos do mesmo veterinário não
+    podem se sobrepor: no PostgreSQL uma exclusion constraint GiST garante
+    isso (ver crud/agendamento.py); nos outros bancos, o índice em memória
+    de services/agenda_index.py.
+    """
+    __tablename__ = 'agendamentos'
+    id = Column(Integer, primary_key=True, index=True)
+    inicio = Column(DateTime, nullable=False)
+    fim = Column(DateTime, nullable=False)
+    descricao = Column(String)
+
+    # Momento da última alteração (a agenda não usa ETag)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    veterinario_id = Column(Integer, ForeignKey('veterinarios.id'), nullable=False)
+    pet_id = Column(Integer, ForeignKey('pets.id'))
+
+    # Índice para a agenda de um veterinário por período
+    __table_args__ = (
+        CheckConstraint("fim > inicio", name="ck_agendamentos_fim_apos_inicio"),
+        Index("ix_agendamentos_veterinario_id_inicio", "veterinario_id", "inicio"),
+    )
+
+class EstatisticaAtendimento(Base):
+    """
+    Rollup de atendimentos por dia, clínica, veterinário e espécie do pet,
+    mantido na mesma transação de cada criação/remoção de atendimento
+    (ver crud/estatisticas.py). Sem chaves estrangeiras: o histórico continua
+    valendo depois de arquivar atendimentos ou remover cadastros.
+    """
+    __tablename__ = 'estatisticas_atendimentos'
+    dia = Column(Date, primary_key=True)
+    # 0 / "" quando o veterinário não tem clínica ou o pet não tem espécie
+    clinica_id = Column(Integer, primary_key=True)
+    veterinario_id = Column(Integer, primary_key=True)
+    especie = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+    # Índices para as estatísticas de um veterinário ou de uma clínica por período
+    __table_args__ = (
+        Index("ix_estatisticas_atendimentos_veterinario_id_dia", "veterinario_id", "dia"),
+        Index("ix_estatisticas_atendimentos_clinica_id_dia", "clinica_id", "dia"),
+    )
@@ -8,9 +8,11 @@ Script para INICIALIZAR e POPULAR o banco de dados com dados de exemplo.
 import datetime
 import logging
 from sqlalchemy.orm import sessionmaker
-from database import engine, Base  # Importar Base para criar tabelas
+from database import engine
 from models.models import Usuario, Clinica, Veterinario, Tutor, Pet, Atendimento
 from services.auth import get_password_hash
+from crud import estatisticas as estatisticas_crud
+from init_db import create_agenda_constraints, create_missing_columns, create_missing_indexes, create_search_indexes, create_tables
 
 # Configurar logging para uma saída mais clara
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -23,7 +25,11 @@ def init_db():
     """Cria todas as tabelas no banco de dados."""
     try:
         logger.info("🔨 Criando todas as tabelas (se não existirem)...")
-        Base.metadata.create_all(bind=engine)
+        create_tables()
+        create_missing_columns()
+        create_missing_indexes()
+        create_search_indexes()
+        create_agenda_constraints()
         logger.info("✅ Tabelas criadas com sucesso!")
     except Exception as e:
         logger.error(f"❌ Erro ao criar tabelas: {e}")
@@ -88,6 +94,8 @@ def populate_db():
         atendimento3 = Atendimento(descricao="Tratamento dermatológico", data=datetime.datetime.now() - datetime.timedelta(days=1), pet_id=pet3.id, veterinario_id=vet1.id)
         db.add_all([atendimento1, atendimento2, atendimento3])
         db.commit()
+        # Os atendimentos de exemplo não passam pelo CRUD: calcula o rollup das estatísticas
+        estatisticas_crud.rebuild(db)
 
         logger.info("✅ Dados de exemplo criados com sucesso!")
         logger.info("📊 Resumo dos dados criados:")
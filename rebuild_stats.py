@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Recalcula o rollup das estatísticas de atendimentos (/api/stats).
+
+Uso:
+    python rebuild_stats.py
+
+O rollup é mantido a cada criação/remoção de atendimento pela API; este
+script serve para a carga inicial (atendimentos anteriores ao rollup) ou
+para corrigir o rollup após cargas diretas no banco. Antes, preenche a
+espécie e a clínica dos atendimentos que ainda não as têm (gravados antes
+dessas colunas). Os dias já arquivados (anteriores ao atendimento mais
+antigo da tabela) não são alterados.
+"""
+import sys
+
+from crud import estatisticas as estatisticas_crud
+from database import SessionLocal
+
+
+def main():
+    print("📊 Recalculando estatísticas de atendimentos...")
+    with SessionLocal() as db:
+        rebuilt = estatisticas_crud.rebuild(db)
+    print(f"✅ {rebuilt} linhas de estatísticas recalculadas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,7 +23,6 @@ def create_user(db: Session, user: schemas.UsuarioCreate):
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 def authenticate_user(db: Session, username: str, password: str):
@@ -51,7 +50,6 @@ def create_clinica(db: Session, clinica: schemas.ClinicaCreate):
     db_clinica = models.Clinica(nome=clinica.nome, cidade=clinica.cidade, endereco=clinica.endereco)
     db.add(db_clinica)
     db.commit()
-    db.refresh(db_clinica)
     return db_clinica
 
 # --- CRUD para Veterinario ---
@@ -73,7 +71,6 @@ def create_veterinario(db: Session, veterinario: schemas.VeterinarioCreate):
     db_veterinario = models.Veterinario(**veterinario.dict())
     db.add(db_veterinario)
     db.commit()
-    db.refresh(db_veterinario)
     return db_veterinario
 
 # --- CRUD para Tutor ---
@@ -91,7 +88,6 @@ def create_tutor(db: Session, tutor: schemas.TutorCreate):
     db_tutor = models.Tutor(nome=tutor.nome, telefone=tutor.telefone, email=tutor.email)
     db.add(db_tutor)
     db.commit()
-    db.refresh(db_tutor)
     return db_tutor
 
 # --- CRUD para Pet ---
@@ -113,7 +109,6 @@ def create_pet_for_tutor(db: Session, pet: schemas.PetCreate):
     db_pet = models.Pet(**pet.dict())
     db.add(db_pet)
     db.commit()
-    db.refresh(db_pet)
     return db_pet
 
 # --- CRUD para Atendimento ---
@@ -127,7 +122,6 @@ def create_atendimento(db: Session, atendimento: schemas.AtendimentoCreate):
     db_atendimento = models.Atendimento(**atendimento.dict())
     db.add(db_atendimento)
     db.commit()
-    db.refresh(db_atendimento)
     return db_atendimento
 
 def get_atendimentos_by_pet(db: Session, pet_id: int):
@@ -0,0 +1,35 @@
+"""
+Schemas da agenda dos veterinários (agendamentos e disponibilidade).
+"""
+import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AgendamentoBase(BaseModel):
+    """Horário ``[inicio, fim)`` reservado na agenda (UTC sem fuso ou com fuso explícito)."""
+    inicio: datetime.datetime
+    fim: datetime.datetime
+    descricao: Optional[str] = None
+
+
+class AgendamentoCreate(AgendamentoBase):
+    """Schema para criação de Agendamento."""
+    veterinario_id: int
+    pet_id: Optional[int] = None
+
+
+class Agendamento(AgendamentoBase):
+    """Schema para resposta de Agendamento."""
+    id: int
+    veterinario_id: int
+    pet_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class HorarioLivre(BaseModel):
+    """Horário livre na agenda de um veterinário."""
+    inicio: datetime.datetime
+    fim: datetime.datetime
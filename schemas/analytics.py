@@ -0,0 +1,17 @@
+"""
+Schemas do analytics de atendimentos (/api/analytics).
+"""
+import datetime
+from pydantic import BaseModel
+from typing import Optional, Union
+
+
+class SerieAtendimentos(BaseModel):
+    """
+    Contagem de atendimentos de um grupo (espécie, clínica, veterinário ou
+    pet) em um período (primeiro dia do dia/semana/mês). ``grupo``/``periodo``
+    são None quando a contagem não é separada por eles.
+    """
+    grupo: Optional[Union[int, str]] = None
+    periodo: Optional[datetime.date] = None
+    total: int
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+# Erro de um item específico de uma criação em lote
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+# Resultado de uma criação em lote (retornado pela API)
+# Os itens inválidos são reportados em "errors" sem impedir a criação dos demais
+class BulkCreateResult(BaseModel, Generic[T]):
+    created: List[T]
+    errors: List[BulkItemError]
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+
+from schemas.veterinario import Veterinario
 
 # Schema base com os campos comuns
 class ClinicaBase(BaseModel):
@@ -20,4 +22,8 @@ class Clinica(ClinicaBase):
     id: int
 
     class Config:
-        from_attributes = True # Anteriormente orm_mode
\ No newline at end of file
+        from_attributes = True # Anteriormente orm_mode
+
+# Schema de leitura da clínica com o seu corpo clínico
+class ClinicaCompleta(Clinica):
+    veterinarios: List[Veterinario] = []
@@ -0,0 +1,25 @@
+"""
+Schemas das estatísticas de atendimentos (/api/stats).
+"""
+import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+
+class VisitasVeterinario(BaseModel):
+    """Atendimentos de um veterinário em um dia ou semana (``periodo`` = primeiro dia)."""
+    veterinario_id: int
+    periodo: datetime.date
+    total: int
+
+
+class VisitasClinica(BaseModel):
+    """Atendimentos de uma clínica (None: veterinários sem clínica)."""
+    clinica_id: Optional[int] = None
+    total: int
+
+
+class MixEspecies(BaseModel):
+    """Atendimentos por espécie do pet (None: espécie não informada)."""
+    especie: Optional[str] = None
+    total: int
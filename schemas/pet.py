@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+
+from schemas.atendimento import Atendimento
 
 # Schema base com os campos comuns
 class PetBase(BaseModel):
@@ -25,4 +27,8 @@ class Pet(PetBase):
     tutor_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Schema de leitura com o histórico de atendimentos (usado em /tutores/{id}/full)
+class PetComAtendimentos(Pet):
+    atendimentos: List[Atendimento] = []
@@ -0,0 +1,14 @@
+"""
+Schemas da busca global (/api/search).
+"""
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+
+class SearchResult(BaseModel):
+    """Um resultado da busca, do maior para o menor ``score``."""
+    tipo: Literal["tutor", "pet", "veterinario"]
+    id: int
+    titulo: str
+    detalhe: Optional[str] = None
+    score: float
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
+
+from schemas.pet import PetComAtendimentos
 
 # Schema base com os campos comuns
 class TutorBase(BaseModel):
@@ -21,4 +23,8 @@ class Tutor(TutorBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Schema de leitura do registro completo: tutor -> pets -> atendimentos
+class TutorCompleto(Tutor):
+    pets: List[PetComAtendimentos] = []
@@ -0,0 +1,13 @@
+"""
+Worker do gunicorn para a aplicação em produção (ver gunicorn.conf.py).
+
+O ``UvicornWorker`` padrão escolhe o loop e o parser HTTP automaticamente;
+aqui eles são fixados em uvloop e httptools (instalados com
+``uvicorn[standard]``), para que uma instalação incompleta falhe na subida
+em vez de cair silenciosamente para asyncio/h11.
+"""
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
@@ -0,0 +1,120 @@
+"""
+Índice em memória dos horários ocupados de cada veterinário.
+
+Usado pela agenda (crud/agendamento.py) nos bancos sem exclusion constraint
+(SQLite): checa conflitos de horário e lista os horários ocupados de um
+período sem ir ao banco. O índice de um veterinário é carregado do banco na
+primeira vez que é usado e depois mantido pelas escritas da agenda.
+
+É por processo: o fallback assume um único processo da API escrevendo na
+agenda (o modo de desenvolvimento); o gunicorn.conf.py avisa ao subir com
+vários workers sem PostgreSQL. No PostgreSQL a agenda usa a exclusion
+constraint GiST e este índice não é usado.
+"""
+import bisect
+import threading
+
+
+class IntervalIndex:
+    """
+    Intervalos semiabertos ``[inicio, fim)`` ordenados pelo início, com o
+    maior ``fim`` acumulado até cada posição (sequência não decrescente).
+    Uma busca acha por bisseção o primeiro intervalo que pode terminar depois
+    do início consultado e percorre só até o fim consultado: O(log n + k).
+    Como a agenda não tem sobreposições, o ``fim`` acumulado é o ``fim`` do
+    próprio intervalo e nenhum intervalo fora do resultado é visitado.
+    """
+
+    def __init__(self, intervals=()):
+        self._items = sorted(intervals)
+        self._starts = [item[0] for item in self._items]
+        self._max_fim = []
+        self._keys = {item[2]: item[0] for item in self._items}
+        self._refresh(0)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _refresh(self, position: int) -> None:
+        del self._max_fim[position:]
+        for inicio, fim, _ in self._items[position:]:
+            self._max_fim.append(max(self._max_fim[-1], fim) if self._max_fim else fim)
+
+    def _overlapping(self, inicio, fim) -> list:
+        position = bisect.bisect_right(self._max_fim, inicio)
+        found = []
+        while position < len(self._items) and self._items[position][0] < fim:
+            if self._items[position][1] > inicio:
+                found.append(self._items[position])
+            position += 1
+        return found
+
+    def overlapping(self, inicio, fim) -> list:
+        """Intervalos ``(inicio, fim, key)`` que se sobrepõem a ``[inicio, fim)``, pelo início."""
+        with self._lock:
+            return self._overlapping(inicio, fim)
+
+    def add_if_free(self, inicio, fim, key) -> bool:
+        """Adiciona o intervalo se ele não se sobrepuser a nenhum outro."""
+        with self._lock:
+            if self._overlapping(inicio, fim):
+                return False
+            position = bisect.bisect_right(self._starts, inicio)
+            self._items.insert(position, (inicio, fim, key))
+            self._starts.insert(position, inicio)
+            self._keys[key] = inicio
+            self._refresh(position)
+            return True
+
+    def remove(self, key) -> None:
+        with self._lock:
+            inicio = self._keys.pop(key, None)
+            if inicio is None:
+                return
+            position = bisect.bisect_left(self._starts, inicio)
+            while self._items[position][2] != key:
+                position += 1
+            del self._items[position]
+            del self._starts[position]
+            self._refresh(position)
+
+
+class AgendaIndex:
+    """Um ``IntervalIndex`` por veterinário, carregado sob demanda."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, veterinario_id: int, load) -> IntervalIndex:
+        """
+        Índice do veterinário; na primeira vez, ``load()`` devolve os
+        intervalos ``(inicio, fim, id)`` do banco. Se duas requisições
+        carregarem ao mesmo tempo, fica o primeiro índice guardado (as
+        escritas sempre usam o índice guardado).
+        """
+        with self._lock:
+            index = self._indexes.get(veterinario_id)
+        if index is not None:
+            return index
+        loaded = IntervalIndex(load())
+        with self._lock:
+            return self._indexes.setdefault(veterinario_id, loaded)
+
+    def invalidate(self, veterinario_id: int) -> None:
+        """Descarta o índice (ex: escrita que falhou no meio); é recarregado no próximo uso."""
+        with self._lock:
+            self._indexes.pop(veterinario_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            indexes = list(self._indexes.values())
+        return {"veterinarios": len(indexes), "agendamentos": sum(len(index) for index in indexes)}
+
+
+agenda_index = AgendaIndex()
@@ -0,0 +1,67 @@
+import datetime
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from config import settings
+from crud import agendamento as agendamento_crud
+from crud.atendimento import _utc_naive
+from schemas import agendamento as agendamento_schema
+
+def create_new_agendamento(db: Session, agendamento: agendamento_schema.AgendamentoCreate):
+    """
+    Serviço para reservar um horário na agenda de um veterinário.
+    Valida o intervalo e as referências; sobreposição com outro agendamento
+    do veterinário responde 409.
+    """
+    if _utc_naive(agendamento.fim) <= _utc_naive(agendamento.inicio):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O fim do agendamento deve ser posterior ao início."
+        )
+
+    veterinario_exists, pet_exists = agendamento_crud.references_exist(
+        db, veterinario_id=agendamento.veterinario_id, pet_id=agendamento.pet_id
+    )
+    if not veterinario_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Veterinário com id {agendamento.veterinario_id} não encontrado."
+        )
+    if not pet_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pet com id {agendamento.pet_id} não encontrado."
+        )
+
+    try:
+        return agendamento_crud.create_agendamento(db, agendamento=agendamento)
+    except agendamento_crud.AgendaConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="O horário se sobrepõe a outro agendamento do veterinário."
+        )
+
+def get_disponibilidade(
+    db: Session,
+    veterinario_id: int,
+    data_inicio: datetime.date,
+    data_fim: datetime.date,
+    duracao_minutos: int,
+):
+    """Horários livres do veterinário no período, validando o período e a duração."""
+    dias = (data_fim - data_inicio).days
+    if not 0 < dias <= settings.agenda_max_dias:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"O período deve ter de 1 a {settings.agenda_max_dias} dias (data_fim exclusiva)."
+        )
+    if duracao_minutos > (settings.agenda_hora_fim - settings.agenda_hora_inicio) * 60:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="A duração não cabe no expediente."
+        )
+    veterinario_exists, _ = agendamento_crud.references_exist(db, veterinario_id=veterinario_id)
+    if not veterinario_exists:
+        raise HTTPException(status_code=404, detail="Veterinário não encontrado")
+    return agendamento_crud.disponibilidade(
+        db, veterinario_id, data_inicio=data_inicio, data_fim=data_fim, duracao_minutos=duracao_minutos
+    )
@@ -0,0 +1,265 @@
+"""
+Analytics vetorizado do histórico de atendimentos (``/api/analytics``).
+
+Lê os atendimentos (``analytics_statement``) com cursor do lado do servidor,
+em blocos de ``settings.analytics_batch_size`` linhas, sem objetos ORM nem
+modelos Pydantic, depois das linhas do arquivo frio (``archived``, de
+``atendimento_archive.iter_rows``) quando informadas:
+
+- com ``pyarrow`` instalado cada bloco vira um ``RecordBatch``; os períodos
+  saem de ``floor_temporal`` e as contagens de ``group_by``, kernels do Arrow
+  (os parciais de cada bloco são somados no fim);
+- sem ele, as mesmas contagens são feitas em Python puro (mais lento).
+
+As respostas ``arrow`` (IPC stream) e ``parquet`` exigem pyarrow. A
+exportação nesses formatos é enviada em streaming, bloco a bloco.
+"""
+import collections
+import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+import database
+from config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: agregação em Python puro, sem arrow/parquet
+    pa = None
+
+GROUPS = ("especie", "clinica_id", "veterinario_id", "pet_id")
+BUCKETS = {"dia": "day", "semana": "week", "mes": "month"}
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+if pa is not None:
+    SCHEMA = pa.schema([
+        ("id", pa.int64()),
+        ("data", pa.timestamp("us")),
+        ("pet_id", pa.int64()),
+        ("veterinario_id", pa.int64()),
+        ("especie", pa.string()),
+        ("clinica_id", pa.int64()),
+    ])
+
+
+def require_pyarrow(fmt: str) -> None:
+    if fmt in MEDIA_TYPES and pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"O formato '{fmt}' requer o pacote pyarrow no servidor.",
+        )
+
+
+def _record_batch(rows) -> "pa.RecordBatch":
+    columns = list(zip(*rows)) or [[] for _ in SCHEMA]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, SCHEMA)], schema=SCHEMA
+    )
+
+
+def _python_bucket(value: Optional[datetime.datetime], bucket: str):
+    if value is None:
+        return None
+    day = value.date()
+    if bucket == "semana":
+        return day - datetime.timedelta(days=day.weekday())
+    if bucket == "mes":
+        return day.replace(day=1)
+    return day
+
+
+class SeriesAggregator:
+    """Contagem de atendimentos por grupo e/ou período, acumulada bloco a bloco."""
+
+    def __init__(self, group_by: Optional[str] = None, bucket: Optional[str] = None):
+        self.group_by = group_by
+        self.bucket = bucket
+        self.total = 0
+        self.partials = []
+        self.counts = collections.Counter()
+
+    def add(self, rows) -> None:
+        self.total += len(rows)
+        if not rows or not (self.group_by or self.bucket):
+            return
+        if pa is None:
+            self.counts.update(
+                (
+                    getattr(row, self.group_by) if self.group_by else None,
+                    _python_bucket(row.data, self.bucket) if self.bucket else None,
+                )
+                for row in rows
+            )
+            return
+        batch = _record_batch(rows)
+        columns = {}
+        if self.group_by:
+            columns["grupo"] = batch.column(self.group_by)
+        if self.bucket:
+            columns["periodo"] = pc.floor_temporal(
+                batch.column("data"), unit=BUCKETS[self.bucket], week_starts_monday=True
+            )
+        keys = list(columns)
+        self.partials.append(
+            pa.table(columns).group_by(keys).aggregate([(keys[0], "count", pc.CountOptions(mode="all"))])
+            .rename_columns([*keys, "total"])
+        )
+
+    def result(self) -> list:
+        """Linhas ``{"grupo", "periodo", "total"}`` ordenadas por grupo e período."""
+        if not (self.group_by or self.bucket):
+            return [{"grupo": None, "periodo": None, "total": self.total}]
+        if pa is not None and self.partials:
+            keys = [name for name in self.partials[0].column_names if name != "total"]
+            merged = pa.concat_tables(self.partials).group_by(keys).aggregate([("total", "sum")])
+            for row in merged.to_pylist():
+                periodo = row.get("periodo")
+                self.counts[(row.get("grupo"), periodo.date() if periodo is not None else None)] += row["total_sum"]
+        rows = [
+            {"grupo": grupo, "periodo": periodo, "total": total}
+            for (grupo, periodo), total in self.counts.items()
+        ]
+        rows.sort(key=lambda row: (
+            row["grupo"] is None,
+            row["grupo"] if row["grupo"] is not None else 0,
+            row["periodo"] or datetime.date.min,
+        ))
+        return rows
+
+
+def _add_all(aggregator: SeriesAggregator, partitions) -> None:
+    for partition in partitions:
+        aggregator.add(partition)
+
+
+def _aggregate_sync(stmt, aggregator: SeriesAggregator, archived) -> list:
+    _add_all(aggregator, archived)
+    with database.read_session_factory()() as db:
+        result = db.execute(stmt.execution_options(yield_per=settings.analytics_batch_size))
+        for partition in result.partitions():
+            aggregator.add(partition)
+    return aggregator.result()
+
+
+async def aggregate(stmt, group_by: Optional[str] = None, bucket: Optional[str] = None, archived=()) -> list:
+    """Agrega o arquivo e o ``analytics_statement`` por grupo/período, bloco a bloco."""
+    aggregator = SeriesAggregator(group_by, bucket)
+    if not settings.async_database:
+        return await run_in_threadpool(_aggregate_sync, stmt, aggregator, archived)
+    # A leitura do arquivo (disco + gzip) sai do event loop
+    await run_in_threadpool(_add_all, aggregator, archived)
+    async with database.read_session_factory()() as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.analytics_batch_size))
+        async for partition in result.partitions():
+            # O cálculo do bloco sai do event loop
+            await run_in_threadpool(aggregator.add, partition)
+    return aggregator.result()
+
+
+def table_response(rows: list, fmt: str, filename: str) -> Response:
+    """Resultado agregado em Arrow IPC ou Parquet."""
+    table = pa.Table.from_pylist(rows)
+    sink = pa.BufferOutputStream()
+    if fmt == "parquet":
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+class _ChunkSink:
+    """
+    Destino de escrita do pyarrow que guarda os bytes até o próximo envio.
+    ``tell`` conta tudo o que já foi escrito: o rodapé do Parquet guarda
+    posições absolutas no arquivo.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class _BatchWriter:
+    def __init__(self, fmt: str):
+        self.sink = _ChunkSink()
+        stream = pa.PythonFile(self.sink, mode="w")
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(stream, SCHEMA)
+        else:
+            self.writer = pa.ipc.new_stream(stream, SCHEMA)
+
+    def write(self, rows) -> bytes:
+        # No Parquet, cada bloco vira um row group
+        self.writer.write_batch(_record_batch(rows))
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+def _stream_sync(stmt, fmt: str, archived):
+    writer = _BatchWriter(fmt)
+    for partition in archived:
+        yield writer.write(partition)
+    with database.read_session_factory()() as db:
+        result = db.execute(stmt.execution_options(yield_per=settings.analytics_batch_size))
+        for partition in result.partitions():
+            yield writer.write(partition)
+    yield writer.close()
+
+
+async def _stream_async(stmt, fmt: str, archived):
+    writer = _BatchWriter(fmt)
+    archived = iter(archived)
+    while (partition := await run_in_threadpool(next, archived, None)) is not None:
+        yield await run_in_threadpool(writer.write, partition)
+    async with database.read_session_factory()() as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.analytics_batch_size))
+        async for partition in result.partitions():
+            yield await run_in_threadpool(writer.write, partition)
+    yield writer.close()
+
+
+def stream_batches(stmt, fmt: str, filename: str, archived=()) -> StreamingResponse:
+    """Exporta as linhas do arquivo e depois as do ``stmt`` em Arrow IPC ou Parquet, em streaming."""
+    body = _stream_async(stmt, fmt, archived) if settings.async_database else _stream_sync(stmt, fmt, archived)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
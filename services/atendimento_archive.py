@@ -0,0 +1,358 @@
+"""
+Arquivo frio de atendimentos antigos, com leitura transparente.
+
+O job ``archive_atendimentos.py`` move os atendimentos anteriores ao corte
+(``ARCHIVE_AFTER_MONTHS``) para arquivos NDJSON comprimidos em
+``ARCHIVE_DIR``, um ou mais por mês:
+
+- ``atendimentos_AAAA_MM_N.ndjson.gz``: linhas ordenadas por ``id``, gravadas
+  em blocos de ``ARCHIVE_BLOCK_ROWS`` linhas, cada bloco um membro gzip
+  independente (o arquivo inteiro continua sendo um gzip válido);
+- ``atendimentos_AAAA_MM_N.idx.json``: posição de cada bloco e seu intervalo
+  de ids, mais os blocos de cada pet;
+- ``manifest.json``: os arquivos com intervalo de ids, de datas e contagem.
+
+Buscar um id ou o histórico de um pet descomprime só os blocos necessários.
+``GET /api/atendimentos/{id}`` e a listagem filtrada por ``pet_id`` recorrem
+ao arquivo quando a linha não está na tabela; as exportações
+(``/api/atendimentos/export``, ``/api/analytics``) leem o arquivo com
+``iter_rows`` antes da tabela. O arquivo é somente leitura: PUT/DELETE de
+um atendimento arquivado respondem 404.
+"""
+import collections
+import datetime
+import gzip
+import heapq
+import json
+import os
+from functools import lru_cache
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, select
+
+import database
+from config import settings
+from crud import atendimento as atendimento_crud, estatisticas as estatisticas_crud
+from models import models
+
+MANIFEST = "manifest.json"
+_DATETIME_COLUMNS = {
+    column.name for column in models.Atendimento.__table__.columns
+    if column.type.python_type is datetime.datetime
+}
+
+
+class ArchivedRow(dict):
+    """
+    Linha do arquivo com a interface de uma ``Row`` do SQLAlchemy (atributos e
+    ``_mapping``), para passar pelo mesmo serializador das linhas do banco.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def _mapping(self):
+        return self
+
+
+def _decode(line: str) -> ArchivedRow:
+    row = ArchivedRow(json.loads(line))
+    for name in _DATETIME_COLUMNS:
+        if row.get(name) is not None:
+            row[name] = datetime.datetime.fromisoformat(row[name])
+    return row
+
+
+def _encode(row) -> str:
+    return json.dumps(
+        {name: value.isoformat() if isinstance(value, datetime.datetime) else value
+         for name, value in row._mapping.items()},
+        ensure_ascii=False, separators=(",", ":"),
+    )
+
+
+# --- Leitura ---
+
+@lru_cache(maxsize=256)
+def _read_json(path: str, mtime_ns: int):
+    # O mtime faz parte da chave do cache: um arquivo reescrito pelo job é relido
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _load(path: str):
+    try:
+        return _read_json(path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+
+def _manifest() -> list:
+    return _load(os.path.join(settings.archive_dir, MANIFEST)) or []
+
+
+def _read_block(name: str, block: dict) -> list:
+    with open(os.path.join(settings.archive_dir, name), "rb") as file:
+        file.seek(block["offset"])
+        data = gzip.decompress(file.read(block["length"]))
+    return [_decode(line) for line in data.decode("utf-8").splitlines()]
+
+
+def _index(entry: dict) -> dict:
+    return _load(os.path.join(settings.archive_dir, entry["index"]))
+
+
+def find(atendimento_id: int) -> Optional[ArchivedRow]:
+    """Busca um atendimento arquivado pelo id (None se não estiver no arquivo)."""
+    for entry in _manifest():
+        if not entry["min_id"] <= atendimento_id <= entry["max_id"]:
+            continue
+        for block in _index(entry)["blocks"]:
+            if block["first_id"] <= atendimento_id <= block["last_id"]:
+                for row in _read_block(entry["file"], block):
+                    if row["id"] == atendimento_id:
+                        return row
+    return None
+
+
+def pet_history(
+    pet_id: int,
+    after_id: Optional[int] = None,
+    veterinario_id: Optional[int] = None,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+) -> list:
+    """Atendimentos arquivados de um pet, com os filtros da listagem, por id."""
+    data_inicio, data_fim = atendimento_crud._utc_naive(data_inicio), atendimento_crud._utc_naive(data_fim)
+    rows = []
+    for entry in _manifest():
+        if after_id is not None and entry["max_id"] <= after_id:
+            continue
+        if data_inicio is not None and datetime.datetime.fromisoformat(entry["max_data"]) < data_inicio:
+            continue
+        if data_fim is not None and datetime.datetime.fromisoformat(entry["min_data"]) >= data_fim:
+            continue
+        index = _index(entry)
+        for block_number in index["pets"].get(str(pet_id), []):
+            for row in _read_block(entry["file"], index["blocks"][block_number]):
+                if (
+                    row["pet_id"] == pet_id
+                    and (after_id is None or row["id"] > after_id)
+                    and (veterinario_id is None or row["veterinario_id"] == veterinario_id)
+                    and (data_inicio is None or row["data"] >= data_inicio)
+                    and (data_fim is None or row["data"] < data_fim)
+                ):
+                    rows.append(row)
+    rows.sort(key=lambda row: row["id"])
+    return rows
+
+
+def iter_rows(
+    columns: list,
+    data_inicio: Optional[datetime.datetime] = None,
+    data_fim: Optional[datetime.datetime] = None,
+    batch_size: int = 1000,
+    **filters,
+):
+    """
+    Linhas arquivadas com ``data`` em ``[data_inicio, data_fim)`` e com as
+    colunas de ``filters`` iguais aos valores dados (None não filtra), como
+    tuplas nomeadas de ``columns``, em listas de até ``batch_size`` linhas.
+    Segue a ordem do manifest (mês a mês) e, em cada arquivo, a de ``id``.
+    Colunas que um arquivo antigo não tem saem como None.
+    """
+    data_inicio, data_fim = atendimento_crud._utc_naive(data_inicio), atendimento_crud._utc_naive(data_fim)
+    filters = {name: value for name, value in filters.items() if value is not None}
+    Linha = collections.namedtuple("Linha", columns)
+    batch = []
+    for entry in _manifest():
+        if data_inicio is not None and datetime.datetime.fromisoformat(entry["max_data"]) < data_inicio:
+            continue
+        if data_fim is not None and datetime.datetime.fromisoformat(entry["min_data"]) >= data_fim:
+            continue
+        index = _index(entry)
+        blocks = index["blocks"]
+        if "pet_id" in filters:
+            blocks = [blocks[number] for number in index["pets"].get(str(filters["pet_id"]), [])]
+        for block in blocks:
+            for row in _read_block(entry["file"], block):
+                if (
+                    (data_inicio is None or row["data"] >= data_inicio)
+                    and (data_fim is None or row["data"] < data_fim)
+                    and all(row.get(name) == value for name, value in filters.items())
+                ):
+                    batch.append(Linha(*(row.get(name) for name in columns)))
+                    if len(batch) == batch_size:
+                        yield batch
+                        batch = []
+    if batch:
+        yield batch
+
+
+async def get_atendimento(db, atendimento_id: int):
+    """
+    Atendimento pelo id: da tabela ou, se não estiver lá, do arquivo (como um
+    ``Atendimento`` transiente, com o mesmo ETag que tinha na tabela).
+    """
+    db_atendimento = await database.run_db(db, atendimento_crud.get_atendimento, atendimento_id=atendimento_id)
+    if db_atendimento is not None:
+        return db_atendimento
+    row = await run_in_threadpool(find, atendimento_id)
+    return models.Atendimento(**row) if row is not None else None
+
+
+async def list_pet_history(db, pet_id: int, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, **filters) -> list:
+    """
+    Listagem filtrada por pet juntando tabela e arquivo, na ordem de ``id``
+    e com a mesma paginação (``skip``/``limit`` ou ``after_id``).
+    """
+    archived = await run_in_threadpool(pet_history, pet_id, after_id=after_id, **filters)
+    if not archived:
+        return await database.run_db(
+            db, atendimento_crud.get_atendimentos_rows,
+            skip=skip, limit=limit, after_id=after_id, pet_id=pet_id, **filters,
+        )
+    # Página da junção: basta ler da tabela as skip + limit primeiras linhas
+    window = limit if after_id is not None else skip + limit
+    hot = await database.run_db(
+        db, atendimento_crud.get_atendimentos_rows,
+        skip=0, limit=window, after_id=after_id, pet_id=pet_id, **filters,
+    )
+    # Uma linha pode estar nos dois lados se o job falhou depois de gravar o arquivo
+    hot_ids = {row.id for row in hot}
+    merged = heapq.merge([row for row in archived if row["id"] not in hot_ids], hot, key=lambda row: row.id)
+    start = 0 if after_id is not None else skip
+    return list(merged)[start:start + limit]
+
+
+# --- Gravação (job archive_atendimentos.py) ---
+
+def cutoff(months: int, now: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """Início do mês ``months`` meses antes do mês atual."""
+    now = now or datetime.datetime.utcnow()
+    index = now.year * 12 + now.month - 1 - months
+    return datetime.datetime(index // 12, index % 12 + 1, 1)
+
+
+def _next_month(month: datetime.datetime) -> datetime.datetime:
+    return cutoff(-1, month)
+
+
+def _write_atomic(path: str, payload) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as file:
+        json.dump(payload, file, separators=(",", ":"))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, path)
+
+
+def _write_month(month: datetime.datetime, rows) -> Optional[dict]:
+    """Grava as linhas (ordenadas por id) de um mês; devolve a entrada do manifest."""
+    os.makedirs(settings.archive_dir, exist_ok=True)
+    manifest = _manifest()
+    prefix = f"atendimentos_{month.year:04d}_{month.month:02d}"
+    part = 1 + sum(1 for entry in manifest if entry["file"].startswith(prefix + "_"))
+    name = f"{prefix}_{part}.ndjson.gz"
+    path = os.path.join(settings.archive_dir, name)
+
+    blocks, pets, block, count = [], {}, [], 0
+    min_data = max_data = None
+    with open(f"{path}.tmp", "wb") as file:
+        def flush():
+            payload = gzip.compress(("\n".join(map(_encode, block)) + "\n").encode("utf-8"), mtime=0)
+            blocks.append({
+                "first_id": block[0].id, "last_id": block[-1].id,
+                "offset": file.tell(), "length": len(payload),
+            })
+            for pet_id in {row.pet_id for row in block}:
+                pets.setdefault(str(pet_id), []).append(len(blocks) - 1)
+            file.write(payload)
+
+        for row in rows:
+            block.append(row)
+            count += 1
+            min_data = row.data if min_data is None else min(min_data, row.data)
+            max_data = row.data if max_data is None else max(max_data, row.data)
+            if len(block) == settings.archive_block_rows:
+                flush()
+                block = []
+        if block:
+            flush()
+        file.flush()
+        os.fsync(file.fileno())
+    if count == 0:
+        os.remove(f"{path}.tmp")
+        return None
+    os.replace(f"{path}.tmp", path)
+
+    index_name = f"{prefix}_{part}.idx.json"
+    _write_atomic(os.path.join(settings.archive_dir, index_name), {"blocks": blocks, "pets": pets})
+    entry = {
+        "file": name, "index": index_name, "month": f"{month.year:04d}-{month.month:02d}", "count": count,
+        "min_id": blocks[0]["first_id"], "max_id": blocks[-1]["last_id"],
+        "min_data": min_data.isoformat(), "max_data": max_data.isoformat(),
+    }
+    _write_atomic(os.path.join(settings.archive_dir, MANIFEST), [*manifest, entry])
+    return entry
+
+
+def archive_before(engine, before: datetime.datetime) -> list:
+    """
+    Move para o arquivo os atendimentos com ``data < before``, mês a mês:
+    grava o arquivo (e o manifest) e só então apaga as linhas arquivadas.
+    Apaga só os ids gravados no arquivo (em lotes de ``archive_block_rows``):
+    uma linha que entrou no mês depois da leitura continua na tabela. No
+    PostgreSQL a leitura trava as linhas (FOR UPDATE) até o DELETE, para que
+    nenhuma seja alterada entre a gravação e a remoção.
+    """
+    table = models.Atendimento.__table__
+    with engine.connect() as conn:
+        oldest = conn.scalar(select(func.min(table.c.data)).where(table.c.data < before))
+    if oldest is None:
+        return []
+    with engine.begin() as conn:
+        # As linhas arquivadas levam a espécie e a clínica (analytics do arquivo)
+        estatisticas_crud.fill_atendimento_keys(conn)
+    archived = []
+    month = datetime.datetime(oldest.year, oldest.month, 1)
+    while month < before:
+        end = min(_next_month(month), before)
+        period = (table.c.data >= month) & (table.c.data < end)
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(*table.c).where(period).order_by(table.c.id).with_for_update()
+                .execution_options(yield_per=settings.archive_block_rows)
+            )
+            exported = []
+
+            def tracked():
+                for row in rows:
+                    exported.append(row.id)
+                    yield row
+
+            entry = _write_month(month, tracked())
+            if entry is not None:
+                for start in range(0, len(exported), settings.archive_block_rows):
+                    chunk = exported[start:start + settings.archive_block_rows]
+                    conn.execute(delete(table).where(table.c.id.in_(chunk)))
+                archived.append(entry)
+        month = _next_month(month)
+    return archived
+
+
+def stats() -> dict:
+    """Resumo do arquivo (exposto em /api/health)."""
+    manifest = _manifest()
+    months = [entry["month"] for entry in manifest]
+    return {
+        "files": len(manifest),
+        "rows": sum(entry["count"] for entry in manifest),
+        "oldest_month": min(months) if months else None,
+        "newest_month": max(months) if months else None,
+    }
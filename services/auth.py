@@ -4,16 +4,14 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from config import settings
-from database import get_db
+from database import get_db, run_db
 from crud import usuario as usuario_crud
-from schemas import token as token_schema
-
-# Configuração de hashing de senha
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from schemas import token as token_schema, usuario as usuario_schema
+from services.password_hashing import pwd_context
+from services.principal_cache import principal_cache
 
 # Esquema de autenticação OAuth2
 # O tokenUrl aponta para o endpoint que o cliente usará para obter o token.
@@ -38,10 +36,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-def get_current_active_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_active_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     """
     Dependência para obter o usuário atual a partir de um token.
-    Valida o token, extrai o username e busca o usuário no banco.
+    Valida o token, extrai o username e busca o usuário no cache de
+    principals ou, em caso de falha, no banco.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,7 +56,13 @@ def get_current_active_user(token: str = Depends(oauth2_scheme), db: Session = D
     except JWTError:
         raise credentials_exception
     
-    user = usuario_crud.get_user_by_username(db, username=token_data.username)
-    if user is None or not user.is_active:
+    user = principal_cache.get(token_data.username)
+    if user is not None:
+        return user
+
+    db_user = await run_db(db, usuario_crud.get_user_by_username, username=token_data.username)
+    if db_user is None or not db_user.is_active:
         raise credentials_exception
+    user = usuario_schema.Usuario.model_validate(db_user)
+    principal_cache.set(token_data.username, user)
     return user
\ No newline at end of file
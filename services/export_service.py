@@ -0,0 +1,85 @@
+"""
+Exportação em streaming (NDJSON ou CSV) de tabelas grandes.
+
+As linhas são lidas com cursor do lado do servidor (``yield_per``) e
+serializadas em blocos de ``settings.export_batch_size`` linhas, sem criar
+objetos ORM nem modelos Pydantic. A memória usada é constante, qualquer que
+seja o número de linhas exportadas.
+
+O streaming usa uma sessão própria: a sessão da requisição (``get_db``) é
+encerrada antes do envio do corpo da resposta. Com réplicas configuradas a
+exportação lê de uma delas. Linhas que não estão no banco (o arquivo frio
+de atendimentos) podem ser passadas em ``archived`` e saem antes das do banco.
+"""
+import csv
+import datetime
+import io
+import json
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+import database
+from config import settings
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _format_rows(fmt: str, keys: list, rows) -> str:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(keys, map(_json_value, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _stream_sync(stmt, fmt: str, keys: list, archived):
+    if fmt == "csv":
+        yield _format_rows(fmt, keys, [keys])
+    for partition in archived:
+        yield _format_rows(fmt, keys, partition)
+    with database.read_session_factory()() as db:
+        result = db.execute(stmt.execution_options(yield_per=settings.export_batch_size))
+        for partition in result.partitions():
+            yield _format_rows(fmt, keys, partition)
+
+
+async def _stream_async(stmt, fmt: str, keys: list, archived):
+    if fmt == "csv":
+        yield _format_rows(fmt, keys, [keys])
+    archived = iter(archived)
+    while (partition := await run_in_threadpool(next, archived, None)) is not None:
+        yield _format_rows(fmt, keys, partition)
+    async with database.read_session_factory()() as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.export_batch_size))
+        async for partition in result.partitions():
+            yield _format_rows(fmt, keys, partition)
+
+
+def stream_export(stmt, fmt: str, filename: str, archived=()) -> StreamingResponse:
+    """
+    Cria a resposta em streaming para um ``select()`` de colunas, precedida
+    pelas listas de linhas de ``archived`` (com as mesmas colunas).
+    """
+    keys = [column.key for column in stmt.selected_columns]
+    if settings.async_database:
+        body = _stream_async(stmt, fmt, keys, archived)
+    else:
+        body = _stream_sync(stmt, fmt, keys, archived)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,159 @@
+"""
+Métricas Prometheus da aplicação.
+
+- ``MetricsMiddleware``: middleware ASGI puro (sem ``BaseHTTPMiddleware``) que
+  conta requisições por rota/status, mede latência e requisições em andamento.
+- ``instrument_engine``: eventos ``before/after_cursor_execute`` que medem a
+  duração de cada statement SQL e acumulam, por requisição, quantas queries
+  foram executadas e quanto tempo passaram no banco.
+- ``RESPONSE_CACHE``: acertos/falhas do cache de respostas por namespace
+  (alimentado por ``services.response_cache``).
+- ``observe_pool_wait``: tempo de espera no checkout de conexões do pool
+  (alimentado pelas classes de pool de ``database.py``).
+- ``PASSWORD_HASH_*``: latência (incluindo a espera na fila), fila e rejeições
+  do pool de hashing de senhas (alimentados por ``services.password_hashing``).
+
+Com vários workers (gunicorn, ver gunicorn.conf.py) o ``prometheus_client``
+roda em modo multiprocesso (``PROMETHEUS_MULTIPROC_DIR``) e ``render_latest``
+agrega os arquivos de todos os workers.
+
+As rotas são rotuladas pelo template (``/api/pets/{pet_id}``), não pela URL,
+para manter a cardinalidade das séries limitada.
+"""
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+
+REQUESTS = Counter(
+    "http_requests_total", "Total de requisições HTTP.", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP.", ["method", "route"]
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento.", ["method"],
+    multiprocess_mode="livesum",
+)
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "Quantidade de statements SQL por requisição.", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Tempo total em statements SQL por requisição.", ["route"]
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Duração de cada statement SQL.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+RESPONSE_CACHE = Counter(
+    "response_cache_requests_total", "Consultas ao cache de respostas.", ["namespace", "result"]
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Espera para obter uma conexão do pool.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds", "Latência das operações de hashing de senha (com a fila).", ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5, 10),
+)
+PASSWORD_HASH_QUEUE = Gauge(
+    "password_hash_queue_depth", "Operações de hashing de senha na fila ou em execução.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Operações de hashing recusadas com 503 (fila cheia)."
+)
+
+
+class RequestDbStats:
+    """Acumulador de queries SQL da requisição corrente."""
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# Objeto mutável: também é visto pelas threads do threadpool e pelo greenlet do
+# run_sync, que recebem uma cópia do contexto da requisição
+current_request_stats: ContextVar = ContextVar("current_request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    QUERY_DURATION.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+
+def instrument_engine(engine) -> None:
+    """Registra os eventos de medição de queries em uma engine (síncrona)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def observe_pool_wait(seconds: float) -> None:
+    POOL_CHECKOUT_WAIT.observe(seconds)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que registra as métricas HTTP e de banco por requisição."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestDbStats()
+        token = current_request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            current_request_stats.reset(token)
+            route = _route_template(scope)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.duration)
+
+
+def render_latest():
+    """Retorna o corpo e o content-type da exposição Prometheus."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
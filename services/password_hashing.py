@@ -0,0 +1,111 @@
+"""
+Pool dedicado para hashing e verificação de senhas (bcrypt).
+
+O bcrypt consome centenas de milissegundos de CPU por operação. Executá-lo
+no event loop ou no threadpool das requisições faz com que uma rajada de
+logins deixe as demais rotas sem workers. Aqui as operações rodam em um
+``ProcessPoolExecutor`` próprio, com limite de fila: quando o limite é
+atingido a requisição recebe 503 com ``Retry-After`` em vez de esperar.
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from services import metrics
+
+# Configuração de hashing de senha
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_pool = None
+_pending = 0
+_metrics = {
+    "completed": 0,
+    "rejected": 0,
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _get_pool():
+    """Cria o pool sob demanda, já dentro do processo do worker (após o fork)."""
+    global _pool
+    if _pool is None and settings.password_hash_workers > 0:
+        _pool = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+    return _pool
+
+
+async def _submit(operation: str, fn, *args):
+    global _pending
+    if _pending >= settings.password_hash_max_queue:
+        _metrics["rejected"] += 1
+        metrics.PASSWORD_HASH_REJECTED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serviço de autenticação sobrecarregado. Tente novamente em instantes.",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        )
+
+    _pending += 1
+    metrics.PASSWORD_HASH_QUEUE.inc()
+    start = time.perf_counter()
+    try:
+        pool = _get_pool()
+        if pool is None:
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    finally:
+        _pending -= 1
+        metrics.PASSWORD_HASH_QUEUE.dec()
+        elapsed = time.perf_counter() - start
+        metrics.PASSWORD_HASH_LATENCY.labels(operation).observe(elapsed)
+        _metrics["completed"] += 1
+        _metrics["total_seconds"] += elapsed
+        _metrics["max_seconds"] = max(_metrics["max_seconds"], elapsed)
+
+
+async def hash_password(password: str) -> str:
+    """Gera o hash de uma senha no pool de hashing."""
+    return await _submit("hash", _hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica uma senha contra o hash no pool de hashing."""
+    return await _submit("verify", _verify, plain_password, hashed_password)
+
+
+def stats() -> dict:
+    """
+    Profundidade da fila e latência (inclui espera na fila) das operações.
+    Os mesmos dados saem em /metrics (``password_hash_*``).
+    """
+    completed = _metrics["completed"]
+    return {
+        "workers": settings.password_hash_workers,
+        "queue_depth": _pending,
+        "max_queue": settings.password_hash_max_queue,
+        "completed": completed,
+        "rejected": _metrics["rejected"],
+        "avg_ms": round(_metrics["total_seconds"] / completed * 1000, 2) if completed else 0.0,
+        "max_ms": round(_metrics["max_seconds"] * 1000, 2),
+    }
+
+
+def shutdown_pool() -> None:
+    """Encerra os processos do pool (chamado no shutdown da aplicação)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
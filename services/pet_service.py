@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from crud import pet as pet_crud
+from schemas import pet as pet_schema
+
+def create_new_pet(db: Session, pet: pet_schema.PetCreate):
+    """
+    Serviço para criar um novo pet validando a existência do tutor.
+    A validação e o INSERT acontecem em um único statement.
+    """
+    db_pet = pet_crud.create_pet_if_tutor_exists(db, pet=pet)
+    if db_pet is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tutor com id {pet.tutor_id} não encontrado."
+        )
+    return db_pet
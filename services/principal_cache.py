@@ -0,0 +1,88 @@
+"""
+Cache em memória dos usuários autenticados (principals).
+
+Evita um SELECT em ``usuarios`` a cada requisição autenticada. As entradas
+expiram após ``settings.auth_cache_ttl_seconds`` e são invalidadas por
+``crud.usuario`` quando um usuário é alterado ou removido. O cache é por
+processo: com vários workers, o TTL limita por quanto tempo um worker pode
+enxergar um usuário desatualizado.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from config import settings
+
+
+class PrincipalCache:
+    """Cache LRU com TTL, indexado pelo ``sub`` (username) do token."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, username: str):
+        """Retorna o principal em cache ou None se ausente/expirado."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, username: str, principal) -> None:
+        """Armazena o principal, descartando o menos usado se o cache estiver cheio."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[username] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Remove o principal de um usuário (ex: após alteração ou remoção)."""
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Remove o principal pelo id do usuário (útil quando o username mudou)."""
+        with self._lock:
+            stale = [key for key, (_, principal) in self._entries.items() if principal.id == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Contadores de acerto/falha para monitoramento."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.auth_cache_max_size,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
@@ -0,0 +1,163 @@
+"""
+Detector de N+1 e de queries lentas por requisição (opt-in).
+
+Habilitado por ``settings.query_inspection_enabled``. Para cada requisição
+guarda os statements SQL executados e, ao final:
+
+- avisa quando um mesmo formato de statement se repete ``query_repeat_threshold``
+  vezes ou mais (padrão típico de N+1 por lazy loading de relacionamentos);
+- avisa quando a requisição passa do orçamento ``query_budget``; com
+  ``query_budget_strict`` a requisição falha com ``QueryBudgetExceeded``, o
+  que derruba o teste que a executou via ``TestClient``.
+
+Queries mais lentas que ``slow_query_ms`` são registradas no log com a rota.
+
+Nos testes, ``capture_requests()`` coleta os relatórios das requisições feitas
+dentro do bloco e ``assert_max_queries(n)`` falha se alguma passar de ``n``.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Listas de parâmetros (IN (?, ?, ?), VALUES (...)) viram "(?)" para que lotes
+# de tamanhos diferentes tenham o mesmo formato
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """Uma requisição executou mais statements SQL do que o orçamento permite."""
+
+
+class QueryReport:
+    """Statements SQL executados em uma requisição (ou bloco inspecionado)."""
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.statements = []
+
+    @property
+    def route(self) -> str:
+        route = (self.scope or {}).get("route")
+        return getattr(route, "path", None) or "-"
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> list:
+        """Formatos de statement que se repetiram ``threshold`` vezes ou mais."""
+        counts = Counter(shape for shape, _ in self.statements)
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+    def describe(self) -> str:
+        lines = [f"{self.count} queries em {self.route}:"]
+        for shape, n in Counter(shape for shape, _ in self.statements).most_common():
+            lines.append(f"  {n}x {shape}")
+        return "\n".join(lines)
+
+
+_current_report: ContextVar = ContextVar("current_query_report", default=None)
+_captures = []
+
+
+def normalize(statement: str) -> str:
+    """Reduz um statement ao seu formato (sem listas de parâmetros e espaços extras)."""
+    return _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inspector_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["inspector_start_time"].pop()
+    report = _current_report.get()
+    shape = normalize(statement)
+    if report is not None:
+        report.statements.append((shape, elapsed))
+    if elapsed * 1000 >= settings.slow_query_ms:
+        route = report.route if report is not None else "-"
+        logger.warning("🐢 Query lenta (%.1f ms) em %s: %s", elapsed * 1000, route, shape)
+
+
+def instrument_engine(engine) -> None:
+    """Registra os eventos de inspeção em uma engine (síncrona)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def check_report(report: QueryReport) -> None:
+    """Registra suspeitas de N+1 e aplica o orçamento de queries."""
+    for shape, n in report.repeated(settings.query_repeat_threshold):
+        logger.warning("🔁 Possível N+1 em %s: %dx %s", report.route, n, shape)
+
+    budget = settings.query_budget
+    if budget and report.count > budget:
+        message = f"Orçamento de {budget} queries excedido.\n{report.describe()}"
+        if settings.query_budget_strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning("💸 %s", message)
+
+
+@contextmanager
+def inspect_queries():
+    """Inspeciona os statements executados no contexto atual (mesma thread/task)."""
+    report = QueryReport()
+    token = _current_report.set(report)
+    try:
+        yield report
+    finally:
+        _current_report.reset(token)
+
+
+@contextmanager
+def capture_requests():
+    """Coleta os relatórios das requisições concluídas dentro do bloco."""
+    reports = []
+    _captures.append(reports)
+    try:
+        yield reports
+    finally:
+        _captures.remove(reports)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Falha (AssertionError) se alguma requisição do bloco passar de ``max_queries``."""
+    with capture_requests() as reports:
+        yield reports
+    for report in reports:
+        if report.count > max_queries:
+            raise AssertionError(f"Esperado no máximo {max_queries} queries.\n{report.describe()}")
+
+
+class QueryInspectorMiddleware:
+    """Middleware ASGI que associa os statements SQL à requisição corrente."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        report = QueryReport(scope)
+        token = _current_report.set(report)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_report.reset(token)
+            for reports in _captures:
+                reports.append(report)
+        check_report(report)
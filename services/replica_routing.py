@@ -0,0 +1,83 @@
+"""
+Read-your-writes para o roteamento de leituras em réplicas.
+
+Depois de uma escrita bem-sucedida (POST/PUT/PATCH/DELETE com status < 400),
+o token que a fez passa a ler do primário por ``settings.read_your_writes_seconds``,
+tempo suficiente para a réplica alcançar o primário. Assim o cliente sempre
+enxerga o que acabou de gravar, mesmo com lag de replicação.
+
+O registro é por processo: com vários workers, só o worker que atendeu a
+escrita sabe dela (use sticky sessions ou um TTL maior que o lag esperado).
+"""
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from config import settings
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _key(authorization: Optional[str]) -> Optional[str]:
+    # Guarda só o hash do cabeçalho, nunca o token em si
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+class RecentWriters:
+    """Tokens que escreveram recentemente, com expiração."""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def mark(self, authorization: Optional[str]) -> None:
+        key = _key(authorization)
+        if key is None or self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._expires) >= self.max_size:
+                self._expires = {k: exp for k, exp in self._expires.items() if exp > now}
+            self._expires[key] = now + self.ttl_seconds
+
+    def wrote_recently(self, authorization: Optional[str]) -> bool:
+        key = _key(authorization)
+        if key is None:
+            return False
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._expires[key]
+                return False
+            return True
+
+
+recent_writers = RecentWriters(ttl_seconds=settings.read_your_writes_seconds)
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que registra os tokens que concluíram uma escrita."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                authorization = headers.get(b"authorization")
+                recent_writers.mark(authorization.decode("latin-1") if authorization else None)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
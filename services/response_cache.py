@@ -0,0 +1,218 @@
+"""
+Cache de respostas para dados de referência (clínicas e veterinários) e
+para os agregados ``/full`` (clínica com corpo clínico, tutor com pets e
+atendimentos).
+
+As rotas de leitura guardam o corpo JSON já serializado (com ETag e
+cabeçalhos como ``X-Next-Cursor``), indexado pela rota + query string. Um
+acerto devolve os bytes prontos, sem consultar o banco nem serializar.
+
+A invalidação é por namespace (``clinicas``, ``veterinarios``, ``tutores``): cada namespace
+tem um contador de geração que faz parte da chave, e os handlers de escrita
+apenas o incrementam. As entradas antigas deixam de ser alcançáveis e somem
+por LRU/TTL, sem varrer chaves.
+
+As rotas em cache leem do primário (``get_db``) no miss: uma réplica ainda
+sem a escrita gravaria a versão antiga na geração nova, e ela seria servida
+a todos os clientes até expirar. Os acertos não vão ao banco.
+
+Backends (``settings.response_cache_backend``):
+
+- ``memory``: LRU com TTL no próprio processo. Com vários workers a
+  invalidação é local; os demais workers podem servir a versão anterior por
+  até ``response_cache_ttl_seconds``.
+- ``redis``: compartilhado entre workers (requer o pacote ``redis``).
+- ``none``: desabilitado.
+
+``FakeRedis`` implementa o subconjunto de comandos usado, para testes sem um
+servidor Redis.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from api import etag
+from config import settings
+from services import metrics
+
+
+class MemoryBackend:
+    """LRU com TTL em memória; as gerações ficam fora do LRU (nunca expiram)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    async def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class FakeRedis:
+    """Subconjunto assíncrono da API do redis-py (get/set com ex/incr) em memória."""
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode()
+        self._data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def incr(self, key):
+        value = int((await self.get(key)) or 0) + 1
+        self._data[key] = (str(value).encode(), None)
+        return value
+
+
+class RedisBackend:
+    """Backend compartilhado entre workers sobre um cliente Redis assíncrono."""
+
+    def __init__(self, client, prefix: str = "veterinaria:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl_seconds)
+
+    async def generation(self, namespace: str) -> int:
+        return int(await self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    async def bump(self, namespace: str) -> None:
+        await self.client.incr(f"{self.prefix}gen:{namespace}")
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def create_backend():
+    """Cria o backend configurado (None desabilita o cache)."""
+    if settings.response_cache_backend == "memory":
+        return MemoryBackend(settings.response_cache_max_entries)
+    if settings.response_cache_backend == "redis":
+        import redis.asyncio as redis
+
+        return RedisBackend(redis.Redis.from_url(settings.redis_url))
+    return None
+
+
+class ResponseCache:
+    """Cache de respostas JSON por namespace, com contadores de acerto."""
+
+    def __init__(self, backend, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl_seconds > 0
+
+    async def _key(self, namespace: str, request: Request) -> str:
+        generation = await self.backend.generation(namespace)
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        return f"{namespace}:{generation}:{request.url.path}?{query}"
+
+    async def lookup(self, namespace: str, request: Request) -> Optional[Response]:
+        """Resposta em cache para a requisição (304 se o ETag casar) ou None."""
+        if not self.enabled:
+            return None
+        # A chave (com a geração lida agora) é reaproveitada por respond(): se
+        # uma escrita invalidar o namespace durante a consulta ao banco, o
+        # resultado fica na geração antiga em vez de mascarar a nova
+        key = request.state.response_cache_key = await self._key(namespace, request)
+        cached = await self.backend.get(key)
+        if cached is None:
+            self.misses += 1
+            metrics.RESPONSE_CACHE.labels(namespace, "miss").inc()
+            return None
+        self.hits += 1
+        metrics.RESPONSE_CACHE.labels(namespace, "hit").inc()
+        entry = json.loads(cached)
+        headers = {**entry["headers"], "X-Cache": "HIT"}
+        if etag.not_modified(request, headers["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+    async def respond(self, namespace: str, request: Request, response: Response, payload, serializer, versioned=None) -> Response:
+        """
+        Serializa o payload (``api.fast_json``), guarda no cache e responde.
+        ``versioned`` são as linhas que compõem o ETag (padrão: o próprio
+        payload; em respostas aninhadas, inclua as linhas filhas).
+        """
+        body = serializer(payload)
+        headers = {**response.headers, "etag": etag.compute_etag(payload if versioned is None else versioned)}
+        key = getattr(request.state, "response_cache_key", None)
+        if self.enabled and key is not None:
+            entry = json.dumps({"headers": headers, "body": body.decode()})
+            await self.backend.set(key, entry.encode(), self.ttl_seconds)
+        headers["X-Cache"] = "MISS"
+        if etag.not_modified(request, headers["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """Descarta as respostas dos namespaces (chamado pelos handlers de escrita)."""
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            await self.backend.bump(namespace)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "size": self.backend.size() if self.backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+response_cache = ResponseCache(create_backend(), settings.response_cache_ttl_seconds)
@@ -0,0 +1,95 @@
+"""
+Fixtures dos testes: aplicação sobre um SQLite temporário, recriado a cada
+teste, com os caches em memória zerados.
+"""
+import os
+import shutil
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="veterinaria-tests-")
+# Antes de importar a aplicação: as configurações são lidas no import
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["ARCHIVE_DIR"] = f"{_TMP}/archive"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["RESPONSE_CACHE_BACKEND"] = "memory"
+os.environ["QUERY_INSPECTION_ENABLED"] = "true"
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from config import settings
+from database import Base, SessionLocal, engine
+from models import models
+from services.agenda_index import agenda_index
+from services.auth import get_password_hash
+from services.principal_cache import principal_cache
+from services.response_cache import MemoryBackend, response_cache
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Banco vazio e caches zerados em cada teste."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    shutil.rmtree(settings.archive_dir, ignore_errors=True)
+    principal_cache.clear()
+    agenda_index.clear()
+    response_cache.backend = MemoryBackend(settings.response_cache_max_entries)
+    yield engine
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def auth_headers(client, db):
+    db.add(models.Usuario(username="admin", email="admin@example.com", hashed_password=get_password_hash("admin123")))
+    db.commit()
+    response = client.post("/api/auth/token", data={"username": "admin", "password": "admin123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _create(client, headers, path, payload):
+    response = client.post(path, json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def clinica(client, auth_headers):
+    return _create(client, auth_headers, "/api/clinicas/", {"nome": "Clínica Centro", "cidade": "Recife", "endereco": "Rua A"})
+
+
+@pytest.fixture
+def veterinario(client, auth_headers, clinica):
+    return _create(client, auth_headers, "/api/veterinarios/", {"nome": "Dra. Ana", "crmv": "PE-1", "clinica_id": clinica["id"]})
+
+
+@pytest.fixture
+def tutor(client, auth_headers):
+    return _create(client, auth_headers, "/api/tutores/", {"nome": "Bruno", "telefone": "81 9999-0000", "email": "bruno@example.com"})
+
+
+@pytest.fixture
+def pet(client, auth_headers, tutor):
+    return _create(client, auth_headers, "/api/pets/", {"nome": "Mia", "especie": "gato", "tutor_id": tutor["id"]})
+
+
+@pytest.fixture
+def create(client, auth_headers):
+    """POST autenticado que exige 201 e devolve o JSON criado."""
+    return lambda path, payload: _create(client, auth_headers, path, payload)
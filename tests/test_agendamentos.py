@@ -0,0 +1,83 @@
+import datetime
+
+from crud import agendamento as agendamento_crud
+
+DIA = datetime.date.today() + datetime.timedelta(days=7)
+
+
+def _at(hour, minute=0, tz=""):
+    return f"{DIA.isoformat()}T{hour:02d}:{minute:02d}:00{tz}"
+
+
+def _reserve(client, auth_headers, veterinario, inicio, fim):
+    return client.post(
+        "/api/agendamentos/", json={"inicio": inicio, "fim": fim, "veterinario_id": veterinario["id"]}, headers=auth_headers
+    )
+
+
+def _livres(client, auth_headers, veterinario):
+    response = client.get(
+        f"/api/veterinarios/{veterinario['id']}/availability",
+        params={"data_inicio": DIA.isoformat(), "data_fim": (DIA + datetime.timedelta(days=1)).isoformat()},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    return [slot["inicio"] for slot in response.json()]
+
+
+def test_overlapping_slot_returns_409(client, auth_headers, veterinario):
+    assert _reserve(client, auth_headers, veterinario, _at(10), _at(11)).status_code == 201
+
+    response = _reserve(client, auth_headers, veterinario, _at(10, 30), _at(11, 30))
+    assert response.status_code == 409
+
+
+def test_adjacent_slots_are_allowed(client, auth_headers, veterinario):
+    assert _reserve(client, auth_headers, veterinario, _at(10), _at(11)).status_code == 201
+    assert _reserve(client, auth_headers, veterinario, _at(11), _at(12)).status_code == 201
+    assert _reserve(client, auth_headers, veterinario, _at(9), _at(10)).status_code == 201
+
+
+def test_other_veterinario_is_not_blocked(client, auth_headers, create, clinica, veterinario):
+    outro = create("/api/veterinarios/", {"nome": "Dr. Caio", "crmv": "PE-2", "clinica_id": clinica["id"]})
+    assert _reserve(client, auth_headers, veterinario, _at(10), _at(11)).status_code == 201
+    assert _reserve(client, auth_headers, outro, _at(10), _at(11)).status_code == 201
+
+
+def test_timezone_is_normalized_to_utc(client, auth_headers, veterinario):
+    response = _reserve(client, auth_headers, veterinario, _at(10, tz="-03:00"), _at(11, tz="-03:00"))
+    assert response.status_code == 201
+    assert response.json()["inicio"] == _at(13)
+
+    assert _reserve(client, auth_headers, veterinario, _at(13, 30, "Z"), _at(14, tz="Z")).status_code == 409
+    assert _reserve(client, auth_headers, veterinario, _at(11, tz="-03:00"), _at(12, tz="-03:00")).status_code == 201
+
+
+def test_fim_before_inicio_returns_422(client, auth_headers, veterinario):
+    assert _reserve(client, auth_headers, veterinario, _at(11), _at(10)).status_code == 422
+
+
+def test_availability_excludes_booked_slot_until_deleted(client, auth_headers, veterinario):
+    assert _at(9) in _livres(client, auth_headers, veterinario)
+    agendamento = _reserve(client, auth_headers, veterinario, _at(9), _at(10)).json()
+
+    livres = _livres(client, auth_headers, veterinario)
+    assert _at(9) not in livres and _at(9, 30) not in livres
+    assert _at(8, 30) in livres and _at(10) in livres
+
+    assert client.delete(f"/api/agendamentos/{agendamento['id']}", headers=auth_headers).status_code == 200
+    assert _at(9) in _livres(client, auth_headers, veterinario)
+    assert _reserve(client, auth_headers, veterinario, _at(9), _at(10)).status_code == 201
+
+
+def test_availability_skips_slots_that_already_started(db, veterinario):
+    agora = datetime.datetime.combine(DIA, datetime.time(9, 10))
+    livres = agendamento_crud.disponibilidade(
+        db, veterinario["id"], DIA, DIA + datetime.timedelta(days=1), 30, agora=agora
+    )
+    assert livres[0]["inicio"] == datetime.datetime.combine(DIA, datetime.time(9, 30))
+
+    depois = agendamento_crud.disponibilidade(
+        db, veterinario["id"], DIA, DIA + datetime.timedelta(days=1), 30, agora=agora + datetime.timedelta(days=1)
+    )
+    assert depois == []
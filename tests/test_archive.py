@@ -0,0 +1,101 @@
+import datetime
+import json
+
+import pytest
+
+from database import engine
+from models import models
+from services import atendimento_archive
+
+OLD = datetime.datetime(2020, 1, 10, 9, 0)
+CUTOFF = datetime.datetime(2020, 3, 1)
+
+
+@pytest.fixture
+def old_atendimentos(db, pet, veterinario):
+    rows = [
+        models.Atendimento(data=OLD + datetime.timedelta(days=day * 20), descricao=f"Antigo {day}",
+                           pet_id=pet["id"], veterinario_id=veterinario["id"])
+        for day in range(3)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [row.id for row in rows]
+
+
+def test_archived_atendimento_is_read_through_by_id(client, auth_headers, old_atendimentos):
+    etag = client.get(f"/api/atendimentos/{old_atendimentos[0]}", headers=auth_headers).headers["ETag"]
+    entries = atendimento_archive.archive_before(engine, CUTOFF)
+    assert sum(entry["count"] for entry in entries) == 3
+
+    response = client.get(f"/api/atendimentos/{old_atendimentos[0]}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["descricao"] == "Antigo 0"
+    assert response.headers["ETag"] == etag
+
+
+def test_pet_history_merges_archive_and_table(client, auth_headers, create, pet, veterinario, old_atendimentos):
+    atendimento_archive.archive_before(engine, CUTOFF)
+    recent = create("/api/atendimentos/", {"descricao": "Recente", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+
+    response = client.get(f"/api/atendimentos/?pet_id={pet['id']}", headers=auth_headers)
+    assert [row["id"] for row in response.json()] == [*old_atendimentos, recent["id"]]
+
+    response = client.get(f"/api/atendimentos/?pet_id={pet['id']}&skip=2&limit=2", headers=auth_headers)
+    assert [row["id"] for row in response.json()] == [old_atendimentos[2], recent["id"]]
+
+
+def test_archived_atendimento_is_read_only(client, auth_headers, old_atendimentos):
+    atendimento_archive.archive_before(engine, CUTOFF)
+    response = client.put(f"/api/atendimentos/{old_atendimentos[0]}", json={"descricao": "X"}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_row_moved_into_the_month_during_export_stays_in_table(db, monkeypatch, pet, veterinario):
+    def atendimento(data, descricao):
+        return models.Atendimento(data=data, descricao=descricao, pet_id=pet["id"], veterinario_id=veterinario["id"])
+
+    moved = atendimento(datetime.datetime(2024, 1, 1), "Movido")
+    db.add(moved)
+    db.commit()
+    db.add_all([atendimento(OLD, "Antigo 0"), atendimento(OLD + datetime.timedelta(days=1), "Antigo 1")])
+    db.commit()
+    write_month = atendimento_archive._write_month
+
+    def racing(month, rows):
+        # Outra transação move para o mês uma linha de id menor depois da leitura
+        entry = write_month(month, rows)
+        with engine.begin() as conn:
+            conn.execute(models.Atendimento.__table__.update().where(models.Atendimento.id == moved.id).values(data=OLD))
+        return entry
+
+    monkeypatch.setattr(atendimento_archive, "_write_month", racing)
+    entries = atendimento_archive.archive_before(engine, CUTOFF)
+
+    assert sum(entry["count"] for entry in entries) == 2
+    db.expire_all()
+    assert [row.descricao for row in db.query(models.Atendimento)] == ["Movido"]
+
+
+def test_export_includes_archived_atendimentos(client, auth_headers, create, pet, veterinario, old_atendimentos):
+    atendimento_archive.archive_before(engine, CUTOFF)
+    recent = create("/api/atendimentos/", {"descricao": "Recente", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+
+    response = client.get(f"/api/atendimentos/export?pet_id={pet['id']}", headers=auth_headers)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [*old_atendimentos, recent["id"]]
+    assert rows[0]["data"] == OLD.isoformat()
+
+    response = client.get("/api/atendimentos/export?data_fim=2020-02-01T00:00:00", headers=auth_headers)
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == old_atendimentos[:2]
+
+
+def test_analytics_counts_include_archived_atendimentos(client, auth_headers, create, pet, veterinario, old_atendimentos):
+    atendimento_archive.archive_before(engine, CUTOFF)
+    create("/api/atendimentos/", {"descricao": "Recente", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+
+    response = client.get("/api/analytics/atendimentos?group_by=especie", headers=auth_headers)
+    assert response.json() == [{"grupo": "gato", "periodo": None, "total": 4}]
+
+    response = client.get("/api/analytics/atendimentos?bucket=mes&data_fim=2020-03-01T00:00:00", headers=auth_headers)
+    assert [(row["periodo"], row["total"]) for row in response.json()] == [("2020-01-01", 2), ("2020-02-01", 1)]
@@ -0,0 +1,82 @@
+"""
+Smoke test do modo ``ASYNC_DATABASE=true`` (AsyncSession + ``run_sync``) sobre
+``sqlite+aiosqlite``. As dependências (get_db/get_read_db) são escolhidas no
+import, então o cenário roda num interpretador novo com o ambiente ajustado.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIO = textwrap.dedent(
+    """
+    from fastapi.testclient import TestClient
+
+    import database
+    import main
+    from database import Base, SessionLocal, engine
+    from models import models
+    from services.auth import get_password_hash
+
+    assert database.get_db is database.get_async_db
+    assert database.get_read_db is database.get_async_read_db
+    assert str(database.async_engine.url).startswith("sqlite+aiosqlite://")
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add(models.Usuario(username="admin", email="admin@example.com", hashed_password=get_password_hash("admin123")))
+        db.commit()
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/token", data={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post("/api/tutores/", json={"nome": "Bruno", "telefone": "81 9999-0000"}, headers=headers)
+        assert response.status_code == 201, response.text
+        tutor = response.json()
+
+        response = client.post("/api/pets/", json={"nome": "Mia", "especie": "gato", "tutor_id": tutor["id"]}, headers=headers)
+        assert response.status_code == 201, response.text
+        pet = response.json()
+
+        response = client.get(f"/api/pets/{pet['id']}", headers=headers)
+        assert response.status_code == 200, response.text
+        assert response.json()["nome"] == "Mia"
+
+        response = client.put(f"/api/tutores/{tutor['id']}", json={"nome": "Bruno Lima"}, headers=headers)
+        assert response.status_code == 200, response.text
+
+        response = client.get("/api/tutores/", headers=headers)
+        assert response.status_code == 200, response.text
+        assert [t["nome"] for t in response.json()] == ["Bruno Lima"]
+
+        response = client.get("/api/pets/", params={"tutor_id": tutor["id"]}, headers=headers)
+        assert response.status_code == 200, response.text
+        assert [p["id"] for p in response.json()] == [pet["id"]]
+
+    print("ok")
+    """
+)
+
+
+def test_crud_smoke_with_async_sessions(tmp_path):
+    env = {
+        **os.environ,
+        "ASYNC_DATABASE": "true",
+        "DATABASE_URL": f"sqlite:///{tmp_path}/async.db",
+        "ARCHIVE_DIR": f"{tmp_path}/archive",
+        "PASSWORD_HASH_WORKERS": "0",
+        "RESPONSE_CACHE_BACKEND": "memory",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", SCENARIO], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
@@ -0,0 +1,67 @@
+import pytest
+
+from config import settings
+
+
+def _bulk(client, auth_headers, path, payload):
+    return client.post(path, json=payload, headers=auth_headers)
+
+
+def test_pets_bulk_reports_invalid_items_by_index(client, auth_headers, tutor):
+    payload = [
+        {"nome": "Rex", "especie": "cão", "tutor_id": tutor["id"]},
+        {"nome": "Órfão", "especie": "cão", "tutor_id": 999},
+        {"nome": "Mia", "especie": "gato", "tutor_id": tutor["id"]},
+    ]
+    response = _bulk(client, auth_headers, "/api/pets/bulk", payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert [pet["nome"] for pet in body["created"]] == ["Rex", "Mia"]
+    assert [error["index"] for error in body["errors"]] == [1]
+    assert "999" in body["errors"][0]["detail"]
+
+
+def test_atendimentos_bulk_reports_each_missing_reference(client, auth_headers, pet, veterinario):
+    payload = [
+        {"descricao": "A", "pet_id": 999, "veterinario_id": veterinario["id"]},
+        {"descricao": "B", "pet_id": pet["id"], "veterinario_id": veterinario["id"]},
+        {"descricao": "C", "pet_id": pet["id"], "veterinario_id": 999},
+    ]
+    body = _bulk(client, auth_headers, "/api/atendimentos/bulk", payload).json()
+    assert [atendimento["descricao"] for atendimento in body["created"]] == ["B"]
+    assert [(error["index"], "Pet" in error["detail"]) for error in body["errors"]] == [(0, True), (2, False)]
+
+
+def test_tutores_bulk_rejects_emails_taken_or_repeated(client, auth_headers, tutor):
+    payload = [
+        {"nome": "Já existe", "telefone": "1", "email": tutor["email"]},
+        {"nome": "Caio", "telefone": "2", "email": "caio@example.com"},
+        {"nome": "Repetido", "telefone": "3", "email": "caio@example.com"},
+    ]
+    body = _bulk(client, auth_headers, "/api/tutores/bulk", payload).json()
+    assert [created["nome"] for created in body["created"]] == ["Caio"]
+    assert [error["index"] for error in body["errors"]] == [0, 2]
+
+
+def test_all_invalid_batch_creates_nothing(client, auth_headers):
+    body = _bulk(client, auth_headers, "/api/pets/bulk", [{"nome": "X", "especie": "cão", "tutor_id": 999}]).json()
+    assert body == {"created": [], "errors": [{"index": 0, "detail": "Tutor com id 999 não encontrado."}]}
+
+
+@pytest.mark.parametrize("path", ["/api/pets/bulk", "/api/tutores/bulk", "/api/atendimentos/bulk"])
+def test_batch_size_limits(client, auth_headers, monkeypatch, path):
+    assert _bulk(client, auth_headers, path, []).status_code == 422
+
+    monkeypatch.setattr(settings, "bulk_max_items", 2)
+    item = {"nome": "X", "especie": "cão", "tutor_id": 1, "telefone": "1", "descricao": "X", "pet_id": 1, "veterinario_id": 1}
+    assert _bulk(client, auth_headers, path, [item] * 3).status_code == 413
+
+
+def test_created_rows_follow_input_order(client, auth_headers, tutor):
+    names = [f"Pet {i:02d}" for i in reversed(range(25))]
+    payload = [{"nome": name, "especie": "cão", "tutor_id": tutor["id"]} for name in names]
+    created = _bulk(client, auth_headers, "/api/pets/bulk", payload).json()["created"]
+
+    assert [pet["nome"] for pet in created] == names
+    for pet in created[::6]:
+        assert client.get(f"/api/pets/{pet['id']}", headers=auth_headers).json()["nome"] == pet["nome"]
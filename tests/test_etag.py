@@ -0,0 +1,89 @@
+import pytest
+
+
+def test_get_returns_etag_and_if_none_match_gives_304(client, auth_headers, pet):
+    response = client.get(f"/api/pets/{pet['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/api/pets/{pet['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_put_with_current_if_match_updates_and_returns_new_etag(client, auth_headers, pet):
+    etag = client.get(f"/api/pets/{pet['id']}", headers=auth_headers).headers["ETag"]
+
+    response = client.put(
+        f"/api/pets/{pet['id']}", json={"nome": "Mia II", "especie": "gato"}, headers={**auth_headers, "If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["nome"] == "Mia II"
+    assert response.headers["ETag"] != etag
+
+
+def test_put_with_stale_if_match_returns_412_and_keeps_row(client, auth_headers, pet):
+    stale = client.get(f"/api/pets/{pet['id']}", headers=auth_headers).headers["ETag"]
+    client.put(f"/api/pets/{pet['id']}", json={"nome": "Outra", "especie": "gato"}, headers=auth_headers)
+
+    response = client.put(
+        f"/api/pets/{pet['id']}", json={"nome": "Perdida", "especie": "gato"}, headers={**auth_headers, "If-Match": stale}
+    )
+    assert response.status_code == 412
+    assert client.get(f"/api/pets/{pet['id']}", headers=auth_headers).json()["nome"] == "Outra"
+
+
+def test_weak_etag_never_satisfies_if_match(client, auth_headers, tutor):
+    etag = client.get(f"/api/tutores/{tutor['id']}", headers=auth_headers).headers["ETag"]
+    response = client.put(
+        f"/api/tutores/{tutor['id']}",
+        json={"nome": "Bruno", "telefone": "1", "email": "bruno@example.com"},
+        headers={**auth_headers, "If-Match": f"W/{etag}"},
+    )
+    assert response.status_code == 412
+
+
+@pytest.mark.parametrize("path,payload", [
+    ("/api/clinicas/{id}", {"nome": "X", "cidade": "Y", "endereco": "Z"}),
+    ("/api/veterinarios/{id}", {"nome": "X", "crmv": "PE-1", "clinica_id": 1}),
+])
+def test_if_match_on_missing_resource_returns_404(client, auth_headers, path, payload):
+    response = client.put(path.format(id=999), json=payload, headers={**auth_headers, "If-Match": '"x"'})
+    assert response.status_code == 404
+
+
+def test_clinica_put_with_stale_if_match_returns_412(client, auth_headers, clinica):
+    response = client.put(
+        f"/api/clinicas/{clinica['id']}",
+        json={"nome": "Nova", "cidade": "Recife", "endereco": "Rua B"},
+        headers={**auth_headers, "If-Match": '"desatualizado"'},
+    )
+    assert response.status_code == 412
+
+
+def test_tutor_full_returns_etag_and_if_none_match_gives_304(client, auth_headers, tutor, pet):
+    response = client.get(f"/api/tutores/{tutor['id']}/full", headers=auth_headers)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["pets"]] == [pet["id"]]
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/api/tutores/{tutor['id']}/full", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("write", ["pet", "atendimento"])
+def test_tutor_full_changes_after_pet_or_atendimento_write(client, auth_headers, create, tutor, pet, veterinario, write):
+    etag = client.get(f"/api/tutores/{tutor['id']}/full", headers=auth_headers).headers["ETag"]
+    if write == "pet":
+        client.put(f"/api/pets/{pet['id']}", json={"nome": "Mia II", "especie": "gato"}, headers=auth_headers)
+    else:
+        create("/api/atendimentos/", {"descricao": "Consulta", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+
+    response = client.get(f"/api/tutores/{tutor['id']}/full", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    pet_full = response.json()["pets"][0]
+    if write == "pet":
+        assert pet_full["nome"] == "Mia II"
+    else:
+        assert len(pet_full["atendimentos"]) == 1
@@ -0,0 +1,64 @@
+"""
+O caminho rápido das listagens (``fast_json.RowSerializer``) tem de produzir o
+mesmo JSON que o ``response_model`` produziria para as mesmas linhas.
+"""
+import json
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from api import fast_json
+from crud import (
+    atendimento as atendimento_crud, clinica as clinica_crud, pet as pet_crud,
+    tutor as tutor_crud, veterinario as veterinario_crud,
+)
+from models import models
+from schemas import (
+    atendimento as atendimento_schema, clinica as clinica_schema, pet as pet_schema,
+    tutor as tutor_schema, veterinario as veterinario_schema,
+)
+
+ROUTES = [
+    (clinica_schema.Clinica, clinica_crud.get_clinicas_rows),
+    (veterinario_schema.Veterinario, veterinario_crud.get_veterinarios_rows),
+    (tutor_schema.Tutor, tutor_crud.get_tutores_rows),
+    (pet_schema.Pet, pet_crud.get_pets_rows),
+    (atendimento_schema.Atendimento, atendimento_crud.get_atendimentos_rows),
+]
+
+
+def _validated(schema, rows):
+    adapter = TypeAdapter(List[schema])
+    return adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+
+
+@pytest.fixture
+def rows(db, create, pet, veterinario):
+    create("/api/atendimentos/", {"descricao": "Consulta", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+    # Carga direta no banco: e-mail fora da forma normalizada pelo EmailStr
+    db.add(models.Tutor(nome="Caio", telefone="2", email="Caio@EXAMPLE.com"))
+    db.commit()
+
+
+@pytest.mark.parametrize("schema,get_rows", ROUTES, ids=[schema.__name__ for schema, _ in ROUTES])
+def test_row_serializer_matches_response_model(db, rows, schema, get_rows):
+    result = get_rows(db)
+    assert result
+    assert json.loads(fast_json.RowSerializer(schema)(result)) == _validated(schema, result)
+
+
+def test_email_is_normalized_like_the_detail_route(client, auth_headers, rows):
+    emails = [tutor["email"] for tutor in client.get("/api/tutores/", headers=auth_headers).json()]
+    assert "Caio@example.com" in emails
+
+
+def test_null_in_required_field_fails_like_the_response_model(db, tutor):
+    db.add(models.Pet(nome="Sem espécie", tutor_id=tutor["id"]))
+    db.commit()
+    result = pet_crud.get_pets_rows(db)
+
+    with pytest.raises(ValidationError):
+        _validated(pet_schema.Pet, result)
+    with pytest.raises(ValidationError):
+        fast_json.RowSerializer(pet_schema.Pet)(result)
@@ -0,0 +1,46 @@
+import base64
+
+import pytest
+
+from api.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def pets(create, tutor):
+    return [create("/api/pets/", {"nome": f"Pet {i}", "especie": "cão", "tutor_id": tutor["id"]})["id"] for i in range(10)]
+
+
+@pytest.mark.parametrize("limit", [3, 5])
+def test_cursor_walks_list_to_the_end(client, auth_headers, pets, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/pets/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = [pet["id"] for pet in response.json()]
+        seen.extend(page)
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            assert len(page) < limit
+            break
+        assert len(page) == limit
+    assert seen == sorted(pets)
+    assert pages == len(pets) // limit + 1
+
+
+def test_cursor_ignores_skip(client, auth_headers, pets):
+    cursor = client.get("/api/pets/", params={"limit": 3}, headers=auth_headers).headers[NEXT_CURSOR_HEADER]
+    response = client.get("/api/pets/", params={"limit": 3, "skip": 5, "cursor": cursor}, headers=auth_headers)
+    assert [pet["id"] for pet in response.json()] == sorted(pets)[3:6]
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",
+    base64.urlsafe_b64encode(b"nao e json").decode(),
+    base64.urlsafe_b64encode(b"[1]").decode(),
+    base64.urlsafe_b64encode(b'{"id":"x"}').decode(),
+])
+def test_malformed_cursor_returns_400(client, auth_headers, pets, cursor):
+    response = client.get("/api/pets/", params={"cursor": cursor}, headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,20 @@
+from prometheus_client import REGISTRY
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_login_records_password_hash_metrics(client, auth_headers):
+    before = _sample("password_hash_duration_seconds_count", operation="verify")
+    response = client.post("/api/auth/token", data={"username": "admin", "password": "admin123"})
+    assert response.status_code == 200
+    assert _sample("password_hash_duration_seconds_count", operation="verify") == before + 1
+    assert _sample("password_hash_queue_depth") == 0
+
+
+def test_metrics_endpoint_exposes_password_hash_series(client, auth_headers):
+    body = client.get("/metrics").text
+    assert "password_hash_duration_seconds_bucket" in body
+    assert "password_hash_queue_depth" in body
+    assert "password_hash_rejected_total" in body
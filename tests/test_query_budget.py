@@ -0,0 +1,91 @@
+"""
+Orçamento de queries por rota (services/query_inspector.py): o número de
+statements das listagens, dos agregados /full e do bulk não pode crescer com
+a quantidade de linhas (N+1).
+"""
+import pytest
+
+from config import settings
+from database import engine
+from services.query_inspector import QueryBudgetExceeded, assert_max_queries, capture_requests
+
+# Autenticação (principal fora do cache) + consulta(s) da rota
+LIST_BUDGET = 2
+
+
+@pytest.fixture
+def populated(create, clinica, tutor):
+    veterinarios = [
+        create("/api/veterinarios/", {"nome": f"Vet {i}", "crmv": f"CRMV-{i}", "clinica_id": clinica["id"]})
+        for i in range(10)
+    ]
+    pets = [create("/api/pets/", {"nome": f"Pet {i}", "especie": "cao", "tutor_id": tutor["id"]}) for i in range(10)]
+    for pet in pets:
+        for veterinario in veterinarios[:3]:
+            create("/api/atendimentos/", {"descricao": "consulta", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+    return {"clinica": clinica, "tutor": tutor, "pets": pets, "veterinarios": veterinarios}
+
+
+@pytest.mark.parametrize("path", ["/api/pets/", "/api/atendimentos/", "/api/veterinarios/", "/api/clinicas/", "/api/tutores/"])
+def test_list_routes_stay_within_budget(client, auth_headers, populated, path):
+    with assert_max_queries(LIST_BUDGET) as reports:
+        response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) >= 1
+    assert len(reports) == 1
+
+
+def test_tutor_full_loads_children_in_constant_queries(client, auth_headers, populated):
+    # tutor + pets (IN) + atendimentos (IN), independente de 10 pets x 3 atendimentos
+    with assert_max_queries(LIST_BUDGET + 2):
+        response = client.get(f"/api/tutores/{populated['tutor']['id']}/full", headers=auth_headers)
+    assert response.status_code == 200
+    assert sum(len(pet["atendimentos"]) for pet in response.json()["pets"]) == 30
+
+
+def test_clinica_full_loads_veterinarios_in_constant_queries(client, auth_headers, populated):
+    with assert_max_queries(LIST_BUDGET + 1):
+        response = client.get(f"/api/clinicas/{populated['clinica']['id']}/full", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()["veterinarios"]) == 10
+
+
+def _insert_statements(rows: int) -> int:
+    # No PostgreSQL o INSERT ... RETURNING ordenado sai em um único statement;
+    # no SQLite o SQLAlchemy não tem como ordenar o RETURNING de um lote e
+    # insere linha a linha (na mesma transação)
+    return 1 if engine.dialect.name == "postgresql" else rows
+
+
+def test_bulk_validates_and_updates_stats_in_constant_queries(client, auth_headers, populated):
+    pet, veterinario = populated["pets"][0], populated["veterinarios"][0]
+    payload = [{"descricao": "lote", "pet_id": pet["id"], "veterinario_id": veterinario["id"]}] * 50
+    payload.append({"descricao": "lote", "pet_id": 999, "veterinario_id": veterinario["id"]})
+
+    # pets IN + veterinários IN + rollup das estatísticas + INSERT(s)
+    with assert_max_queries(LIST_BUDGET + 2 + _insert_statements(50)) as reports:
+        response = client.post("/api/atendimentos/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 50
+    assert [error["index"] for error in response.json()["errors"]] == [50]
+    assert not [shape for shape, n in reports[0].repeated(2) if not shape.startswith("INSERT INTO atendimentos")]
+
+
+def test_assert_max_queries_fails_when_route_exceeds_budget(client, auth_headers, populated):
+    with pytest.raises(AssertionError, match="no máximo 1 queries"):
+        with assert_max_queries(1):
+            client.get(f"/api/tutores/{populated['tutor']['id']}/full", headers=auth_headers)
+
+
+def test_strict_budget_fails_the_request(client, auth_headers, populated, monkeypatch):
+    monkeypatch.setattr(settings, "query_budget", 1)
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/api/tutores/{populated['tutor']['id']}/full", headers=auth_headers)
+
+
+def test_capture_requests_reports_each_request(client, auth_headers, populated):
+    with capture_requests() as reports:
+        client.get("/api/pets/", headers=auth_headers)
+        client.get("/api/tutores/", headers=auth_headers)
+    assert [report.route for report in reports] == ["/api/pets/", "/api/tutores/"]
@@ -0,0 +1,69 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+import database
+import main
+from services import replica_routing
+from services.replica_routing import RecentWriters
+
+
+class RecordingFactory:
+    """Réplica de mentira: abre sessões no primário e registra cada uso."""
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+        self.factory = sessionmaker(bind=database.engine)
+
+    def __call__(self):
+        self.calls.append(self.name)
+        return self.factory()
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    calls = []
+    factories = [RecordingFactory("r1", calls), RecordingFactory("r2", calls)]
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle(factories))
+    monkeypatch.setattr(replica_routing, "recent_writers", RecentWriters(ttl_seconds=5))
+    return calls
+
+
+@pytest.fixture
+def replica_client():
+    # Sem READ_REPLICA_URLS o main não instala o middleware; aqui ele é aplicado à mão
+    return TestClient(replica_routing.ReadYourWritesMiddleware(main.app))
+
+
+def test_reads_alternate_between_replicas(replica_client, auth_headers, tutor, replicas):
+    for _ in range(4):
+        assert replica_client.get("/api/tutores/", headers=auth_headers).status_code == 200
+    assert replicas == ["r1", "r2", "r1", "r2"]
+
+
+def test_writer_reads_from_primary_until_ttl_expires(replica_client, auth_headers, replicas, monkeypatch):
+    response = replica_client.post(
+        "/api/tutores/", json={"nome": "Caio", "telefone": "81 1234-5678"}, headers=auth_headers
+    )
+    assert response.status_code == 201
+    created = response.json()
+
+    detail = replica_client.get(f"/api/tutores/{created['id']}", headers=auth_headers)
+    assert detail.status_code == 200
+    assert replicas == []
+    assert database.read_session_factory(auth_headers["Authorization"]) is database.SessionLocal
+    # Outro token continua lendo das réplicas
+    assert database.read_session_factory("Bearer outro").name == "r1"
+
+    now = replica_routing.time.monotonic()
+    monkeypatch.setattr(replica_routing.time, "monotonic", lambda: now + 6)
+    assert database.read_session_factory(auth_headers["Authorization"]).name == "r2"
+
+
+def test_failed_write_does_not_pin_to_primary(replica_client, auth_headers, replicas):
+    response = replica_client.post("/api/pets/", json={"nome": "Rex", "especie": "cão", "tutor_id": 999}, headers=auth_headers)
+    assert response.status_code >= 400
+    assert database.read_session_factory(auth_headers["Authorization"]).name == "r1"
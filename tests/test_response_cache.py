@@ -0,0 +1,102 @@
+import itertools
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+from config import settings
+from services import replica_routing
+from services.response_cache import FakeRedis, MemoryBackend, RedisBackend, response_cache
+
+
+@pytest.fixture(params=["memory", "redis"], autouse=True)
+def backend(request, monkeypatch):
+    if request.param == "memory":
+        backend = MemoryBackend(settings.response_cache_max_entries)
+    else:
+        backend = RedisBackend(FakeRedis())
+    monkeypatch.setattr(response_cache, "backend", backend)
+    return backend
+
+
+def test_second_read_is_a_hit_with_the_same_body(client, auth_headers, clinica):
+    first = client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers)
+    second = client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_hit_with_matching_if_none_match_gives_304(client, auth_headers, clinica):
+    etag = client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers).headers["ETag"]
+
+    response = client.get(f"/api/clinicas/{clinica['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+
+
+def test_query_string_order_does_not_split_the_key(client, auth_headers, clinica):
+    client.get("/api/clinicas/?skip=0&limit=10", headers=auth_headers)
+    response = client.get("/api/clinicas/?limit=10&skip=0", headers=auth_headers)
+    assert response.headers["X-Cache"] == "HIT"
+
+
+def test_write_invalidates_its_namespace(client, auth_headers, clinica):
+    client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers)
+    client.put(
+        f"/api/clinicas/{clinica['id']}", json={"nome": "Nova", "cidade": "Recife", "endereco": "Rua B"}, headers=auth_headers
+    )
+
+    response = client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["nome"] == "Nova"
+
+
+def test_veterinario_write_invalidates_clinica_full(client, auth_headers, create, clinica, veterinario):
+    path = f"/api/clinicas/{clinica['id']}/full"
+    before = client.get(path, headers=auth_headers)
+    assert client.get(path, headers=auth_headers).headers["X-Cache"] == "HIT"
+
+    create("/api/veterinarios/", {"nome": "Dr. Caio", "crmv": "PE-2", "clinica_id": clinica["id"]})
+
+    response = client.get(path, headers={**auth_headers, "If-None-Match": before.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+    assert sorted(vet["crmv"] for vet in response.json()["veterinarios"]) == ["PE-1", "PE-2"]
+
+
+def test_unrelated_namespace_keeps_its_entries(client, auth_headers, clinica, tutor):
+    client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers)
+    client.put(f"/api/tutores/{tutor['id']}", json={"nome": "Bruno", "telefone": "2", "email": "bruno@example.com"}, headers=auth_headers)
+
+    assert client.get(f"/api/clinicas/{clinica['id']}", headers=auth_headers).headers["X-Cache"] == "HIT"
+
+
+
+@pytest.fixture
+def lagging_replica(tmp_path, monkeypatch):
+    """Réplica sem nenhuma das escritas do teste, lida por um cliente que não escreveu."""
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    database.Base.metadata.create_all(bind=replica)
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle([sessionmaker(bind=replica)]))
+    monkeypatch.setattr(replica_routing.recent_writers, "wrote_recently", lambda authorization: False)
+    yield
+    replica.dispose()
+
+
+def test_cache_miss_is_filled_from_primary_not_replica(client, auth_headers, clinica, veterinario, lagging_replica):
+    client.put(
+        f"/api/clinicas/{clinica['id']}", json={"nome": "Nova", "cidade": "Recife", "endereco": "Rua B"}, headers=auth_headers
+    )
+
+    for path in (f"/api/clinicas/{clinica['id']}", f"/api/clinicas/{clinica['id']}/full", "/api/clinicas/"):
+        miss = client.get(path, headers=auth_headers)
+        hit = client.get(path, headers=auth_headers)
+        assert miss.status_code == 200 and miss.headers["X-Cache"] == "MISS"
+        assert hit.headers["X-Cache"] == "HIT" and hit.json() == miss.json()
+    assert miss.json()[0]["nome"] == "Nova"
+    response = client.get(f"/api/veterinarios/{veterinario['id']}", headers=auth_headers)
+    assert response.status_code == 200
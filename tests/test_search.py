@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import text
+
+from crud import search as search_crud
+from database import engine
+
+
+def _drop_fts():
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS busca_fts"))
+    search_crud._fts_ready.clear()
+
+
+@pytest.fixture
+def fts():
+    """Índice FTS5 e triggers, como no init_db (a tabela não faz parte do metadata)."""
+    _drop_fts()
+    with engine.begin() as conn:
+        search_crud.ensure_search_indexes(conn)
+    yield
+    _drop_fts()
+
+
+@pytest.fixture
+def like_only():
+    _drop_fts()
+    yield
+
+
+def _search(client, auth_headers, q, **params):
+    response = client.get("/api/search/", params={"q": q, **params}, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _hits(results):
+    return [(result["tipo"], result["id"]) for result in results]
+
+
+def test_existing_rows_are_indexed_and_ranked(client, auth_headers, create, tutor, pet, veterinario, fts):
+    # tutor, pet e veterinário com id 1: o rowid (id * 4 + tipo) separa as entidades
+    assert (tutor["id"], pet["id"], veterinario["id"]) == (1, 1, 1)
+    results = _search(client, auth_headers, "mia")
+    assert _hits(results) == [("pet", pet["id"])]
+
+    create("/api/pets/", {"nome": "Mia Mia", "especie": "gato", "tutor_id": tutor["id"]})
+    create("/api/pets/", {"nome": "Miau de Rua Mia", "especie": "gato", "tutor_id": tutor["id"]})
+    results = _search(client, auth_headers, "mia")
+    scores = [result["score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    assert results[0]["titulo"] == "Mia Mia"
+
+
+def test_prefix_phone_digits_and_crmv(client, auth_headers, tutor, veterinario, fts):
+    assert _hits(_search(client, auth_headers, "bru")) == [("tutor", tutor["id"])]
+    assert _hits(_search(client, auth_headers, "8199990000")) == [("tutor", tutor["id"])]
+    assert ("veterinario", veterinario["id"]) in _hits(_search(client, auth_headers, "pe"))
+
+
+def test_tipo_filters_results(client, auth_headers, create, tutor, fts):
+    create("/api/pets/", {"nome": "Bruna", "especie": "gato", "tutor_id": tutor["id"]})
+    assert {result["tipo"] for result in _search(client, auth_headers, "bru")} == {"tutor", "pet"}
+    assert {result["tipo"] for result in _search(client, auth_headers, "bru", tipo="pet")} == {"pet"}
+
+
+def test_update_and_delete_go_through_triggers(client, auth_headers, pet, fts):
+    response = client.put(f"/api/pets/{pet['id']}", json={"nome": "Luna", "especie": "gato"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert _search(client, auth_headers, "mia") == []
+    assert _hits(_search(client, auth_headers, "luna")) == [("pet", pet["id"])]
+
+    assert client.delete(f"/api/pets/{pet['id']}", headers=auth_headers).status_code == 200
+    assert _search(client, auth_headers, "luna") == []
+
+
+def test_accents_are_ignored(client, auth_headers, create, tutor, fts):
+    created = create("/api/pets/", {"nome": "Pétala", "especie": "gato", "tutor_id": tutor["id"]})
+    assert _hits(_search(client, auth_headers, "petala")) == [("pet", created["id"])]
+
+
+def test_like_fallback_without_fts_index(client, auth_headers, create, tutor, pet, like_only):
+    create("/api/pets/", {"nome": "Mika", "especie": "gato", "tutor_id": tutor["id"]})
+    results = _search(client, auth_headers, "mi")
+    assert [result["titulo"] for result in results] == ["Mia", "Mika"]
+    assert all(result["score"] == 1.0 for result in results)
+    assert _search(client, auth_headers, "mi", tipo="tutor") == []
+    # Os curingas do LIKE são escapados
+    assert _search(client, auth_headers, "m%") == []
@@ -0,0 +1,64 @@
+import datetime
+
+from crud import estatisticas as estatisticas_crud
+from models import models
+
+
+def _atendimento(create, pet, veterinario):
+    return create("/api/atendimentos/", {"descricao": "Consulta", "pet_id": pet["id"], "veterinario_id": veterinario["id"]})
+
+
+def test_especie_change_then_delete_leaves_no_residue(client, auth_headers, create, pet, veterinario):
+    atendimento = _atendimento(create, pet, veterinario)
+    client.put(f"/api/pets/{pet['id']}", json={"nome": "Mia", "especie": "Coelho"}, headers=auth_headers)
+
+    assert client.get("/api/stats/especies", headers=auth_headers).json() == [{"especie": "gato", "total": 1}]
+
+    client.delete(f"/api/atendimentos/{atendimento['id']}", headers=auth_headers)
+    assert client.get("/api/stats/especies", headers=auth_headers).json() == []
+
+
+def test_clinica_change_then_delete_leaves_no_residue(client, auth_headers, create, clinica, pet, veterinario):
+    outra = create("/api/clinicas/", {"nome": "Clínica Sul", "cidade": "Recife", "endereco": "Rua C"})
+    atendimento = _atendimento(create, pet, veterinario)
+    client.put(
+        f"/api/veterinarios/{veterinario['id']}",
+        json={"nome": "Dra. Ana", "crmv": "PE-1", "clinica_id": outra["id"]}, headers=auth_headers,
+    )
+
+    assert client.get("/api/stats/clinicas", headers=auth_headers).json() == [{"clinica_id": clinica["id"], "total": 1}]
+
+    client.delete(f"/api/atendimentos/{atendimento['id']}", headers=auth_headers)
+    assert client.get("/api/stats/clinicas", headers=auth_headers).json() == []
+
+
+def test_bulk_create_records_the_same_keys(client, auth_headers, pet, veterinario, clinica):
+    payload = [{"descricao": f"Consulta {n}", "pet_id": pet["id"], "veterinario_id": veterinario["id"]} for n in range(3)]
+    created = client.post("/api/atendimentos/bulk", json=payload, headers=auth_headers).json()["created"]
+    for atendimento in created[:2]:
+        client.delete(f"/api/atendimentos/{atendimento['id']}", headers=auth_headers)
+
+    assert client.get("/api/stats/especies", headers=auth_headers).json() == [{"especie": "gato", "total": 1}]
+    assert client.get("/api/stats/clinicas", headers=auth_headers).json() == [{"clinica_id": clinica["id"], "total": 1}]
+
+
+def test_non_positive_totals_are_not_reported(client, auth_headers, db, veterinario):
+    db.add(models.EstatisticaAtendimento(
+        dia=datetime.date(2024, 1, 1), clinica_id=0, veterinario_id=veterinario["id"], especie="Coelho", total=-1,
+    ))
+    db.commit()
+
+    assert client.get("/api/stats/especies", headers=auth_headers).json() == []
+    assert client.get("/api/stats/clinicas", headers=auth_headers).json() == []
+    assert client.get("/api/stats/veterinarios", headers=auth_headers).json() == []
+
+
+def test_rebuild_fills_keys_of_older_atendimentos(client, auth_headers, db, pet, veterinario, clinica):
+    db.add(models.Atendimento(descricao="Antigo", pet_id=pet["id"], veterinario_id=veterinario["id"]))
+    db.commit()
+
+    estatisticas_crud.rebuild(db)
+
+    atendimento = db.query(models.Atendimento).one()
+    assert (atendimento.especie, atendimento.clinica_id) == ("gato", clinica["id"])
+    assert client.get("/api/stats/especies", headers=auth_headers).json() == [{"especie": "gato", "total": 1}]
@@ -0,0 +1,78 @@
+"""
+Caminho de escrita: cada create/update emite um único statement (INSERT/UPDATE
+... RETURNING), sem SELECT prévio nem refresh. O atendimento soma o upsert do
+rollup das estatísticas. Ver benchmarks/write_path.py.
+"""
+import pytest
+from sqlalchemy import event
+
+from crud import (
+    atendimento as atendimento_crud, clinica as clinica_crud, pet as pet_crud,
+    tutor as tutor_crud, veterinario as veterinario_crud,
+)
+from database import engine
+from schemas import (
+    atendimento as atendimento_schema, clinica as clinica_schema, pet as pet_schema,
+    tutor as tutor_schema, veterinario as veterinario_schema,
+)
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def _serialize(obj):
+    # Acessa as colunas como a resposta faria: um atributo expirado viraria um SELECT
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.c}
+
+
+def _run(statements, operation):
+    statements.clear()
+    result = operation()
+    assert result is not None
+    _serialize(result)
+    return list(statements)
+
+
+def test_clinica_and_tutor_writes_are_one_statement_each(db, statements):
+    clinica = clinica_schema.ClinicaCreate(nome="Clínica", cidade="Natal", endereco="Rua A")
+    created = _run(statements, lambda: clinica_crud.create_clinica(db, clinica))
+    assert len(created) == 1 and created[0].startswith("INSERT")
+
+    update = clinica_schema.ClinicaUpdate(nome="Outra", cidade="Natal", endereco="Rua B")
+    updated = _run(statements, lambda: clinica_crud.update_clinica(db, 1, update))
+    assert len(updated) == 1 and updated[0].startswith("UPDATE")
+
+    tutor = tutor_schema.TutorCreate(nome="Bruno", telefone="1")
+    assert len(_run(statements, lambda: tutor_crud.create_tutor(db, tutor))) == 1
+    update = tutor_schema.TutorUpdate(nome="Bruno II", telefone="2")
+    assert len(_run(statements, lambda: tutor_crud.update_tutor(db, 1, update))) == 1
+
+
+def test_pet_and_veterinario_writes_are_one_statement_each(db, statements, tutor, clinica):
+    pet = pet_schema.PetCreate(nome="Rex", especie="cão", tutor_id=tutor["id"])
+    created = _run(statements, lambda: pet_crud.create_pet_if_tutor_exists(db, pet))
+    assert len(created) == 1 and created[0].startswith("INSERT")
+    update = pet_schema.PetUpdate(nome="Rex II", especie="cão")
+    assert len(_run(statements, lambda: pet_crud.update_pet(db, 1, update))) == 1
+
+    veterinario = veterinario_schema.VeterinarioCreate(nome="Dra. Ana", crmv="PE-9", clinica_id=clinica["id"])
+    assert len(_run(statements, lambda: veterinario_crud.create_veterinario(db, veterinario))) == 1
+    assert len(_run(statements, lambda: veterinario_crud.update_veterinario(db, 1, veterinario))) == 1
+
+
+def test_atendimento_writes_add_only_the_rollup_upsert(db, statements, pet, veterinario):
+    atendimento = atendimento_schema.AtendimentoCreate(descricao="Consulta", pet_id=pet["id"], veterinario_id=veterinario["id"])
+    created = _run(statements, lambda: atendimento_crud.create_atendimento_if_refs_exist(db, atendimento))
+    assert [statement.split()[0] for statement in created] == ["INSERT", "INSERT"]
+
+    update = atendimento_schema.AtendimentoUpdate(descricao="Retorno")
+    assert len(_run(statements, lambda: atendimento_crud.update_atendimento(db, 1, update))) == 1